@@ -51,6 +51,8 @@ class cubic_peng_robinson(EOStemplate):
         # Self interaction parameters
         self._beads = kwargs['beads']
         self._beadlibrary = kwargs['beadlibrary']
+        # Incremented whenever a parameter is updated, used to identify the parameter state
+        self._param_version = 0
         self._nui = np.identity(len(self._beads))
 
         self._Tc = np.zeros(len(self._beads))
@@ -83,7 +85,7 @@ class cubic_peng_robinson(EOStemplate):
 
         # Cross interaction parameters
         self._kij = np.zeros((len(self._beads),len(self._beads)))
-        if 'crosslibrary' in list(kwargs.keys()):
+        if 'crosslibrary' in kwargs:
             crosslibrary = kwargs['crosslibrary']
             for key, value in crosslibrary.items():
                 if key in self._beads:
@@ -277,6 +279,34 @@ class cubic_peng_robinson(EOStemplate):
 
         return maxrho
 
+    def saturation_pressure_guess(self, T, maxTr=0.95):
+
+        """
+        Estimate the saturation pressure of each component with the Lee-Kesler correlation.
+        
+        Parameters
+        ----------
+        T : float
+            Temperature of the system [K]
+        maxTr : float, Optional, default: 0.95
+            Maximum reduced temperature for which the correlation is used, as it deteriorates near the critical point
+        
+        Returns
+        -------
+        Psat : numpy.ndarray
+            Saturation pressure of each component, NaN where the reduced temperature is above maxTr [Pa]
+        """
+
+        Tr = T / self._Tc
+        lnTr = np.log(Tr)
+        Tr6 = Tr**6
+        f0 = 5.92714 - 6.09648 / Tr - 1.28862 * lnTr + 0.169347 * Tr6
+        f1 = 15.2518 - 15.6875 / Tr - 13.4721 * lnTr + 0.43577 * Tr6
+        Psat = self._Pc * np.exp(f0 + self._omega * f1)
+        Psat[Tr > maxTr] = np.nan
+
+        return Psat
+
     def param_guess(self, param_name, bead_names):
         r"""
         Update a single parameter value to _beadlibrary or _crosslibrary attributes during parameter fitting process.
@@ -395,6 +425,8 @@ class cubic_peng_robinson(EOStemplate):
 
         #logger = logging.getLogger(__name__)
 
+        self._param_version += 1
+
         param_types = ["ai", "bi", "kij"]
 
         if len(bead_names) > 2:
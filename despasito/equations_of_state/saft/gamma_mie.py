@@ -10,12 +10,48 @@ r"""
 
 import numpy as np
 import logging
+import functools
 
 from . import constants
 from . import gamma_mie_funcs as funcs
 # Later this line will be in an abstract class file in this directory, and all versions of SAFT will reference it
 from despasito.equations_of_state.interface import EOStemplate
 
+@functools.lru_cache(maxsize=None)
+def _parse_fit_param(fit_bead, param_name):
+    r"""
+    Split the name of a parameter being fit into the parameter type and the bead names it refers to. The result is cached as the same names are parsed at every parameter update during fitting.
+
+    Parameters
+    ----------
+    fit_bead : str
+        Name of bead being fit
+    param_name : str
+        Parameter to be fit. Cross interaction parameter names should be composed of parameter name and the other bead type, separated by an underscore (e.g. epsilon_CO2).
+
+    Returns
+    -------
+    param_name : str
+        Parameter type (e.g. epsilon)
+    bead_names : tuple
+        Name of the bead being fit, followed by the other bead for a cross interaction parameter
+    """
+
+    bead_names = [fit_bead]
+
+    fit_params_list = param_name.split("_")
+    param_name = fit_params_list[0]
+    if len(fit_params_list) > 1:
+        if fit_params_list[0] == "l":
+            if fit_params_list[1] in ["r","a"]:
+                param_name = "_".join([fit_params_list[0],fit_params_list[1]])
+                fit_params_list.remove(fit_params_list[1])
+
+        if len(fit_params_list) > 1:
+            bead_names.append(fit_params_list[1])
+
+    return param_name, tuple(bead_names)
+
 # ________________ Saft Family ______________
 # NoteHere: Insert SAFT family abstract class in this directory to clean up
 
@@ -73,6 +109,8 @@ class saft_gamma_mie(EOStemplate):
         self._nui = kwargs['nui']
         self._beads = kwargs['beads']
         self._beadlibrary = kwargs['beadlibrary']
+        # Incremented whenever a parameter is updated or refreshed, used to identify the parameter state
+        self._param_version = 0
 
         massi = np.zeros(len(self._nui))
         for i in range(len(self._nui)):
@@ -458,7 +496,7 @@ class saft_gamma_mie(EOStemplate):
                     param_value = self.check_bounds(param_name, bead_names, np.empty(2))[1]/2
 
         # Association Sites
-        elif any([param_name.startswith('epsilon'), param_name.startswith('K')]):
+        elif param_name.startswith(('epsilon', 'K')):
             tmp = [param_name.startswith('epsilon'), param_name.startswith('K')]
             # Ensure sitenames are valid and on list
             if tmp[0] == True: tmp_name_full = param_name.replace("epsilon","")
@@ -518,18 +556,7 @@ class saft_gamma_mie(EOStemplate):
         logger = logging.getLogger(__name__)
         param_bound_extreme = {"epsilon":[0.,1000.], "sigma":[0.,9e-9], "l_r":[0.,100.], "l_a":[0.,100.], "Sk":[0.,1.], "epsilon-a":[0.,5000.], "K":[0.,10000.]}
 
-        bead_names = [fit_bead]
-
-        fit_params_list = param_name.split("_")
-        param_name = fit_params_list[0]
-        if len(fit_params_list) > 1:
-            if fit_params_list[0] == "l":
-                if fit_params_list[1] in ["r","a"]:
-                    param_name = "_".join([fit_params_list[0],fit_params_list[1]])
-                    fit_params_list.remove(fit_params_list[1])
-
-            if len(fit_params_list) > 1:
-                bead_names.append(fit_params_list[1])
+        param_name, bead_names = _parse_fit_param(fit_bead, param_name)
         
         if len(bead_names) > 2:
             raise ValueError("The bead names {} were given, but only a maximum of 2 are permitted.".format(", ".join(bead_names)))
@@ -568,7 +595,7 @@ class saft_gamma_mie(EOStemplate):
                     bounds_new[1] = bounds[1]
         
         # Association Sites
-        elif any([param_name.startswith('epsilon'), param_name.startswith('K')]):
+        elif param_name.startswith(('epsilon', 'K')):
             tmp = [param_name.startswith('epsilon'), param_name.startswith('K')]
             # Ensure sitenames are valid and on list
             if tmp[0] == True:
@@ -611,20 +638,11 @@ class saft_gamma_mie(EOStemplate):
 
         #logger = logging.getLogger(__name__)
 
-        param_types = ["epsilon", "sigma", "l_r", "l_a", "Sk", "K"]
+        self._param_version += 1
 
-        bead_names = [fit_bead]
-
-        fit_params_list = param_name.split("_")
-        param_name = fit_params_list[0]
-        if len(fit_params_list) > 1:
-            if fit_params_list[0] == "l":
-                if fit_params_list[1] in ["r","a"]:
-                    param_name = "_".join([fit_params_list[0],fit_params_list[1]])
-                    fit_params_list.remove(fit_params_list[1])
+        param_types = ["epsilon", "sigma", "l_r", "l_a", "Sk", "K"]
 
-            if len(fit_params_list) > 1:
-                bead_names.append(fit_params_list[1])
+        param_name, bead_names = _parse_fit_param(fit_bead, param_name)
 
         if len(bead_names) > 2:
             raise ValueError("The bead names {} were given, but only a maximum of 2 are permitted.".format(", ".join(bead_names)))
@@ -652,7 +670,7 @@ class saft_gamma_mie(EOStemplate):
                     self._crosslibrary[bead_names[0]] = {bead_names[1]: {param_name: param_value}}
 
         # Association Sites
-        elif any([param_name.startswith('epsilon'), param_name.startswith('K')]):
+        elif param_name.startswith(('epsilon', 'K')):
             tmp = [param_name.startswith('epsilon'), param_name.startswith('K')]
             # Ensure sitenames are valid and on list
             if tmp[0] == True: tmp_name_full = param_name.replace("epsilon","")
@@ -702,6 +720,8 @@ class saft_gamma_mie(EOStemplate):
 
         #logger = logging.getLogger(__name__)
 
+        self._param_version += 1
+
         # Update Non bonded matrices
         self._epsilonkl, self._sigmakl, self._l_akl, self._l_rkl, self._Ckl = funcs.calc_interaction_matrices(self._beads, self._beadlibrary, crosslibrary=self._crosslibrary)
 
@@ -498,7 +498,7 @@ def calc_dBkl_drhos(l_kl, dkl, epsilonkl, x0kl, zetax):
     elif np.size(np.shape(l_kl)) == 1:
         tmp1 = np.einsum("i,j", (1.0 - (zetax / 2.0)) / ((1.0 - zetax)**3), Ikl) - np.einsum("i,j", ((9.0 * zetax * (1.0 + zetax)) / (2.0 * ((1 - zetax)**3))), Jkl)
         tmp2 = np.einsum("i,j", (5.0 - 2.0*zetax) / (2*(1.0 - zetax)**4), Ikl) - np.einsum("i,j", ((9.0 * (zetax**2 + 4.0*zetax + 1)) / (2.0 * ((1 - zetax)**4))), Jkl)
-        dBkl_drhos = np.einsum( "i,j", 2.0*np.pi*np.ones_like(zetax), (dkl**3)*epsilonkl)*tmp1 + np.einsum("i,j", zetax, (dkl**3)*epsilonkl)*tmp2
+        dBkl_drhos = np.einsum( "i,j", np.full_like(zetax, 2.0*np.pi), (dkl**3)*epsilonkl)*tmp1 + np.einsum("i,j", zetax, (dkl**3)*epsilonkl)*tmp2
 
     return dBkl_drhos
 
@@ -644,8 +644,11 @@ def calc_Amono(rho, xi, nui, Cmol2seg, xsk, xskl, dkk, T, epsilonkl, sigmakl, dk
     # compute f1, f2, and f3 for eq. 32
     fmlist123 = calc_fm(alphakl, np.array([1, 2, 3]))
 
-    chikl = np.einsum("i,jk", zetaxstar, fmlist123[0]) + np.einsum("i,jk", zetaxstar**5, fmlist123[1]) + np.einsum(
-        "i,jk", zetaxstar**8, fmlist123[2])
+    # zetaxstar**5 and zetaxstar**8 by repeated squaring
+    zetaxstar2 = zetaxstar * zetaxstar
+    zetaxstar4 = zetaxstar2 * zetaxstar2
+    chikl = np.einsum("i,jk", zetaxstar, fmlist123[0]) + np.einsum("i,jk", zetaxstar4 * zetaxstar, fmlist123[1]) + np.einsum(
+        "i,jk", zetaxstar4 * zetaxstar4, fmlist123[2])
 
     a1s_2la = calc_a1s(rho, Cmol2seg, 2.0 * l_akl, zetax, epsilonkl, dkl)
     a1s_2lr = calc_a1s(rho, Cmol2seg, 2.0 * l_rkl, zetax, epsilonkl, dkl)
@@ -663,7 +666,7 @@ def calc_Amono(rho, xi, nui, Cmol2seg, xsk, xskl, dkk, T, epsilonkl, sigmakl, dk
     fmlist456 = calc_fm(alphakl, np.array([4, 5, 6]))
 
     a3kl = np.einsum("i,jk", zetaxstar, -(epsilonkl**3) * fmlist456[0]) * np.exp(
-        np.einsum("i,jk", zetaxstar, fmlist456[1]) + np.einsum("i,jk", zetaxstar**2, fmlist456[2]))
+        np.einsum("i,jk", zetaxstar, fmlist456[1]) + np.einsum("i,jk", zetaxstar2, fmlist456[2]))
     # a3kl=-(epsilonkl**3)*fmlist456[0]*zetaxstar*np.exp((fmlist456[1]*zetaxstar)+(fmlist456[2]*(zetaxstar**2)))
 
     # compute a1, a2, a3 from 18, 29, and 37 respectively
@@ -1276,7 +1279,7 @@ def calc_A_assoc(rho, xi, T, nui, xskl, sigmakl, sigmaii_avg, epsilonii_avg, eps
     for p in range(11):
         for q in range(11 - p):
             #Iij += np.einsum("i,jk->ijk", constants.cij[p, q] * ((sigmax3 * rho)**p), ((kT / epsilonij)**q))
-            if p == 0: Iij += np.einsum("i,jk->ijk", constants.cij[p, q] * np.ones(len(rho)), ((kT / epsilonij)**q))
+            if p == 0: Iij += np.einsum("i,jk->ijk", np.full(len(rho), constants.cij[p, q]), ((kT / epsilonij)**q))
             elif p == 1: Iij += np.einsum("i,jk->ijk", constants.cij[p, q] * ((sigmax3 * rho)), ((kT / epsilonij)**q))
             elif p == 2: 
                rho2 = rho**2
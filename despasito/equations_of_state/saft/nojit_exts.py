@@ -184,7 +184,7 @@ def calc_Xika(indices, rho, xi, nui, nk, Fklab, Kklab, Iij, maxiter=500, tol=1e-
     err_array   = np.zeros(nrho)
 
     # Parallelize here, with respect to rho!
-    Xika_elements = .5*np.ones(len(indices))
+    Xika_elements = np.full(len(indices), .5)
     for r in range(nrho):
         for knd in range(maxiter):
 
@@ -9,9 +9,7 @@ Input.json files have a different dictionary structure that is processed by :fun
 """
 
 import sys
-import os
 import numpy as np
-from importlib import import_module
 import logging
 
 from . import fit_funcs as ff
@@ -54,6 +52,8 @@ def fit(eos, thermo_dict):
 
             - method (str) - Method available to scipy.optimize.minimize
             - options (dict) - This dictionary contains the kwargs available to the chosen method
+
+        - ncores (int), Optional - default: 1, Number of processes used to evaluate the objective functions of the exp. data sets in parallel. Only used when more than one data set is given.
   
     Returns
     -------
@@ -64,6 +64,7 @@ def fit(eos, thermo_dict):
 
     # Extract relevant quantities from thermo_dict
     dicts = {}
+    ncores = 1
 
     keys_del = []
     for key, value in thermo_dict.items():
@@ -79,6 +80,8 @@ def fit(eos, thermo_dict):
             dicts['minimizer_dict'] = value
         elif key == "global_dict":
             dicts['global_dict'] = value
+        elif key == "ncores":
+            ncores = value
         else:
             continue
         keys_del.append(key)
@@ -86,36 +89,33 @@ def fit(eos, thermo_dict):
     for key in keys_del:
         thermo_dict.pop(key,None)
 
-    if list(thermo_dict.keys()):
-        logger.info("Note: thermo_dict keys: {}, were not used.".format(", ".join(list(thermo_dict.keys()))))
+    if thermo_dict:
+        logger.info("Note: thermo_dict keys: {}, were not used.".format(", ".join(thermo_dict)))
 
-    if "bounds" not in thermo_dict:
-        bounds = np.empty((len(opt_params["fit_params"]),2))
+    if "bounds" not in keys_del:
+        bounds = np.zeros((len(opt_params["fit_params"]),2))
     bounds = ff.check_parameter_bounds(opt_params, eos, bounds)
 
     # Reformat exp. data into formatted dictionary
     exp_dict = {}
-    pkgpath = os.path.dirname(data_classes.__file__)
-    type_list = [f for f in os.listdir(pkgpath) if ".py" in f]
-    type_list = type_list.remove("__init__.py")
+    registry = data_classes.load_registry()
 
-    for key, data_dict in exp_data.items():
-        fittype = data_dict["name"]
-        try:
-            exp_module = import_module("."+fittype,package="despasito.fit_parameters.data_classes")
-            data_class = getattr(exp_module, "Data")
-        except:
-            if not type_list: raise ImportError("No fit types")
-            elif len(type_list) == 1: tmp = type_list[0]
-            else: tmp = ", ".join(type_list)
-            raise ImportError("The experimental data type, '"+fittype+"', was not found\nThe following calculation types are supported: "+tmp)
+    # Check all data types before initiating any data set
+    unknown_types = sorted(set(data_dict["name"] for data_dict in exp_data.values()) - set(registry))
+    if unknown_types:
+        raise ImportError("The experimental data type(s), '{}', were not found\nThe following calculation types are supported: {}".format("', '".join(unknown_types),", ".join(registry)))
 
+    # Initiate every data set, reporting all that fail together
+    errors = []
+    for key, data_dict in exp_data.items():
         try:
-            instance = data_class(data_dict)
-            exp_dict[key] = instance
-            logger.info("Initiated exp. data object: {}".format(instance.name))
-        except:
-            raise AttributeError("Data set, {}, did not properly initiate object".format(key))
+            exp_dict[key] = registry[data_dict["name"]](data_dict)
+            logger.info("Initiated exp. data object: {}".format(exp_dict[key].name))
+        except (ImportError, KeyError, TypeError, ValueError) as err:
+            logger.debug("Initiation of data set, {}, failed".format(key), exc_info=True)
+            errors.append("{}: {}".format(key, err))
+    if errors:
+        raise AttributeError("The following data sets did not properly initiate objects:\n    {}".format("\n    ".join(errors)))
 
     # Generate initial guess for parameters if none was given
     if "beadparams0" in opt_params:
@@ -130,9 +130,17 @@ def fit(eos, thermo_dict):
     else:
         global_method = "basinhopping"
 
+    # Evaluate exp. data sets in parallel
+    if ncores > 1 and len(exp_dict) > 1:
+        nprocs = min(ncores, len(exp_dict))
+        pool = ff.create_pool(nprocs, opt_params["fit_bead"], opt_params["fit_params"], eos, exp_dict)
+        logger.info("Evaluating exp. data sets with {} processes".format(nprocs))
+    else:
+        pool = None
+
     # Run Parameter Fitting
     try:
-        result = ff.global_minimization(global_method, beadparams0, bounds, opt_params["fit_bead"], opt_params["fit_params"], eos, exp_dict, **dicts)
+        result = ff.global_minimization(global_method, beadparams0, bounds, opt_params["fit_bead"], opt_params["fit_params"], eos, exp_dict, pool=pool, **dicts)
 
         print(result.keys())
         logger.info("Fitting terminated:\n{}".format(result.message))
@@ -143,6 +151,10 @@ def fit(eos, thermo_dict):
 
     except:
         raise TypeError("The parameter fitting failed")
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
 
     return {"fit_bead": opt_params["fit_bead"], "fit_parameters":opt_params["fit_params"], "final_parameters": result.x, "objective_value": result.fun} 
 
@@ -7,7 +7,8 @@ import logging
 
 from despasito.thermodynamics import thermo
 from despasito.fit_parameters import fit_funcs as ff
-from despasito.fit_parameters.interface import ExpDataTemplate
+from despasito.fit_parameters.interface import ExpDataTemplate, ThermoEvalError
+from despasito.fit_parameters.exts import calc_sq_rel_dev
 
 ##################################################################
 #                                                                #
@@ -32,6 +33,8 @@ class Data(ExpDataTemplate):
         * xi(yi) : list, List of liquid (or vapor) mole fractions used in phase_xiT (or phase_yiT) calculation.
         * weights : dict, A dictionary where each key is the header used in the exp. data file. The value associated with a header can be a list as long as the number of data points to multiply by the objective value associated with each point, or a float to multiply the objective value of this data set.
         * rhodict : dict, Optional, default: {"minrhofrac":(1.0 / 300000.0), "rhoinc":10.0, "vspacemax":1.0E-4}, Dictionary of options used in calculating pressure vs. mole fraction curves.
+        * low_precision_obj : bool, Optional, default: False, If True, the residuals of the objective function are evaluated in single precision. Thermodynamic calculations remain in double precision.
+        * warm_start_rtol : float, Optional, default: 1e-2, The converged pressures of the last parameter set with a finite objective value are used as the initial guess when every parameter is within this relative tolerance of that set. Otherwise the exp. pressures are used.
 
     Attributes
     ----------
@@ -48,6 +51,8 @@ class Data(ExpDataTemplate):
     
     """
 
+    __slots__ = ("name", "calctype", "weights", "_thermodict", "_thermo_opts", "_zi_key", "_zi_output", "_calc_name", "_fit_P", "_fit_zi", "_fit_rows", "_dtype", "_Pexp", "_wP", "_ziexp", "_wzi", "_warm_start_rtol", "_pguess_cache")
+
     def __init__(self, data_dict):
 
         logger = logging.getLogger(__name__)
@@ -58,11 +63,11 @@ class Data(ExpDataTemplate):
 
         try:
             self.weights = data_dict["weights"]
-        except:
+        except KeyError:
             self.weights = {}
 
         if "xi" in data_dict: 
-            self._thermodict["xilist"] = data_dict["xi"]
+            self._thermodict["xilist"] = np.ascontiguousarray(data_dict["xi"], dtype=np.float64)
             if 'xi' in self.weights:
                 self.weights['xilist'] = self.weights.pop('xi')
                 key = 'xilist'
@@ -70,11 +75,11 @@ class Data(ExpDataTemplate):
                     if type(self.weights[key]) != float and len(self.weights[key]) != len(self._thermodict[key]):
                         raise ValueError("Array of weights for '{}' values not equal to number of experimental values given.".format(key))
         if "T" in data_dict:
-            self._thermodict["Tlist"] = data_dict["T"]
+            self._thermodict["Tlist"] = np.ascontiguousarray(data_dict["T"], dtype=np.float64)
             if 'T' in self.weights:
                 self.weights['Tlist'] = self.weights.pop('T')
         if "yi" in data_dict:
-            self._thermodict["yilist"] = data_dict["yi"]
+            self._thermodict["yilist"] = np.ascontiguousarray(data_dict["yi"], dtype=np.float64)
             if 'yi' in self.weights:
                 self.weights['yilist'] = self.weights.pop('yi')
                 key = 'yilist'
@@ -82,8 +87,8 @@ class Data(ExpDataTemplate):
                     if type(self.weights[key]) != float and len(self.weights[key]) != len(self._thermodict[key]):
                         raise ValueError("Array of weights for '{}' values not equal to number of experimental values given.".format(key))
         if "P" in data_dict: 
-            self._thermodict["Plist"] = data_dict["P"]
-            self._thermodict["Pguess"] = data_dict["P"]
+            self._thermodict["Plist"] = np.ascontiguousarray(data_dict["P"], dtype=np.float64)
+            self._thermodict["Pguess"] = self._thermodict["Plist"]
             if 'P' in self.weights:
                 self.weights['Plist'] = self.weights.pop('P')
                 key = 'Plist'
@@ -91,10 +96,10 @@ class Data(ExpDataTemplate):
                     if type(self.weights[key]) != float and len(self.weights[key]) != len(self._thermodict[key]):
                         raise ValueError("Array of weights for '{}' values not equal to number of experimental values given.".format(key))
 
-        if not any([x in self._thermodict.keys() for x in ['Plist', 'Tlist']]):
+        if not any(x in self._thermodict for x in ['Plist', 'Tlist']):
             raise ImportError("Given TLVE data, values for P and T should have been provided.")
 
-        if not all([x in self._thermodict.keys() for x in ['xilist', 'yilist']]):
+        if not all(x in self._thermodict for x in ['xilist', 'yilist']):
             raise ImportError("Given TLVE data, mole fractions should have been provided.")
 
         if not any(np.array([len(x) for key,x in self._thermodict.items()]) == len(self._thermodict['xilist'])):
@@ -116,11 +121,42 @@ class Data(ExpDataTemplate):
             else:
                 raise ValueError("Unknown calculation instructions")
 
+        # Experimental mole fractions compared against the predicted phase, and the thermo output holding them
+        if self.calctype == "phase_xiT":
+            self._zi_key = "yilist"
+            self._zi_output = "yi"
+            self._calc_name = "calc_xT_phase"
+        else:
+            self._zi_key = "xilist"
+            self._zi_output = "xi"
+            self._calc_name = "calc_yT_phase"
+
         for key in self._thermodict.keys():
             if key not in self.weights:
                 if key != 'calculation_type':
                     self.weights[key] = 1.0
 
+        # Contiguous copies of exp. data and weights, shaped as the rows of the reformatted thermo output
+        self._fit_P = "Plist" in self._thermodict
+        self._fit_zi = self._zi_key in self._thermodict
+        if data_dict.get("low_precision_obj", False):
+            self._dtype = np.float32
+        else:
+            self._dtype = np.float64
+        if self._fit_P:
+            self._Pexp = self._thermodict["Plist"][np.newaxis].astype(self._dtype, copy=False)
+            self._wP = np.broadcast_to(np.array(self.weights["Plist"], self._dtype), self._Pexp.shape).copy()
+        if self._fit_zi:
+            self._ziexp = np.ascontiguousarray(np.transpose(self._thermodict[self._zi_key]), dtype=self._dtype)
+            self._wzi = np.broadcast_to(np.array(self.weights[self._zi_key], self._dtype), self._ziexp.shape).copy()
+
+        # Rows of the reformatted thermo output that are compared to exp. data
+        self._fit_rows = []
+        if self._fit_P:
+            self._fit_rows.append(0)
+        if self._fit_zi:
+            self._fit_rows.extend(range(1, self._ziexp.shape[0]+1))
+
         logger.info("Data type 'TLVE' initiated with calctype, {}, and data types: {}.\nWeight data by: {}".format(self.calctype,", ".join(self._thermodict.keys()),self.weights))
 
         if 'rhodict' in data_dict:
@@ -128,7 +164,15 @@ class Data(ExpDataTemplate):
         else:
             self._thermodict["rhodict"] = {"minrhofrac":(1.0 / 300000.0), "rhoinc":10.0, "vspacemax":1.0E-4}
 
-    def _thermo_wrapper(self, eos):
+        # Inputs for thermo calculation, the predicted quantities are left out as they don't change between evaluations
+        result_keys = ["Plist", self._zi_key]
+        self._thermo_opts = {key: value for key, value in self._thermodict.items() if key not in result_keys}
+
+        # Parameters and converged pressures of the last evaluation with a finite objective, used as a warm start for nearby parameter sets
+        self._warm_start_rtol = data_dict.get("warm_start_rtol", 1e-2)
+        self._pguess_cache = None
+
+    def _thermo_wrapper(self, eos, Pguess=None):
 
         """
         Generate thermodynamic predictions from eos object
@@ -137,6 +181,8 @@ class Data(ExpDataTemplate):
         ----------
         eos : obj
             EOS object with updated parameters
+        Pguess : numpy.ndarray, Optional
+            Initial guess in pressure of each point, replacing the exp. pressures
 
         Returns
         -------
@@ -144,23 +190,48 @@ class Data(ExpDataTemplate):
             A list of the predicted thermodynamic values estimated from thermo calculation. This list can be composed of lists or floats
         """
 
-        if self.calctype == "phase_xiT":
-            try:
-                output_dict = thermo(eos, self._thermodict)
-                output = [output_dict['P'],output_dict["yi"]]
-            except:
-                raise ValueError("Calculation of calc_xT_phase failed")
-
-        elif self.calctype == "phase_yiT":
-            try:
-                output_dict = thermo(eos, self._thermodict)
-                output = [output_dict['P'],output_dict["xi"]]
-            except:
-                raise ValueError("Calculation of calc_yT_phase failed")
+        logger = logging.getLogger(__name__)
+
+        opts = self._thermo_opts
+        if Pguess is not None:
+            opts = dict(opts, Pguess=Pguess)
+
+        try:
+            output_dict = thermo(eos, opts)
+            output = [output_dict['P'],output_dict[self._zi_output]]
+        except (TypeError, ValueError, KeyError, RuntimeError):
+            logger.debug("Calculation of {} failed".format(self._calc_name), exc_info=True)
+            raise ThermoEvalError("Calculation of {} failed".format(self._calc_name))
 
         return output
 
-    def objective(self, eos):
+    def _warm_start(self, beadparams):
+
+        """
+        Initial guess in pressure for a parameter set, taken from the last evaluation with a finite objective if its parameters are close enough.
+
+        Parameters
+        ----------
+        beadparams : numpy.ndarray
+            Values of the parameters being fit, or None
+
+        Returns
+        -------
+        Pguess : numpy.ndarray
+            Initial guess in pressure of each point, None if the exp. pressures should be used
+        """
+
+        if beadparams is None or self._pguess_cache is None:
+            return None
+
+        params, Pguess = self._pguess_cache
+        beadparams = np.asarray(beadparams, float)
+        if beadparams.shape != params.shape or not np.allclose(beadparams, params, rtol=self._warm_start_rtol, atol=0.):
+            return None
+
+        return Pguess
+
+    def objective(self, eos, beadparams=None):
 
         """
         Generate objective function value from this dataset
@@ -169,6 +240,8 @@ class Data(ExpDataTemplate):
         ----------
         eos : obj
             EOS object with updated parameters
+        beadparams : numpy.ndarray, Optional
+            Values of the parameters being fit. If given, the converged pressures of a previous evaluation with nearby parameters are used as the initial guess, see warm_start_rtol.
 
         Returns
         -------
@@ -179,30 +252,39 @@ class Data(ExpDataTemplate):
         logger = logging.getLogger(__name__)
 
         # objective function
-        phase_list = self._thermo_wrapper(eos)
+        try:
+            phase_list = self._thermo_wrapper(eos, Pguess=self._warm_start(beadparams))
+        except ThermoEvalError:
+            logger.warning("Thermodynamic calculation failed for {}, objective set to inf".format(self.name))
+            return np.inf
         phase_list, len_cluster = ff.reformat_ouput(phase_list)
-        phase_list = np.transpose(np.array(phase_list))
+        phase_list = np.ascontiguousarray(np.transpose(phase_list), dtype=self._dtype)
+
+        # Failed points are reported as NaN, skip the residuals for this parameter set
+        if not np.isfinite(phase_list[self._fit_rows]).all():
+            return np.inf
    
         obj_value = np.zeros(2)
 
-        if "Plist" in self._thermodict:
-            obj_value[0] = np.sum((((phase_list[0] - self._thermodict["Plist"]) / self._thermodict["Plist"])**2)*self.weights['Plist'])
+        if self._fit_P:
+            obj_value[0] = calc_sq_rel_dev(phase_list[:1], self._Pexp, self._wP)
 
-        if self.calctype == "phase_xiT":
-            if "yilist" in self._thermodict:
-                yi = np.transpose(self._thermodict["yilist"])
-                obj_value[1] = np.sum((((phase_list[1:] - yi)/yi)**2)*self.weights['yilist'])
-        elif self.calctype == "phase_yiT":
-            if "xilist" in self._thermodict:
-                xi = np.transpose(self._thermodict["xilist"])
-                obj_value[1] = np.sum((((phase_list[1:] - xi)/xi)**2)*self.weights['xilist'])
-
-        logger.debug("Obj. breakdown for {}: P {}, zi {}".format(self.name,obj_value[0],obj_value[1]))
-
-        if all(np.isnan(obj_value)):
-            obj_total = np.nan
-        else:
-            obj_total = np.nansum(obj_value)
+        # Mole fraction residuals for all components in one (ncomp, npoints) array
+        if self._fit_zi:
+            obj_value[1] = calc_sq_rel_dev(phase_list[1:], self._ziexp, self._wzi)
+
+        logger.debug("Obj. breakdown for %s: P %s, zi %s", self.name, obj_value[0], obj_value[1])
+
+        obj_total = np.nansum(obj_value)
+        if not np.isfinite(obj_total):
+            return np.inf
+
+        # Keep converged pressures for nearby parameter sets, using the exp. pressures where a point failed
+        if beadparams is not None:
+            P = np.array(phase_list[0], float)
+            converged = np.isfinite(P) & (P > 0.)
+            Pguess = self._thermodict.get("Pguess", np.full(len(P), -1.))
+            self._pguess_cache = (np.array(beadparams, float), np.where(converged, P, Pguess))
 
         return obj_total
 
@@ -0,0 +1,35 @@
+"""
+Data Classes
+------------
+
+Each module in this package defines a ``Data`` object for one type of experimental data. The name of the module is the data type name used in the input file.
+
+"""
+
+import os
+from importlib import import_module
+
+# Data object of each experimental data type, keyed by module name
+REGISTRY = {}
+
+def load_registry():
+    r"""
+    Import each data class module in this package once and add its Data object to REGISTRY.
+
+    The modules are imported on first use, rather than with the package, because they choose between the jit and python versions of their extensions when imported, which depends on the eos object created beforehand.
+
+    Returns
+    -------
+    REGISTRY : dict
+        Dictionary of Data objects, keyed by data type name
+    """
+
+    if not REGISTRY:
+        pkgpath = os.path.dirname(__file__)
+        for fname in sorted(os.listdir(pkgpath)):
+            if fname.endswith(".py") and fname != "__init__.py":
+                module = import_module("." + fname[:-3], package=__name__)
+                REGISTRY[fname[:-3]] = getattr(module, "Data")
+
+    return REGISTRY
+
@@ -7,7 +7,8 @@ import logging
 
 from despasito.thermodynamics import thermo
 from despasito.fit_parameters import fit_funcs as ff
-from despasito.fit_parameters.interface import ExpDataTemplate
+from despasito.fit_parameters.interface import ExpDataTemplate, ThermoEvalError
+from despasito.fit_parameters.exts import calc_sq_rel_dev
 
 ##################################################################
 #                                                                #
@@ -43,6 +44,8 @@ class Data(ExpDataTemplate):
         List of liquid mole fractions, sum(xi) should equal 1
     """
 
+    __slots__ = ("name", "calctype", "weights", "_thermodict", "_fit_rows", "_exp", "_wexp")
+
     def __init__(self, data_dict):
 
         logger = logging.getLogger(__name__)
@@ -59,31 +62,31 @@ class Data(ExpDataTemplate):
 
         try:
             self.weights = data_dict["weights"]
-        except:
+        except KeyError:
             self.weights = {}
 
         if "xi" in data_dict:
             self._thermodict["xilist"] = data_dict["xi"]
         if "T" in data_dict:
-            self._thermodict["Tlist"] = data_dict["T"]
+            self._thermodict["Tlist"] = np.ascontiguousarray(data_dict["T"], dtype=np.float64)
         if "rhol" in data_dict:
             key = "rhol"
-            self._thermodict["rhol"] = data_dict["rhol"]
+            self._thermodict["rhol"] = np.ascontiguousarray(data_dict["rhol"], dtype=np.float64)
             if key in self.weights:
                 if type(self.weights[key]) != float and len(self.weights[key]) != len(self._thermodict[key]):
                     raise ValueError("Array of weights for '{}' values not equal to number of experimental values given.".format(key))
 
         tmp = ["Tlist","rhol"]
-        if not all([x in self._thermodict.keys() for x in tmp]):
+        if not all(x in self._thermodict for x in tmp):
             raise ImportError("Given liquid property data, values for T, xi, and rhol should have been provided.")
 
         if "P" in data_dict:
             if (type(data_dict["P"]) == float or len(data_dict["P"])==1):
-                self._thermodict["Plist"] = np.ones(len(self._thermodict["Tlist"]))*data_dict["P"]
+                self._thermodict["Plist"] = np.full(len(self._thermodict["Tlist"]), data_dict["P"], dtype=float)
             else:
                 self._thermodict["Plist"] = data_dict["P"]
         else:
-            self._thermodict["Plist"] = np.ones(len(self._thermodict["Tlist"]))*101325.0
+            self._thermodict["Plist"] = np.full(len(self._thermodict["Tlist"]), 101325.0)
             logger.info("Assume atmospheric pressure")
 
         for key in self._thermodict.keys():
@@ -91,6 +94,13 @@ class Data(ExpDataTemplate):
                 if key != 'calculation_type':
                     self.weights[key] = 1.0
 
+        # Rows of the reformatted thermo output that are compared to exp. data
+        self._fit_rows = [i for i, key in enumerate(["rhol"]) if key in self._thermodict]
+
+        # Exp. data and weights, shaped as the rows of the reformatted thermo output
+        self._exp = self._thermodict["rhol"][np.newaxis]
+        self._wexp = np.broadcast_to(np.array(self.weights["rhol"], float), self._exp.shape).copy()
+
         logger.info("Data type 'liquid_properties' initiated with calctype, {}, and data types: {}.\nWeight data by: {}".format(self.calctype,", ".join(self._thermodict.keys()),self.weights))
 
         if 'rhodict' in data_dict:
@@ -114,22 +124,25 @@ class Data(ExpDataTemplate):
             A list of the predicted thermodynamic values estimated from thermo calculation. This list can be composed of lists or floats
         """
 
+        logger = logging.getLogger(__name__)
+
         # Check bead type
         if 'xilist' not in self._thermodict:
             if len(eos._nui) > 1:
                 raise ValueError("Ambiguous instructions. Include xi to define intended component to obtain saturation properties")
             else:
-                self._thermodict['xilist'] = np.array([[1.0] for x in range(len(self._thermodict['Tlist']))])
+                self._thermodict['xilist'] = np.ones((len(self._thermodict['Tlist']), 1))
 
         try:
             output_dict = thermo(eos, self._thermodict)
             output = [output_dict["rhol"]]
-        except:
-            raise ValueError("Calculation of calc_rhol failed")
+        except (TypeError, ValueError, KeyError, RuntimeError):
+            logger.debug("Calculation of calc_rhol failed", exc_info=True)
+            raise ThermoEvalError("Calculation of calc_rhol failed")
         return output
 
 
-    def objective(self, eos):
+    def objective(self, eos, beadparams=None):
 
         """
         Generate objective function value from this dataset
@@ -138,6 +151,8 @@ class Data(ExpDataTemplate):
         ----------
         eos : obj
             EOS object with updated parameters
+        beadparams : numpy.ndarray, Optional
+            Values of the parameters being fit, unused by this data type
 
         Returns
         -------
@@ -145,14 +160,24 @@ class Data(ExpDataTemplate):
             A value for the objective function
         """
 
-        phase_list = self._thermo_wrapper(eos)
+        logger = logging.getLogger(__name__)
+
+        try:
+            phase_list = self._thermo_wrapper(eos)
+        except ThermoEvalError:
+            logger.warning("Thermodynamic calculation failed for {}, objective set to inf".format(self.name))
+            return np.inf
 
         # Reformat array of results
         phase_list, len_list = ff.reformat_ouput(phase_list) 
-        phase_list = np.transpose(np.array(phase_list))
+        phase_list = np.ascontiguousarray(np.transpose(phase_list))
+
+        # Failed points are reported as NaN, skip the residuals for this parameter set
+        if not np.isfinite(phase_list[self._fit_rows]).all():
+            return np.inf
 
         # objective function
-        obj_value = np.sum((((phase_list[0] - self._thermodict["rhol"]) / self._thermodict["rhol"])**2)*self.weights['rhol'])
+        obj_value = calc_sq_rel_dev(phase_list[:1], self._exp, self._wexp)
 
         return obj_value
 
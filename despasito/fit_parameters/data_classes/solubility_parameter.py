@@ -7,7 +7,8 @@ import logging
 
 from despasito.thermodynamics import thermo
 from despasito.fit_parameters import fit_funcs as ff
-from despasito.fit_parameters.interface import ExpDataTemplate
+from despasito.fit_parameters.interface import ExpDataTemplate, ThermoEvalError
+from despasito.fit_parameters.exts import calc_sq_rel_dev_rows
 
 ##################################################################
 #                                                                #
@@ -46,6 +47,8 @@ class Data(ExpDataTemplate):
         List of pressure.
     """
 
+    __slots__ = ("name", "calctype", "weights", "_thermodict", "_fit_rows", "_exp", "_wexp")
+
     def __init__(self, data_dict):
 
         logger = logging.getLogger(__name__)
@@ -62,7 +65,7 @@ class Data(ExpDataTemplate):
 
         try:
             self.weights = data_dict["weights"]
-        except:
+        except KeyError:
             self.weights = {}
 
         if "xi" in data_dict:
@@ -71,10 +74,10 @@ class Data(ExpDataTemplate):
             self._thermodict["xilist"] = data_dict["yi"]
             logger.info("Vapor mole fraction recorded as 'xi'")
         if "T" in data_dict:
-            self._thermodict["Tlist"] = data_dict["T"]
+            self._thermodict["Tlist"] = np.ascontiguousarray(data_dict["T"], dtype=np.float64)
         if "rhol" in data_dict:
             key = 'rhol'
-            self._thermodict["rhol"] = data_dict["rhol"]
+            self._thermodict["rhol"] = np.ascontiguousarray(data_dict["rhol"], dtype=np.float64)
             if key in self.weights:
                 if type(self.weights[key]) != float and len(self.weights[key]) != len(self._thermodict[key]):
                     raise ValueError("Array of weights for '{}' values not equal to number of experimental values given.".format(key))
@@ -84,13 +87,13 @@ class Data(ExpDataTemplate):
                 self.weights['Plist'] = self.weights.pop('P')
         if "delta" in data_dict:
             key = 'delta'
-            self._thermodict["delta"] = data_dict["delta"]
+            self._thermodict["delta"] = np.ascontiguousarray(data_dict["delta"], dtype=np.float64)
             if key in self.weights:
                 if type(self.weights[key]) != float and len(self.weights[key]) != len(self._thermodict[key]):
                     raise ValueError("Array of weights for '{}' values not equal to number of experimental values given.".format(key))
 
         tmp = ["Tlist", "delta"]
-        if not all([x in self._thermodict.keys() for x in tmp]):
+        if not all(x in self._thermodict for x in tmp):
             raise ImportError("Given solubility data, value(s) for T and delta should have been provided.")
 
         for key in self._thermodict.keys():
@@ -98,6 +101,15 @@ class Data(ExpDataTemplate):
                 if key != 'calculation_type':
                     self.weights[key] = 1.0
 
+        # Rows of the reformatted thermo output that are compared to exp. data
+        quantities = ["delta", "rhol"]
+        self._fit_rows = [i for i, key in enumerate(quantities) if key in self._thermodict]
+        fit_keys = [quantities[i] for i in self._fit_rows]
+
+        # Exp. data and weights of the fitted quantities, with one row per quantity
+        self._exp = np.array([self._thermodict[key] for key in fit_keys])
+        self._wexp = np.array([np.broadcast_to(np.array(self.weights[key], float), len(self._thermodict[key])) for key in fit_keys])
+
         logger.info("Data type 'solubility parameter' initiated with calctype, {}, and data types: {}.\nWeight data by: {}".format(self.calctype,", ".join(self._thermodict.keys()),self.weights))
 
         if 'rhodict' in data_dict:
@@ -119,24 +131,27 @@ class Data(ExpDataTemplate):
             A list of the predicted thermodynamic values estimated from thermo calculation. This list can be composed of lists or floats
         """
 
+        logger = logging.getLogger(__name__)
+
         # Check bead type
         if 'xilist' not in self._thermodict:
             if len(eos._nui) > 1:
                 raise ValueError("Ambiguous instructions. Include xi to define intended component to obtain saturation properties")
             else:
-                self._thermodict['xilist'] = np.array([[1.0] for x in range(len(self._thermodict['Tlist']))])
+                self._thermodict['xilist'] = np.ones((len(self._thermodict['Tlist']), 1))
 
         # Run thermo calculations
         try:
             output_dict = thermo(eos, self._thermodict)
             output = [output_dict["delta"],output_dict["rhol"]]
-        except:
-            raise ValueError("Calculation of solubility_parameter failed")
+        except (TypeError, ValueError, KeyError, RuntimeError):
+            logger.debug("Calculation of solubility_parameter failed", exc_info=True)
+            raise ThermoEvalError("Calculation of solubility_parameter failed")
 
         return output
 
 
-    def objective(self, eos):
+    def objective(self, eos, beadparams=None):
 
         """
         Generate objective function value from this dataset
@@ -145,6 +160,8 @@ class Data(ExpDataTemplate):
         ----------
         eos : obj
             EOS object with updated parameters
+        beadparams : numpy.ndarray, Optional
+            Values of the parameters being fit, unused by this data type
 
         Returns
         -------
@@ -154,25 +171,29 @@ class Data(ExpDataTemplate):
 
         logger = logging.getLogger(__name__)
 
-        phase_list = self._thermo_wrapper(eos)
+        try:
+            phase_list = self._thermo_wrapper(eos)
+        except ThermoEvalError:
+            logger.warning("Thermodynamic calculation failed for {}, objective set to inf".format(self.name))
+            return np.inf
 
         ## Reformat array of results
         phase_list, len_list = ff.reformat_ouput(phase_list)
-        phase_list = np.transpose(np.array(phase_list))
+        phase_list = np.ascontiguousarray(np.transpose(phase_list))
+
+        # Failed points are reported as NaN, skip the residuals for this parameter set
+        if not np.isfinite(phase_list[self._fit_rows]).all():
+            return np.inf
 
         # objective function
         obj_value = np.zeros(2)
-        if "delta" in self._thermodict:
-            obj_value[0] = np.sum((((phase_list[0] - self._thermodict["delta"]) / self._thermodict["delta"])**2)*self.weights['delta'])
-        if "rhol" in self._thermodict:
-            obj_value[1] = np.sum((((phase_list[1] - self._thermodict["rhol"]) / self._thermodict["rhol"])**2)*self.weights['rhol'])
+        obj_value[self._fit_rows] = calc_sq_rel_dev_rows(phase_list[self._fit_rows], self._exp, self._wexp)
 
-        logger.debug("Obj. breakdown for {}: delta {}, rhol {}".format(self.name,obj_value[0],obj_value[1]))
+        logger.debug("Obj. breakdown for %s: delta %s, rhol %s", self.name, obj_value[0], obj_value[1])
 
-        if all(np.isnan(obj_value)):
-            obj_total = np.nan
-        else:
-            obj_total = np.nansum(obj_value)
+        obj_total = np.nansum(obj_value)
+        if not np.isfinite(obj_total):
+            obj_total = np.inf
 
         return obj_total
 
@@ -0,0 +1,19 @@
+r"""
+    Select the compiled or numpy versions of the objective function routines used by the data classes.
+
+    This module is imported by the data class modules, after the eos object has set whether Numba is used. Setting the environment variable NUMBA_DISABLE_JIT to a nonzero integer selects the numpy versions regardless.
+
+"""
+
+import os
+
+if 'NUMBA_DISABLE_JIT' in os.environ:
+    disable_jit = bool(int(os.environ['NUMBA_DISABLE_JIT']))
+else:
+    from despasito.equations_of_state import jit_stat
+    disable_jit = jit_stat.disable_jit
+
+if disable_jit:
+    from despasito.fit_parameters.nojit_exts import calc_sq_rel_dev, calc_sq_rel_dev_rows
+else:
+    from despasito.fit_parameters.jit_exts import calc_sq_rel_dev, calc_sq_rel_dev_rows
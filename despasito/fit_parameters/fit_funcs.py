@@ -1,7 +1,11 @@
 
 import numpy as np
 import logging
+import functools
+import multiprocessing
 import scipy.optimize as spo
+import scipy.interpolate as spi
+import scipy.spatial as sps
 
 
 def initial_guess(opt_params, eos):
@@ -26,22 +30,35 @@ def initial_guess(opt_params, eos):
         
     """
 
-    # Update beadlibrary with test paramters
+    fit_params = tuple(opt_params['fit_params'])
+    param_version = getattr(eos, "_param_version", None)
+    if param_version is None:
+        beadparams0 = _initial_guess.__wrapped__(opt_params['fit_bead'], fit_params, eos, param_version)
+    else:
+        beadparams0 = _initial_guess(opt_params['fit_bead'], fit_params, eos, param_version)
+
+    return np.array(beadparams0)
+
+@functools.lru_cache(maxsize=8)
+def _initial_guess(fit_bead, fit_params, eos, param_version):
+    r"""
+    Cached version of :func:`initial_guess`, where param_version is the counter of parameter updates in the eos object.
+    """
 
-    beadparams0 = np.ones(len(opt_params['fit_params']))
-    for i, param in enumerate(opt_params['fit_params']):
+    beadparams0 = np.empty(len(fit_params), dtype=np.float64)
+    for i, param in enumerate(fit_params):
         fit_params_list = param.split("_")
         if (fit_params_list[0] == "l" and fit_params_list[1] in ["a","r"]):
             fit_params_list[0] = "{}_{}".format(fit_params_list[0],fit_params_list[1])
             fit_params_list.remove(fit_params_list[1])
         if len(fit_params_list) == 1:
-            beadparams0[i] = eos.param_guess(fit_params_list[0], [opt_params['fit_bead']])
+            beadparams0[i] = eos.param_guess(fit_params_list[0], [fit_bead])
         elif len(fit_params_list) == 2:
-            beadparams0[i] = eos.param_guess(fit_params_list[0], [opt_params['fit_bead'], fit_params_list[1]])
+            beadparams0[i] = eos.param_guess(fit_params_list[0], [fit_bead, fit_params_list[1]])
         else:
             raise ValueError("Parameters for only one bead are allowed to be fit at one time. Please only list one bead type in your fit parameter name.")
 
-    return beadparams0
+    return tuple(beadparams0)
 
 def check_parameter_bounds(opt_params, eos, bounds):
     r"""
@@ -67,12 +84,23 @@ def check_parameter_bounds(opt_params, eos, bounds):
     
     """
 
-    new_bounds = [(0,0) for x in range(len(opt_params['fit_params']))]
+    bounds = tuple(tuple(float(x) for x in bound) for bound in bounds)
+    new_bounds = _check_parameter_bounds(opt_params['fit_bead'], tuple(opt_params['fit_params']), eos, bounds)
+
+    return list(new_bounds)
+
+@functools.lru_cache(maxsize=8)
+def _check_parameter_bounds(fit_bead, fit_params, eos, bounds):
+    r"""
+    Cached version of :func:`check_parameter_bounds`, the bounds are given as a tuple of pairs.
+    """
+
+    new_bounds = [(0,0) for x in range(len(fit_params))]
     # Check boundary parameters to be sure they're in a reasonable range
-    for i, param in enumerate(opt_params['fit_params']):
-        new_bounds[i] = tuple(eos.check_bounds(opt_params['fit_bead'], param, bounds[i]))
+    for i, param in enumerate(fit_params):
+        new_bounds[i] = tuple(eos.check_bounds(fit_bead, param, bounds[i]))
 
-    return new_bounds
+    return tuple(new_bounds)
 
 def reformat_ouput(cluster):
     r"""
@@ -94,43 +122,10 @@ def reformat_ouput(cluster):
 
     #logger = logging.getLogger(__name__)
 
-    # Arrange data
-    type_cluster = [type(x[0]) for x in cluster]
-
-    # if input is a list or array
-    if len(cluster) == 1:
-        matrix = np.transpose(np.array(cluster[0]))
-        if cluster[0][0] not in [list,np.ndarray,tuple]:
-            len_cluster = [1]
-        else:
-            len_cluster = [len(cluster[0][0])]
-
-    # If list of lists or arrays
-    else:
-
-        # Obtain dimensions of final matrix
-        len_cluster = []
-        for i,typ in enumerate(type_cluster):
-            if typ in [list,np.ndarray,tuple]:
-                len_cluster.append(len(cluster[i][0]))
-            else:
-                len_cluster.append(1)
-        matrix_tmp = np.zeros([len(cluster[0]), sum(len_cluster)])
-
-        # Transfer information to final matrix
-        ind = 0
-        for i, val in enumerate(cluster):
-            matrix = np.transpose(np.array(val))
-            l = len_cluster[i]
-            if l == 1:
-                matrix_tmp[:, ind] = np.array(matrix)
-                ind += 1
-            else:
-                for j in range(l):
-                    matrix_tmp[:, ind] = matrix[j]
-                    ind += 1
-        #matrix = np.transpose(np.array(matrix_tmp))
-        matrix = np.array(matrix_tmp)
+    # Arrange data, vectors become single columns and matrices are added column by column
+    columns = [np.asarray(val, dtype=float) for val in cluster]
+    len_cluster = [1 if col.ndim == 1 else col.shape[1] for col in columns]
+    matrix = np.column_stack(columns)
 
     return matrix, len_cluster
 
@@ -184,21 +179,15 @@ class BasinStep(object):
         
         # Save intital guess in array
         xold = np.copy(x)
+        stepmag = np.asarray(self._stepmag, dtype=float) * self._stepsize
 
         # Loop for number of times to start over
         for j in range(1000):
-            # reset array x
-            x = np.copy(xold)
-            breakloop = True
-            # Iterate through array of step magnitudes
-            for i, mag in enumerate(self._stepmag):
-                # Add or subtract a random number within distribution of +- mag*stepsize
-                x[i] += np.random.uniform(-mag * self._stepsize, mag * self._stepsize)
-                # If a value of x is negative, don't  break the cycle
-                if x[i] < 0.0:
-                    breakloop = False
-            if breakloop: break
-            logger.info("Basin Step after {} iterations:\n    {}".format(j,x))
+            # Add or subtract a random number within distribution of +- mag*stepsize
+            x = xold + np.random.uniform(-stepmag, stepmag)
+            # If a value of x is negative, start over
+            if np.all(x >= 0.0): break
+            logger.info("Basin Step after %s iterations:\n    %s", j, x)
         return x
 
 class BasinBounds(object):
@@ -247,7 +236,126 @@ class BasinBounds(object):
         return tmax and tmin
 
 
-def global_minimization(global_method, beadparams0, bounds, fit_bead, fit_params, eos, exp_dict, global_dict={}, minimizer_dict={}):
+class SurrogateObjective(object):
+    r"""
+    Object used to wrap an objective function so that parameter sets near those already evaluated are estimated with a surrogate model instead of calling the equation of state.
+    """
+
+    def __init__(self, func, bounds, method="rbf", refresh_interval=50, tol=1e-2, min_samples=None, neighbors=50):
+        r"""
+            
+        Parameters
+        ----------
+        func : function
+            Objective function, called as func(beadparams, \*args)
+        bounds : list[tuple]
+            List of length equal to fit_params with lists of pairs for minimum and maximum bounds of parameter being fit.
+        method : str, Optional, default: "rbf"
+            Surrogate model type. Currently only a radial basis function interpolation, "rbf", is supported.
+        refresh_interval : int, Optional, default: 50
+            Every this many evaluations the true objective function is called and the surrogate model is refit.
+        tol : float, Optional, default: 1e-2
+            A guess in parameters is estimated with the surrogate model if its distance to the nearest parameter set the model was fit to, with parameters scaled by their bounds, is below this value.
+        min_samples : int, Optional, default: 2*(len(bounds)+1)
+            Number of true evaluations needed before the surrogate model is first used
+        neighbors : int, Optional, default: 50
+            Number of nearest evaluated parameter sets used by the surrogate model in a prediction
+    
+        Attributes
+        ----------
+        method : str
+            Surrogate model type
+        ncalls : int
+            Number of times the objective function was requested
+        nsurrogate : int
+            Number of times the surrogate model was used instead of the objective function
+            
+        """
+
+        methods = ["rbf"]
+        if method not in methods:
+            raise ValueError("Surrogate model, {}, is not currently supported. Try: {}".format(method,", ".join(methods)))
+
+        bounds = np.transpose(np.array(bounds, float))
+        self._xmin = bounds[0]
+        self._xspan = bounds[1] - bounds[0]
+        self._xspan[self._xspan == 0.] = 1.
+
+        self._func = func
+        self.method = method
+        self._refresh_interval = refresh_interval
+        self._tol = tol
+        if min_samples is None:
+            min_samples = 2*(len(self._xmin)+1)
+        self._min_samples = min_samples
+        self._neighbors = neighbors
+
+        self._xsamples = []
+        self._ysamples = []
+        self._model = None
+        self._tree = None # Nearest neighbor search over the parameter sets the model was fit to
+        self.ncalls = 0
+        self.nsurrogate = 0
+
+    def __call__(self, beadparams, *args):
+        r"""
+            
+        Parameters
+        ----------
+        beadparams : numpy.ndarray
+            Guess in parameters values
+        args : tuple
+            Additional arguments for the objective function
+
+        Returns
+        -------
+        obj_total : float
+            Value of the objective function, or its estimate from the surrogate model
+            
+        """
+
+        self.ncalls += 1
+        x = (np.asarray(beadparams, float) - self._xmin) / self._xspan
+
+        refresh = self.ncalls % self._refresh_interval == 0
+        if self._model is not None and not refresh:
+            distance, _ = self._tree.query(x)
+            if distance < self._tol:
+                self.nsurrogate += 1
+                return float(self._model(x[np.newaxis])[0])
+
+        obj_total = self._func(beadparams, *args)
+        if np.isfinite(obj_total):
+            self._xsamples.append(x)
+            self._ysamples.append(obj_total)
+
+        if (self._model is None and len(self._ysamples) >= self._min_samples) or refresh:
+            self._fit()
+
+        return obj_total
+
+    def _fit(self):
+        r"""
+        Fit surrogate model to the evaluated parameter sets.
+        """
+
+        logger = logging.getLogger(__name__)
+
+        if len(self._ysamples) < self._min_samples:
+            return
+
+        xsamples = np.array(self._xsamples)
+        try:
+            self._model = spi.RBFInterpolator(xsamples, np.array(self._ysamples), neighbors=min(self._neighbors, len(self._ysamples)))
+        except (ValueError, np.linalg.LinAlgError):
+            logger.debug("Surrogate model could not be fit to {} samples".format(len(self._ysamples)))
+            return
+        self._tree = sps.cKDTree(xsamples)
+
+        logger.info("Surrogate model refit with {} samples, used for {} of {} evaluations".format(len(self._ysamples),self.nsurrogate,self.ncalls))
+
+
+def global_minimization(global_method, beadparams0, bounds, fit_bead, fit_params, eos, exp_dict, global_dict={}, minimizer_dict={}, pool=None):
     r"""
     Fit defined parameters for equation of state object with given experimental data. 
 
@@ -277,6 +385,7 @@ def global_minimization(global_method, beadparams0, bounds, fit_bead, fit_params
         - T (float) - default: 0.5, Temperature parameter, should be comparable to separation between local minima (i.e. the “height” of the walls separating values).
         - niter_success (int) - default: 3, Stop run if minimum stays the same for this many iterations
         - stepsize (float) - default: 0.1, Maximum step size for use in the random displacement. We use this value to define an object for the `take_step` option that includes a custom routine that produces attribute stepsizes for each parameter.
+        - surrogate (dict) - Optional, Available to all methods. If given, the objective function is wrapped in a :class:`SurrogateObjective` and this dictionary is passed as its kwargs, (e.g. {"method": "rbf", "refresh_interval": 50, "tol": 1e-2}).
 
     minimizer_dict : dict, Optional
         Dictionary used to define minimization type and the associated options.
@@ -284,6 +393,9 @@ def global_minimization(global_method, beadparams0, bounds, fit_bead, fit_params
         - method (str) - Method available to scipy.optimize.minimize
         - options (dict) - This dictionary contains the kwargs available to the chosen method
 
+    pool : multiprocessing.Pool, Optional
+        Pool of processes used to evaluate the objective function of each exp. data set in parallel. If None, the data sets are evaluated in serial.
+
     Returns
     -------
     Objective : float
@@ -294,6 +406,17 @@ def global_minimization(global_method, beadparams0, bounds, fit_bead, fit_params
     # !!!!!!!!! If another methods is added to the if statement below, please also add it here and update the documentation above. !!!!!!!!
     methods = ["basinhopping", "differential_evolution", "brute"]
 
+    logger = logging.getLogger(__name__)
+
+    # Bind the fixed arguments once, so the optimizers call the objective with the parameters alone
+    obj_func = functools.partial(compute_obj, fit_bead=fit_bead, fit_params=fit_params, eos=eos, exp_dict=exp_dict, pool=pool)
+
+    # Replace thermo calculations with a surrogate model near sampled parameter sets
+    if "surrogate" in global_dict:
+        obj_func = SurrogateObjective(obj_func, bounds, **global_dict["surrogate"])
+        global_dict = {key: value for key, value in global_dict.items() if key != "surrogate"}
+        logger.info("Objective function evaluated with {} surrogate model".format(obj_func.method))
+
     if global_method == "basinhopping":
 
         # Options for basin hopping
@@ -326,7 +449,7 @@ def global_minimization(global_method, beadparams0, bounds, fit_bead, fit_params
         except:
         	raise TypeError("Could not initialize BasinStep and/or BasinBounds")
 
-        result = spo.basinhopping(compute_obj, beadparams0, **global_dict, accept_test=custombounds, disp=True, minimizer_kwargs={"args": (fit_bead, fit_params, eos, exp_dict),**minimizer_dict})
+        result = spo.basinhopping(obj_func, beadparams0, **global_dict, accept_test=custombounds, disp=True, minimizer_kwargs=minimizer_dict)
 
     elif global_method == "differential_evolution":
 
@@ -337,7 +460,7 @@ def global_minimization(global_method, beadparams0, bounds, fit_bead, fit_params
                 new_global_dict[key] = value
         global_dict = new_global_dict
 
-        result = spo.differential_evolution(compute_obj, bounds, args=(fit_bead, fit_params, eos, exp_dict), **global_dict)
+        result = spo.differential_evolution(obj_func, bounds, **global_dict)
 
     elif global_method == "brute":
 
@@ -348,15 +471,19 @@ def global_minimization(global_method, beadparams0, bounds, fit_bead, fit_params
                 new_global_dict[key] = value
         global_dict = new_global_dict
 
-        result = spo.brute(compute_obj, bounds, args=(fit_bead, fit_params, eos, exp_dict), **global_dict)
+        result = spo.brute(obj_func, bounds, **global_dict)
 
     else:
         raise ValueError("Global optimization method, {}, is not currently supported. Try: {}".format(global_method,", ".join(methods)))
 
+    # Report the true objective value of the final parameters
+    if isinstance(obj_func, SurrogateObjective) and hasattr(result, "x"):
+        result.fun = compute_obj(result.x, fit_bead, fit_params, eos, exp_dict, pool)
+
     return result
 
 
-def compute_obj(beadparams, fit_bead, fit_params, eos, exp_dict):
+def compute_obj(beadparams, fit_bead, fit_params, eos, exp_dict, pool=None):
     r"""
     Fit defined parameters for equation of state object with given experimental data. 
 
@@ -376,6 +503,8 @@ def compute_obj(beadparams, fit_bead, fit_params, eos, exp_dict):
         Equation of state output that writes pressure, max density, chemical potential, updates parameters, and evaluates objective functions. For parameter fitting algorithm See equation of state documentation for more details.
     exp_dict : dict
         Dictionary of experimental data objects.
+    pool : multiprocessing.Pool, Optional
+        Pool of processes used to evaluate the objective function of each exp. data set in parallel, created with :func:`create_pool` so that each process keeps its own copy of the eos and exp. data objects. If None, the data sets are evaluated in serial.
 
     Returns
     -------
@@ -395,20 +524,112 @@ def compute_obj(beadparams, fit_bead, fit_params, eos, exp_dict):
         eos.update_parameters(fit_bead, param, beadparams[i])
     eos.parameter_refresh()
 
-    # Compute obj_function
-    obj_function = []
-    for key,data_obj in exp_dict.items():
-        try:
-            obj_function.append(data_obj.objective(eos))
-        except:
-            raise ValueError("Failed to evaluate objective function for {} of type {}.".format(key,data_obj.name))
-
-    obj_total = np.nansum(obj_function)
-    if obj_total == 0. and np.isnan(np.sum(obj_function)):
+    # Compute obj_function, processes of the pool only receive the parameters and the data set key
+    if pool is None:
+        obj_function = [_objective_wrapper((key, data_obj, eos, beadparams)) for key, data_obj in exp_dict.items()]
+    else:
+        obj_function = pool.map(_call_worker, [(key, beadparams) for key in exp_dict])
+
+    # Sum ignoring NaN values, the total is inf if every data set returned NaN
+    obj_total = 0.
+    any_value = False
+    for obj_value in obj_function:
+        if not np.isnan(obj_value):
+            obj_total += obj_value
+            any_value = True
+    if not any_value:
         obj_total = np.inf
 
     # Write out parameters and objective functions for each dataset
-    logger.info("\nParameters: {}\nValues: {}\nExp. Data: {}\nObj. Values: {}\nTotal Obj. Value: {}".format(fit_params,beadparams,list(exp_dict.keys()),obj_function,obj_total))
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("\nParameters: %s\nValues: %s\nExp. Data: %s\nObj. Values: %s\nTotal Obj. Value: %s", fit_params, beadparams, list(exp_dict), obj_function, obj_total)
 
     return obj_total
 
+def _objective_wrapper(inputs):
+    r"""
+    Evaluate the objective function of a single experimental data object. This function is defined at the module level so that it can be used with a multiprocessing pool.
+
+    Parameters
+    ----------
+    inputs : tuple
+        The key of the data set in exp_dict, the experimental data object, the eos object with updated parameters, and the values of these parameters.
+
+    Returns
+    -------
+    obj_value : float
+        Objective function value of the data set, inf if a numerical error occurred in its evaluation
+    """
+
+    logger = logging.getLogger(__name__)
+
+    key, data_obj, eos, beadparams = inputs
+    try:
+        obj_value = data_obj.objective(eos, beadparams=beadparams)
+    except (ValueError, RuntimeError, FloatingPointError, ZeroDivisionError, np.linalg.LinAlgError) as e:
+        logger.warning("Failed to evaluate objective function for %s of type %s: %s", key, data_obj.name, e, exc_info=logger.isEnabledFor(logging.DEBUG))
+        obj_value = np.inf
+
+    return obj_value
+
+def create_pool(nprocs, fit_bead, fit_params, eos, exp_dict):
+    r"""
+    Create a pool of processes used by :func:`compute_obj` to evaluate the exp. data sets in parallel.
+
+    The eos and exp. data objects are sent to each process once when it starts, and are kept there between evaluations of the objective function. Their caches and warm starts are therefore reused, while only the parameters are sent with each evaluation.
+
+    Parameters
+    ----------
+    nprocs : int
+        Number of processes
+    fit_bead : str
+        Name of bead whose parameters are being fit, should be in bead list of beadconfig
+    fit_params : list[str]
+        This list of contains the name of the parameter being fit (e.g. epsilon).
+    eos : obj
+        Equation of state object
+    exp_dict : dict
+        Dictionary of experimental data objects.
+
+    Returns
+    -------
+    pool : multiprocessing.Pool
+        Pool of processes, which should be closed by the caller
+    """
+
+    return multiprocessing.Pool(nprocs, initializer=_init_worker, initargs=(fit_bead, fit_params, eos, exp_dict))
+
+# Eos and exp. data objects kept in a worker process of the pool from create_pool
+_worker_data = None
+
+def _init_worker(fit_bead, fit_params, eos, exp_dict):
+    r"""
+    Save the objects used by :func:`_call_worker` when a worker process of :func:`create_pool` starts.
+    """
+
+    global _worker_data
+    _worker_data = (fit_bead, fit_params, eos, exp_dict)
+
+def _call_worker(inputs):
+    r"""
+    Evaluate the objective function of one exp. data set in a worker process of :func:`create_pool`, after updating the parameters of its eos object.
+
+    Parameters
+    ----------
+    inputs : tuple
+        The key of the data set in exp_dict and the values of the parameters being fit
+
+    Returns
+    -------
+    obj_value : float
+        Objective function value of the data set, inf if a numerical error occurred in its evaluation
+    """
+
+    key, beadparams = inputs
+    fit_bead, fit_params, eos, exp_dict = _worker_data
+
+    for i, param in enumerate(fit_params):
+        eos.update_parameters(fit_bead, param, beadparams[i])
+    eos.parameter_refresh()
+
+    return _objective_wrapper((key, exp_dict[key], eos, beadparams))
@@ -10,6 +10,13 @@
 from abc import ABC, abstractmethod
 
 
+class ThermoEvalError(ValueError):
+
+    """
+    Raised by an experimental data object when the thermodynamic calculation of its predictions fails for the current parameters.
+    """
+    pass
+
 # __________________ EOS Interface _________________
 class ExpDataTemplate(ABC):
 
@@ -19,10 +26,15 @@ class ExpDataTemplate(ABC):
      Using this template all future data types will be easily exchanged.
     """
 
+    # Subclasses declare their attributes in __slots__
+    __slots__ = ()
+
     @abstractmethod
-    def objective(self, eos):
+    def objective(self, eos, beadparams=None):
         """
         Float representing objective function of from comparing predictions to experimental data.
+
+        The optional beadparams are the values of the parameters being fit, which a data type may use to reuse results of a nearby parameter set. The objective value must not depend on the parameter sets evaluated before.
         """
         pass
 
@@ -0,0 +1,70 @@
+r"""
+    Routines for evaluating the objective function contributions of experimental data sets, compiled with Numba.
+
+    Explicit loops are used so that no temporary arrays are created in the objective function of each data set. Fast math flags that assume finite values are left out, as failed EOS calculations are reported with NaN.
+    
+"""
+
+import numpy as np
+import numba
+
+@numba.njit([numba.f8(numba.f8[:,:], numba.f8[:,:], numba.f8[:,:]), numba.f8(numba.f4[:,:], numba.f4[:,:], numba.f4[:,:])], cache=True, fastmath={"reassoc", "contract", "nsz"})
+def calc_sq_rel_dev(pred, exp, weights):
+    r""" 
+    Return the weighted sum of squared relative deviations between predicted and experimental values. Matrices may be float64 or float32, the sum is accumulated in float64.
+
+    Parameters
+    ----------
+    pred : numpy.ndarray
+        Matrix of predicted values
+    exp : numpy.ndarray
+        Matrix of experimental values, the same shape as pred
+    weights : numpy.ndarray
+        Matrix of weights for each data point, the same shape as pred
+
+    Returns
+    -------
+    obj : float
+        Weighted sum of squared relative deviations, NaN if any prediction is NaN. Points with an experimental value of zero are skipped.
+    """
+
+    obj = 0.0
+    for i in range(exp.shape[0]):
+        for j in range(exp.shape[1]):
+            if exp[i,j] == 0.0:
+                continue
+            tmp = (pred[i,j] - exp[i,j]) / exp[i,j]
+            obj += tmp*tmp*weights[i,j]
+
+    return obj
+
+@numba.njit(numba.f8[:](numba.f8[:,:], numba.f8[:,:], numba.f8[:,:]), cache=True, fastmath={"reassoc", "contract", "nsz"})
+def calc_sq_rel_dev_rows(pred, exp, weights):
+    r""" 
+    Return the weighted sum of squared relative deviations between predicted and experimental values for each row.
+
+    Parameters
+    ----------
+    pred : numpy.ndarray
+        Matrix of predicted values, one row for each property
+    exp : numpy.ndarray
+        Matrix of experimental values, the same shape as pred
+    weights : numpy.ndarray
+        Matrix of weights for each data point, the same shape as pred
+
+    Returns
+    -------
+    obj : numpy.ndarray
+        Weighted sum of squared relative deviations of each row, NaN if any prediction in the row is NaN. Points with an experimental value of zero are skipped.
+    """
+
+    obj = np.zeros(exp.shape[0])
+    for i in range(exp.shape[0]):
+        for j in range(exp.shape[1]):
+            if exp[i,j] == 0.0:
+                continue
+            tmp = (pred[i,j] - exp[i,j]) / exp[i,j]
+            obj[i] += tmp*tmp*weights[i,j]
+
+    return obj
+
@@ -0,0 +1,61 @@
+r"""
+    Routines for evaluating the objective function contributions of experimental data sets.
+
+    These numpy versions are used when Numba is disabled, see jit_exts.py for the compiled equivalents.
+    
+"""
+
+import numpy as np
+
+def calc_sq_rel_dev(pred, exp, weights):
+    r""" 
+    Return the weighted sum of squared relative deviations between predicted and experimental values.
+
+    Parameters
+    ----------
+    pred : numpy.ndarray
+        Matrix of predicted values
+    exp : numpy.ndarray
+        Matrix of experimental values, the same shape as pred
+    weights : numpy.ndarray
+        Matrix of weights for each data point, the same shape as pred
+
+    Returns
+    -------
+    obj : float
+        Weighted sum of squared relative deviations, NaN if any prediction is NaN. Points with an experimental value of zero are skipped.
+    """
+
+    return np.sum(_rel_dev(pred, exp)**2*weights)
+
+def calc_sq_rel_dev_rows(pred, exp, weights):
+    r""" 
+    Return the weighted sum of squared relative deviations between predicted and experimental values for each row.
+
+    Parameters
+    ----------
+    pred : numpy.ndarray
+        Matrix of predicted values, one row for each property
+    exp : numpy.ndarray
+        Matrix of experimental values, the same shape as pred
+    weights : numpy.ndarray
+        Matrix of weights for each data point, the same shape as pred
+
+    Returns
+    -------
+    obj : numpy.ndarray
+        Weighted sum of squared relative deviations of each row, NaN if any prediction in the row is NaN. Points with an experimental value of zero are skipped.
+    """
+
+    return np.sum(_rel_dev(pred, exp)**2*weights, axis=1)
+
+def _rel_dev(pred, exp):
+    r""" 
+    Return the relative deviation of predicted values from experimental values, set to zero where the experimental value is zero.
+    """
+
+    rel_dev = np.zeros(pred.shape, dtype=np.result_type(pred, exp))
+    np.divide(pred - exp, exp, out=rel_dev, where=(exp != 0.0))
+
+    return rel_dev
+
@@ -315,7 +315,7 @@ def process_param_fit_inputs(thermo_dict):
                 value.pop(key2,None)
 
             if value:
-               logger.info("The opt_params keys: {}, were not used.".format(", ".join(list(value.keys()))))
+               logger.info("The opt_params keys: {}, were not used.".format(", ".join(value)))
             new_thermo_dict[key] = new_opt_params
 
         elif (type(value) == dict and "datatype" in value):
@@ -331,8 +331,8 @@ def process_param_fit_inputs(thermo_dict):
             new_thermo_dict[key] = new_thermo_dict["opt_params"][key]
             new_thermo_dict["opt_params"].pop(key,None)
 
-    test1 = set(["exp_data","opt_params"]).issubset(list(new_thermo_dict.keys()))
-    test2 = set(["fit_bead","fit_params"]).issubset(list(new_thermo_dict["opt_params"].keys()))
+    test1 = set(["exp_data","opt_params"]).issubset(new_thermo_dict)
+    test2 = set(["fit_bead","fit_params"]).issubset(new_thermo_dict["opt_params"])
     if not all([test1,test2]):
         raise ValueError("An exp_data and opt_params dictionary with, fit_beads and fit_params must be given")
 
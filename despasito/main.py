@@ -50,7 +50,7 @@ def run(filename="input.json", path=".", **args):
     eos = eos_mod(**eos_dict)
     
     # Run either parametrization or thermodynamic calculation
-    if "opt_params" in list(thermo_dict.keys()):
+    if "opt_params" in thermo_dict:
         logger.info("Initializing parametrization procedure")
         output_dict = fit(eos, thermo_dict)
         #output = fit(eos, thermo_dict)
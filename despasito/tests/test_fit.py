@@ -6,10 +6,14 @@ Unit and regression test for the despasito package.
 import despasito.input_output.read_input as ri
 import despasito.fit_parameters as fit
 import despasito.fit_parameters.fit_funcs as funcs
+import despasito.fit_parameters.data_classes as data_classes
+import despasito.thermodynamics as thermo
+from despasito.fit_parameters.data_classes import TLVE
 import despasito.equations_of_state
 import pytest
 import sys
 import numpy as np
+import copy
 
 Tlist = [323.2]
 xilist = [[0.01,0.99]]
@@ -30,6 +34,14 @@ exp_data = {'Wiley': {'name': 'sat_props', 'calctype': 'sat_props', 'T': np.arra
 ## Optimization options
 opt_params = {"fit_bead" : "CH3OH", "fit_params": ["epsilon"], "epsilon_bounds" : [150.0, 400.0]}
 
+## Peng-Robinson EOS and TLVE data for acetone and chloroform
+beads_pr = ["acetone","chloroform"]
+nui_pr = np.array([[1., 0.],[0., 1.]])
+beadlibrary_pr = {'acetone': {'Tc': 508.1, 'Pc': 4690000.0, 'omega': 0.304}, 'chloroform': {'Tc': 536.4, 'Pc': 5471550.0, 'omega': 0.221902}}
+crosslibrary_pr = {"acetone": {"chloroform": {"kij": -0.0605}}}
+eos_pr = despasito.equations_of_state.eos(eos="cubic.peng_robinson", xi=np.array([0.3, 0.7]), beads=beads_pr, nui=nui_pr, beadlibrary=beadlibrary_pr, crosslibrary=crosslibrary_pr)
+tlve_data = {"name": "TLVE", "calctype": "phase_xiT", "T": [332.15], "xi": [[0.3, 0.7]], "yi": [[0.25, 0.75]], "P": [85000.0]}
+
 thermo_dict = {"opt_params": opt_params, "exp_data": exp_data, "basin_dict": {"niter": 1, "niter_success": 1}, "beadparams0": [384.0], "minimizer_dict": {"tol": 1e-1, "maxiter": 25}}
 
 
@@ -44,3 +56,151 @@ def test_fit_1comp(eos=eos,thermo_dict=thermo_dict):
         
     assert output["final_parameters"][0]==pytest.approx(384.93,abs=5e-1) and output["objective_value"]<1.1
 
+
+def test_TLVE_objective_history(eos=eos_pr,data_dict=tlve_data):
+
+    data = TLVE.Data(dict(data_dict))
+    obj_value = data.objective(eos, beadparams=np.array([-0.0605]))
+
+    # A distant parameter set with a finite objective shouldn't change the result of the first one
+    eos.update_parameters("kij", beads_pr, -0.2)
+    obj_far = data.objective(eos, beadparams=np.array([-0.2]))
+    eos.update_parameters("kij", beads_pr, -0.0605)
+
+    assert np.isfinite(obj_far) and data.objective(eos, beadparams=np.array([-0.0605])) == obj_value and data.objective(eos) == obj_value
+
+def test_TLVE_zero_weights(eos=eos_pr,data_dict=tlve_data):
+
+    # A data set with all weights set to zero doesn't contribute to the objective
+    data = TLVE.Data(dict(data_dict, weights={"P": 0.0, "yi": 0.0}))
+    assert data.objective(eos) == 0.0
+
+def test_compute_obj_pool(eos=eos,exp_data=exp_data):
+
+    registry = data_classes.load_registry()
+    exp_dict = {key: registry[value["name"]](copy.deepcopy(value)) for key, value in exp_data.items()}
+    beadparams = np.array([384.0])
+    obj_serial = funcs.compute_obj(beadparams, "CH3OH", ["epsilon"], eos, exp_dict)
+
+    # Evaluate twice, so that the second evaluation uses the objects kept in the processes
+    pool = funcs.create_pool(2, "CH3OH", ["epsilon"], eos, exp_dict)
+    try:
+        obj_pool = [funcs.compute_obj(beadparams, "CH3OH", ["epsilon"], eos, exp_dict, pool=pool) for i in range(2)]
+    finally:
+        pool.close()
+        pool.join()
+
+    assert np.isfinite(obj_serial) and obj_pool == pytest.approx([obj_serial, obj_serial], rel=1e-8)
+
+def test_fit_ncores(eos=eos,exp_data=exp_data):
+
+    output = []
+    for ncores in [1, 2]:
+        thermo_dict = {"opt_params": {"fit_bead": "CH3OH", "fit_params": ["epsilon"], "global_method": "differential_evolution"}, "bounds": [[370.0, 400.0]], "exp_data": copy.deepcopy(exp_data), "global_dict": {"maxiter": 1, "popsize": 3, "polish": False, "seed": 0}, "ncores": ncores}
+        output.append(fit.fit(eos,thermo_dict))
+
+    assert output[1]["final_parameters"] == pytest.approx(output[0]["final_parameters"],rel=1e-8) and output[1]["objective_value"] == pytest.approx(output[0]["objective_value"],rel=1e-8)
+
+def _quadratic(x, calls):
+    calls.append(np.array(x))
+    return float(np.sum(np.square(x)))
+
+def test_surrogate_objective():
+
+    calls = []
+    obj_func = funcs.SurrogateObjective(_quadratic, [(0., 1.), (0., 1.)], refresh_interval=10, tol=0.05, min_samples=6)
+    samples = [[0.1, 0.1], [0.9, 0.1], [0.1, 0.9], [0.9, 0.9], [0.5, 0.5], [0.3, 0.7]]
+    for x in samples:
+        obj_func(np.array(x), calls)
+
+    # Near an evaluated parameter set the surrogate model is used
+    value = obj_func(np.array([0.51, 0.5]), calls)
+    switched = len(calls) == 6 and obj_func.nsurrogate == 1 and value == pytest.approx(0.5101, abs=1e-2)
+
+    # Near a parameter set that was evaluated after the model was fit, the true function is called
+    obj_func(np.array([0.7, 0.2]), calls)
+    obj_func(np.array([0.71, 0.2]), calls)
+    unfit = len(calls) == 8 and obj_func.nsurrogate == 1
+
+    # The tenth call refits the model, after which the new parameter set is used
+    obj_func(np.array([0.2, 0.4]), calls)
+    obj_func(np.array([0.71, 0.2]), calls)
+    refreshed = len(calls) == 9 and obj_func.nsurrogate == 2
+
+    assert switched and unfit and refreshed
+
+def test_surrogate_result(eos=eos,exp_data=exp_data):
+
+    registry = data_classes.load_registry()
+    exp_dict = {key: registry[value["name"]](copy.deepcopy(value)) for key, value in exp_data.items()}
+    global_dict = {"maxiter": 2, "popsize": 3, "polish": False, "seed": 0, "surrogate": {"min_samples": 3, "tol": 0.2}}
+    result = funcs.global_minimization("differential_evolution", np.array([384.0]), [(370.0, 400.0)], "CH3OH", ["epsilon"], eos, exp_dict, global_dict=global_dict)
+
+    assert result.fun == funcs.compute_obj(result.x, "CH3OH", ["epsilon"], eos, exp_dict)
+
+def test_reformat_ouput():
+
+    matrix_1, len_1 = funcs.reformat_ouput([np.array([1., 2., 3.])])
+    matrix_2, len_2 = funcs.reformat_ouput([np.array([1., 2., 3.]), np.array([[0.1, 0.9], [0.2, 0.8], [0.3, 0.7]])])
+
+    assert matrix_1.shape == (3, 1) and len_1 == [1] and matrix_2.shape == (3, 3) and len_2 == [1, 2] and matrix_2[:, 2] == pytest.approx([0.9, 0.8, 0.7])
+
+def test_liquid_density_objective(eos=eos_pr):
+
+    Tlist = np.array([320.0, 330.0])
+    xilist = np.array([[0.4, 0.6], [0.4, 0.6]])
+    rhol_exp = np.array([12000.0, 12500.0])
+    data = data_classes.load_registry()["liquid_density"]({"name": "liquid_density", "T": Tlist, "xi": xilist, "rhol": rhol_exp})
+    obj_value = data.objective(eos)
+
+    # Every point contributes to the objective
+    rhol = thermo.thermo(eos, {"calculation_type": "liquid_properties", "Tlist": Tlist, "xilist": xilist})["rhol"]
+
+    assert obj_value == pytest.approx(np.sum(((rhol - rhol_exp) / rhol_exp)**2), rel=1e-10)
+
+def test_load_registry():
+
+    registry = data_classes.load_registry()
+    assert {"TLVE", "liquid_density", "sat_props", "solubility_parameter"} <= set(registry)
+    assert data_classes.load_registry() is registry and registry["TLVE"] is TLVE.Data
+
+def test_fit_init_errors(eos=eos):
+
+    exp_data = {"bad1": {"name": "sat_props"}, "bad2": {"name": "liquid_density", "T": [300.0]}}
+    with pytest.raises(AttributeError) as excinfo:
+        fit.fit(eos, {"opt_params": {"fit_bead" : "CH3OH", "fit_params": ["epsilon"]}, "bounds": [[370.0, 400.0]], "exp_data": exp_data})
+    assert "bad1" in str(excinfo.value) and "bad2" in str(excinfo.value)
+
+def test_calc_sq_rel_dev():
+
+    jit_exts = pytest.importorskip("despasito.fit_parameters.jit_exts")
+    import despasito.fit_parameters.nojit_exts as nojit_exts
+
+    rng = np.random.default_rng(0)
+    pred = rng.uniform(0.5, 1.5, size=(4, 6))
+    exp = rng.uniform(0.5, 1.5, size=(4, 6))
+    exp[1, 2] = 0.0
+    weights = rng.uniform(0.0, 1.0, size=(4, 6))
+
+    obj = nojit_exts.calc_sq_rel_dev(pred, exp, weights)
+    assert np.isfinite(obj)
+    assert jit_exts.calc_sq_rel_dev(pred, exp, weights)==pytest.approx(obj,rel=1e-12)
+    args = [x.astype(np.float32) for x in (pred, exp, weights)]
+    assert jit_exts.calc_sq_rel_dev(*args)==pytest.approx(nojit_exts.calc_sq_rel_dev(*args),rel=1e-5)
+
+    pred[0, 0] = np.nan
+    assert np.isnan(jit_exts.calc_sq_rel_dev(pred, exp, weights)) and np.isnan(nojit_exts.calc_sq_rel_dev(pred, exp, weights))
+
+def test_exts_env(monkeypatch):
+
+    import importlib.util
+    import despasito.fit_parameters.exts as exts
+    import despasito.fit_parameters.nojit_exts as nojit_exts
+
+    monkeypatch.setenv("NUMBA_DISABLE_JIT", "1")
+    assert importlib.reload(exts).calc_sq_rel_dev is nojit_exts.calc_sq_rel_dev
+    monkeypatch.setenv("NUMBA_DISABLE_JIT", "0")
+    if importlib.util.find_spec("numba") is not None:
+        assert importlib.reload(exts).calc_sq_rel_dev is not nojit_exts.calc_sq_rel_dev
+    monkeypatch.delenv("NUMBA_DISABLE_JIT")
+    importlib.reload(exts)
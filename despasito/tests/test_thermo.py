@@ -36,6 +36,18 @@ epsilonHB_co2_h2o = np.array([[[[   0.,     0.,     0. ], \
                        [   0.,     0.,     0. ]]]])
 eos_co2_h2o = despasito.equations_of_state.eos(eos="saft.gamma_mie",beads=beads_co2_h2o,nui=nui_co2_h2o,beadlibrary=beadlibrary_co2_h2o,crosslibrary=crosslibrary_co2_h2o,sitenames=sitenames_co2_h2o)
 
+## Peng-Robinson EOS for acetone and chloroform
+beads_pr = ["acetone","chloroform"]
+nui_pr = np.array([[1., 0.],[0., 1.]])
+beadlibrary_pr = {'acetone': {'Tc': 508.1, 'Pc': 4690000.0, 'omega': 0.304}, 'chloroform': {'Tc': 536.4, 'Pc': 5471550.0, 'omega': 0.221902}}
+crosslibrary_pr = {"acetone": {"chloroform": {"kij": -0.0605}}}
+eos_pr = despasito.equations_of_state.eos(eos="cubic.peng_robinson", xi=np.array([0.3, 0.7]), beads=beads_pr, nui=nui_pr, beadlibrary=beadlibrary_pr, crosslibrary=crosslibrary_pr)
+T_pr = 332.15
+xi_pr = np.array([0.3, 0.7])
+
+## Critical properties of methane and ethane: Tc, Pc, omega, rho_7, Zc, Vc, M
+CriticalProp_c1_c2 = [[190.6, 305.3], [4.599e+6, 4.872e+6], [0.011, 0.099], [22000., 14000.], [0.286, 0.279], [6.1625e-3, 4.85e-3], [0.016, 0.030]]
+
 def test_thermo_import():
 #    """Sample test, will always pass so long as import statement worked"""
     assert "despasito.thermodynamics" in sys.modules
@@ -70,4 +82,90 @@ def test_vapor_properties(eos=eos_co2_h2o,Tlist=Tlist,yilist=yilist,Plist=Plist)
 
 #    assert output["rhov"][0]==pytest.approx(37.85937201,abs=1e-1) and output["phiv"][0]==pytest.approx(np.array([2.45619145, 0.37836741]),abs=1e-1)
     assert output["rhov"][0]==pytest.approx(2156.81,abs=1e-1) and output["phiv"][0]==pytest.approx(np.array([0.90729601, 0.13974291]),abs=1e-1)
-    
+
+def _count_solve_P_xiT(monkeypatch):
+    calls = []
+    solve_P_xiT = calc.solve_P_xiT
+    def wrapper(*args, **kwargs):
+        calls.append(args[0])
+        return solve_P_xiT(*args, **kwargs)
+    monkeypatch.setattr(calc, "solve_P_xiT", wrapper)
+    return calls
+
+def test_meth_dispatch(eos=eos_pr,T=T_pr,xi=xi_pr):
+
+    assert {"brent", "hybr", "secant"} <= set(calc._METH_DISPATCH)
+    with pytest.raises(ValueError):
+        calc.calc_xT_phase(xi, T, eos, meth="not_a_method")
+    with pytest.raises(ValueError):
+        calc.calc_yT_phase(xi, T, eos, meth="not_a_method")
+
+def test_calc_xT_phase_brent(monkeypatch,eos=eos_pr,T=T_pr,xi=xi_pr):
+
+    calls = _count_solve_P_xiT(monkeypatch)
+    P, yi, flagv, flagl, obj = calc.calc_xT_phase(xi, T, eos)
+    nbrent = len(calls)
+
+    del calls[:]
+    P_hybr, _, _, _, _ = calc.calc_xT_phase(xi, T, eos, meth="hybr")
+    nhybr = len(calls)
+
+    assert P==pytest.approx(83676.83,abs=1e-1) and yi==pytest.approx([0.27660426, 0.72339574],abs=1e-4)
+    assert P_hybr==pytest.approx(P,abs=1e-1)
+    assert nbrent < nhybr
+
+def test_phase_xiT_warm_start(eos=eos_pr,T=T_pr):
+
+    xilist = [[0.2, 0.8], [0.25, 0.75], [0.3, 0.7]]
+    output = thermo.thermo(eos,{"calculation_type":"phase_xiT","Tlist":[T]*len(xilist),"xilist":xilist})
+    for i in [0, 2]:
+        P, _, _, _, _ = calc.calc_xT_phase(np.array(xilist[i]), T, eos)
+        assert output["P"][i]==pytest.approx(P,rel=1e-8)
+
+def test_saturation_pressure_guess(eos=eos_pr,T=T_pr):
+
+    Pguess = eos.saturation_pressure_guess(T)
+    for i in range(len(Pguess)):
+        xi = np.zeros(len(Pguess))
+        xi[i] = 1.0
+        Psat, _, _ = calc.calc_Psat(T, xi, eos)
+        assert Pguess[i]==pytest.approx(Psat,rel=2e-2)
+
+    # Reduced temperature of acetone above maxTr, chloroform below
+    Pguess = eos.saturation_pressure_guess(500.0)
+    assert np.isnan(Pguess[0]) and np.isfinite(Pguess[1])
+
+def test_calc_phi_batch(eos=eos_pr):
+
+    T_arr = np.array([340.0, 320.0, 330.0, 320.0])
+    P_arr = np.array([1e+5, 1e+5, 1e+5, -1e+5])
+    xi_mat = np.array([[0.3, 0.7], [0.4, 0.6], [0.5, 0.5], [0.4, 0.6]])
+    phi_mat, rho_arr, flag_arr = calc.calc_phi_batch(P_arr, T_arr, xi_mat, eos)
+
+    for i in range(3):
+        phil, rhol, flagl = calc.calc_phil(P_arr[i], T_arr[i], xi_mat[i], eos)
+        assert phi_mat[i]==pytest.approx(phil,rel=1e-10) and rho_arr[i]==pytest.approx(rhol,rel=1e-10) and flag_arr[i] == flagl
+    assert np.all(np.isnan(phi_mat[3]))
+
+def test_ncores(eos=eos_pr):
+
+    Tlist = [320.0, 330.0]
+    xilist = [[0.4, 0.6]]*2
+    calcs = [{"calculation_type":"sat_props","Tlist":Tlist,"xilist":[np.array([1.0, 0.0])]*2},
+             {"calculation_type":"liquid_properties","Tlist":Tlist,"Plist":[101325.0]*2,"xilist":xilist},
+             {"calculation_type":"vapor_properties","Tlist":Tlist,"Plist":[20000.0]*2,"yilist":xilist}]
+    for thermo_dict in calcs:
+        serial = thermo.thermo(eos,dict(thermo_dict))
+        parallel = thermo.thermo(eos,dict(thermo_dict, ncores=2))
+        for key, value in serial.items():
+            assert np.array(parallel[key],float)==pytest.approx(np.array(value,float),rel=1e-10,nan_ok=True)
+
+def test_calc_CC_Pguess(CriticalProp=CriticalProp_c1_c2):
+
+    Psatm = calc.calc_CC_Pguess([[0.5, 0.5], [0.3, 0.7]], [150.0, 160.0], CriticalProp)
+    assert Psatm==pytest.approx([99387.08, 70360.78],rel=1e-4)
+
+    # Omega of acetone is outside of the range of the correlations
+    CriticalProp = list(CriticalProp)
+    CriticalProp[2] = [0.304, 0.099]
+    assert np.isnan(calc.calc_CC_Pguess([[0.5, 0.5]], [150.0], CriticalProp))
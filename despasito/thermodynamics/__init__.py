@@ -11,6 +11,9 @@ from inspect import getmembers, isfunction
 
 from . import calc_types
 
+# Available calculation types, keyed by function name
+_CALC_TYPES = {name: func for name, func in getmembers(calc_types, isfunction) if not name.startswith("_")}
+
 def thermo(eos, thermo_dict):
     """
     Use factory design pattern to search for matching calctype with those supported in this module.
@@ -22,7 +25,7 @@ def thermo(eos, thermo_dict):
         eos : obj
             Equation of state output that writes pressure, max density, and chemical potential
         thermo_dict : dict
-            Other keywords passed to the function, depends on calculation type
+            Other keywords passed to the function, depends on calculation type. Point-wise inputs (e.g. Tlist, Plist, xilist, yilist) may be given as lists or as numpy arrays of shape (npoints,) or (npoints, ncomp). Contiguous float arrays are used without being copied, so that a batch of points is passed once.
                 
 
     Returns
@@ -35,12 +38,9 @@ def thermo(eos, thermo_dict):
 
     try:
         calctype = thermo_dict['calculation_type']
-    except:
+    except KeyError:
         raise Exception('No calculation type specified')
 
-    # Extract available calculation types
-    calc_list = [o[0] for o in getmembers(calc_types) if isfunction(o[1])]
-
     # Unpack inputs and check
     sys_dict, kwargs = {}, {}
     for key, value in thermo_dict.items():
@@ -50,13 +50,13 @@ def thermo(eos, thermo_dict):
             kwargs[key] = value
 
     try:
-        func = getattr(calc_types, calctype)
-    except:
-        raise ImportError("The calculation type, '"+calctype+"', was not found\nThe following calculation types are supported: "+", ".join(calc_list))
+        func = _CALC_TYPES[calctype]
+    except KeyError:
+        raise ImportError("The calculation type, '"+calctype+"', was not found\nThe following calculation types are supported: "+", ".join(_CALC_TYPES))
 
     try:
         output_dict = func(eos, sys_dict, **kwargs)
-    except:
+    except Exception:
         raise TypeError("The calculation type, '"+calctype+"', failed")
 
     return output_dict
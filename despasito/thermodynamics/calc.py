@@ -4,20 +4,32 @@ This module contains our thermodynamic calculations. Calculation of pressure, ch
 """
 
 import numpy as np
+from numpy.polynomial.polynomial import polyval
 from scipy import interpolate
 import scipy.optimize as spo
-from scipy.ndimage.filters import gaussian_filter1d
-import copy
+import functools
+from types import MappingProxyType
 #import matplotlib.pyplot as plt
 import logging
 from . import fund_constants as constants
+from despasito.equations_of_state import eos as eos_mod, jit_stat
+
+logger = logging.getLogger(__name__)
 
 ######################################################################
 #                                                                    #
 #                     Calculate Critical Parameters                  #
 #                                                                    #
 ######################################################################
-def calc_CC_Pguess(xilist, Tlist, CriticalProp):
+# Polynomial coefficients of the Mie parameter correlations in calc_CC_Pguess, in increasing order of power
+_CC_A = np.array([14.8359, 22.2019, 7220.9599, 23193.4750, -6207.4663, 1732.9600])
+_CC_B = np.array([0.0, -6.9630, 468.7358, -983.6038, 914.3608, -1383.4441])
+_CC_C = np.array([0.1284, 1.6772, 0.0, 0.0, 0.0, 0.0])
+_CC_D = np.array([0.0, 0.4049, -0.1592, 0.0, 0.0, 0.0])
+_CC_J = np.array([1.8966, -6.9808, 10.6330, -9.2041, 4.2503, 0.0])
+_CC_K = np.array([0.0, -1.6205, -0.8019, 1.7086, -0.5333, 1.0536])
+
+def calc_CC_Pguess(xilist, Tlist, CriticalProp, pool=None):
     r"""
     Computes the Mie parameters of a mixture from the mixed critical properties of the pure components. 
 
@@ -31,110 +43,116 @@ def calc_CC_Pguess(xilist, Tlist, CriticalProp):
         Temperature of the system corresponding to composition in xilist [K]
     CriticalProp : list[list]
         List of critical properties :math:`T_C`, :math:`P_C`, :math:`\omega`, :math:`\rho_{0.7}`, :math:`Z_C`, :math:`V_C`, and molecular weight, where each of these properties is a list of values for each bead.
-    
+    pool : multiprocessing.Pool, Optional
+        Pool of processes used to compute the saturation pressure of each mixture in parallel. If None, the mixtures are evaluated in serial.
+
     Returns
     -------
     Psatm : list[float]
         A list of guesses in pressure based on critical properties, of the same length as xilist and Tlist [Pa]
     """
 
-    logger = logging.getLogger(__name__)
-
-    Tc, Pc, omega, rho_7, Zc, Vc, M = CriticalProp
+    Tc, Pc, omega, rho_7, Zc, Vc, M = [np.asarray(prop, dtype=float) for prop in CriticalProp]
+    xi_array = np.asarray(xilist, dtype=float)
+    Tlist = np.asarray(Tlist, dtype=float)
 
     ############## Calculate Mixed System Mie Parameters
     flag = 0
-    if all(-0.847 > x > 0.2387 for x in omega):
+    if np.any((omega < -0.847) | (omega > 0.2387)):
         flag = 1
         logger.warning("Omega is outside of the range that these correlations are valid")
 
-    a = [14.8359, 22.2019, 7220.9599, 23193.4750, -6207.4663, 1732.9600]
-    b = [0.0, -6.9630, 468.7358, -983.6038, 914.3608, -1383.4441]
-    c = [0.1284, 1.6772, 0.0, 0.0, 0.0, 0.0]
-    d = [0.0, 0.4049, -0.1592, 0.0, 0.0, 0.0]
-    j = [1.8966, -6.9808, 10.6330, -9.2041, 4.2503, 0.0]
-    k = [0.0, -1.6205, -0.8019, 1.7086, -0.5333, 1.0536]
-
     Tcm, Pcm, sigma, epsilon, Psatm = [[] for x in range(5)]
 
     i = 0
     jj = 1
+    xi_i = xi_array[:, i]
+    xi_jj = xi_array[:, jj]
 
     if flag == 1:
         Psatm = np.nan
     elif flag == 0: 
-        for kk, xi in enumerate(xilist):
-            # Mixture alpha
-            omegaij = xi[i] * omega[i] + xi[jj] * omega[jj]
-            tmp1 = np.sum([a[ii] * omegaij**ii for ii in range(6)])
-            tmp2 = np.sum([b[ii] * omegaij**ii for ii in range(6)])
-            l_r = tmp1 / (1. + tmp2)
-            C = (l_r / (l_r - 6.)) * (l_r / 6.)**(6. / (l_r - 6.))
-            al_tmp = C * (1. / 3. - 1. / (l_r - 3.))
-            # Mixture Critical Properties Stewart-Burkhardt-Voo
-            K = xi[i] * Tc[i] / Pc[i]**.5 + xi[jj] * Tc[jj] / Pc[jj]**.5
-            tmp1 = xi[i] * Tc[i] / Pc[i] + xi[jj] * Tc[jj] / Pc[jj]
-            tmp2 = xi[i] * (Tc[i] / Pc[i])**.5 + xi[jj] * (Tc[jj] / Pc[jj])**.5
-            J = tmp1 / 3. + 2. / 3. * tmp2**2.
-            Tc_tmp = K**2. / J
-            Pc_tmp = (K / J)**2.
-            # Mixture Pressure Prausnitz-Gunn
-            if (Tlist[kk] / Tc[i] > 1. or Tlist[kk] / Tc[jj] > 1.):
-                R = 8.3144598  # [kg*m^2/(s^2*mol*K)] Gas constant
-                tmp1 = Zc[i] + Zc[jj]
-                tmp2 = xi[i] * M[i] * Vc[i] + xi[jj] * M[jj] * Vc[jj]
-                Pc_tmp = R * Tc_tmp * tmp1 / tmp2
-            # Mixture Molar Density, Plocker Knapp
-            Mij = M[i] * xi[i] + M[jj] * xi[jj]
-            rho_tmp = 8. / Mij / ((rho_7[i] * M[i])**(-1. / 3.) + (rho_7[jj] * M[jj])**(-1. / 3.))**3.
-            Nav = 6.0221415e+23  # avogadros number
-    
-            tmp1 = np.sum([c[ii] * al_tmp**ii for ii in range(6)])
-            tmp2 = np.sum([d[ii] * al_tmp**ii for ii in range(6)])
-            Tc_star = tmp1 / (1. + tmp2)
-            eps_tmp = Tc_tmp / Tc_star  # [K], multiply by kB to change to energy units
-    
-            tmp3 = np.sum([j[ii] * al_tmp**ii for ii in range(6)])
-            tmp4 = np.sum([k[ii] * al_tmp**ii for ii in range(6)])
-            rho_star = tmp3 / (1. + tmp4)
-            sig_tmp = (rho_star / rho_tmp / Nav)**(1. / 3.)
-    
-            # Calculate Psat
-            eos_dict['massi'] = np.array([Mij])
-            eos_dict['nui'] = np.array([[1]])
-            eos_dict['beads'] = ['bead']
-            eos_dict['beadlibrary'] = {
-                'bead': {
-                    'l_r': l_r,
-                    'epsilon': eps_tmp,
-                    'Vks': 1.0,
-                    'Sk': 1.0,
-                    'l_a': 6,
-                    'mass': Mij,
-                    'sigma': sig_tmp
-                }
-            }
-            eos = eos("saft.gamma_mie",**eos_dict)
-    
-            if (Tlist[kk] < Tc_tmp):
-                Psat_tmp, _, _ = calc_Psat(Tlist[kk], np.array([1.0]), eos)
-            else:
-                Psat_tmp = np.nan
-    
+        # Parameters of every mixture are computed at once
+        # Mixture alpha
+        omegaij = xi_i * omega[i] + xi_jj * omega[jj]
+        l_r = polyval(omegaij, _CC_A) / (1. + polyval(omegaij, _CC_B))
+        C = (l_r / (l_r - 6.)) * (l_r / 6.)**(6. / (l_r - 6.))
+        al_tmp = C * (1. / 3. - 1. / (l_r - 3.))
+        # Mixture Critical Properties Stewart-Burkhardt-Voo
+        K = xi_i * Tc[i] / Pc[i]**.5 + xi_jj * Tc[jj] / Pc[jj]**.5
+        tmp1 = xi_i * Tc[i] / Pc[i] + xi_jj * Tc[jj] / Pc[jj]
+        tmp2 = xi_i * (Tc[i] / Pc[i])**.5 + xi_jj * (Tc[jj] / Pc[jj])**.5
+        J = tmp1 / 3. + 2. / 3. * tmp2**2.
+        Tc_tmp = K**2. / J
+        Pc_tmp = (K / J)**2.
+        # Mixture Pressure Prausnitz-Gunn
+        supercritical = (Tlist / Tc[i] > 1.) | (Tlist / Tc[jj] > 1.)
+        if np.any(supercritical):
+            R = 8.3144598  # [kg*m^2/(s^2*mol*K)] Gas constant
+            tmp1 = Zc[i] + Zc[jj]
+            tmp2 = xi_i * M[i] * Vc[i] + xi_jj * M[jj] * Vc[jj]
+            Pc_tmp = np.where(supercritical, R * Tc_tmp * tmp1 / tmp2, Pc_tmp)
+        # Mixture Molar Density, Plocker Knapp
+        Mij = M[i] * xi_i + M[jj] * xi_jj
+        rho_tmp = 8. / Mij / ((rho_7[i] * M[i])**(-1. / 3.) + (rho_7[jj] * M[jj])**(-1. / 3.))**3.
+        Nav = 6.0221415e+23  # avogadros number
+
+        Tc_star = polyval(al_tmp, _CC_C) / (1. + polyval(al_tmp, _CC_D))
+        eps_tmp = Tc_tmp / Tc_star  # [K], multiply by kB to change to energy units
+
+        rho_star = polyval(al_tmp, _CC_J) / (1. + polyval(al_tmp, _CC_K))
+        sig_tmp = (rho_star / rho_tmp / Nav)**(1. / 3.)
+
+        # Calculate Psat of each mixture with a single bead eos, the jit setting is passed so that it also applies in other processes
+        jit = not jit_stat.disable_jit
+        inputs = [(Tlist[kk], Tc_tmp[kk], {'l_r': l_r[kk], 'epsilon': eps_tmp[kk], 'mass': Mij[kk], 'sigma': sig_tmp[kk]}, jit) for kk in range(len(xi_array))]
+        if pool is None:
+            # map is lazy, so no more mixtures are computed after the first NaN
+            Psat_list = map(_CC_Psat_wrapper, inputs)
+        else:
+            Psat_list = pool.map(_CC_Psat_wrapper, inputs)
+
+        for kk, Psat_tmp in enumerate(Psat_list):
             if np.isnan(Psat_tmp):
                 Psatm = np.nan
                 break
     
             # Save values
             # Nothing is done with rholsat_tmp and rhogsat_tmp
-            Tcm.append(Tc_tmp)
-            Pcm.append(Pc_tmp)
-            sigma.append(sig_tmp)
-            epsilon.append(eps_tmp)
+            Tcm.append(Tc_tmp[kk])
+            Pcm.append(Pc_tmp[kk])
+            sigma.append(sig_tmp[kk])
+            epsilon.append(eps_tmp[kk])
             Psatm.append(Psat_tmp)
 
     return Psatm
 
+def _CC_Psat_wrapper(inputs):
+    r"""
+    Compute the saturation pressure of a mixture represented by a single Mie bead for :func:`calc_CC_Pguess`. This function is defined at the module level so that it can be used with a multiprocessing pool.
+
+    Parameters
+    ----------
+    inputs : tuple
+        Temperature [K], mixture critical temperature [K], dictionary of the Mie parameters and mass of the bead, and whether the eos should use jit
+
+    Returns
+    -------
+    Psat : float
+        Saturation pressure of the bead, NaN if the temperature isn't below the critical temperature [Pa]
+    """
+
+    T, Tc, bead, jit = inputs
+
+    if T < Tc:
+        bead = dict(bead, Vks=1.0, Sk=1.0, l_a=6)
+        eos = eos_mod(eos="saft.gamma_mie", jit=jit, nui=np.array([[1]]), beads=['bead'], beadlibrary={'bead': bead})
+        Psat, _, _ = calc_Psat(T, np.array([1.0]), eos)
+    else:
+        Psat = np.nan
+
+    return Psat
+
 ######################################################################
 #                                                                    #
 #                      Pressure-Density Curve                        #
@@ -165,16 +183,53 @@ def PvsRho(T, xi, eos, minrhofrac=(1.0 / 500000.0), rhoinc=5.0, vspacemax=1.0E-4
     Returns
     -------
     vlist : numpy.ndarray
-        Specific volume array. Length depends on values in rhodict [:math:`m^3`/mol]
+        Specific volume array. Length depends on values in rhodict [:math:`m^3`/mol]. This array is shared between calls and read-only.
     Plist : numpy.ndarray
-        Pressure associated with specific volume of system with given temperature and composition [Pa]
+        Pressure associated with specific volume of system with given temperature and composition [Pa]. This array is shared between calls and read-only.
     """
 
-    #logger = logging.getLogger(__name__)
-
     if type(xi) == list:
         xi = np.array(xi)
 
+    # The curve doesn't depend on the system pressure, so it's reused for each eos parameter set, see eos._param_version
+    param_version = getattr(eos, "_param_version", None)
+    key = (float(T), tuple(np.asarray(xi, dtype=float)), minrhofrac, rhoinc, vspacemax, maxrho, tuple(sorted(kwargs.items())))
+    try:
+        hash(key)
+    except TypeError:
+        param_version = None
+
+    if param_version is None:
+        vlist, Plist = _PvsRho(T, xi, eos, minrhofrac, rhoinc, vspacemax, maxrho, kwargs)
+    else:
+        vlist, Plist = _PvsRho_cached(eos, param_version, *key)
+
+    return vlist, Plist
+
+def clear_PvsRho_cache():
+    r"""
+    Clear the pressure vs. density curves saved by :func:`PvsRho`. Curves are already recomputed when the eos parameters are updated, this is only needed if an eos object is modified in another way.
+    """
+
+    _PvsRho_cached.cache_clear()
+
+@functools.lru_cache(maxsize=32)
+def _PvsRho_cached(eos, param_version, T, xi, minrhofrac, rhoinc, vspacemax, maxrho, kwargs):
+    r"""
+    Cached version of :func:`_PvsRho`, where param_version is the counter of parameter updates in the eos object. Composition and kwargs are given as tuples.
+    """
+
+    vlist, Plist = _PvsRho(T, np.array(xi), eos, minrhofrac, rhoinc, vspacemax, maxrho, dict(kwargs))
+    vlist.setflags(write=False)
+    Plist.setflags(write=False)
+
+    return vlist, Plist
+
+def _PvsRho(T, xi, eos, minrhofrac, rhoinc, vspacemax, maxrho, kwargs):
+    r"""
+    Compute the pressure vs. specific volume curve for :func:`PvsRho`.
+    """
+
     #estimate the maximum density based on the hard sphere packing fraction, part of EOS
     if not maxrho:
         maxrho = eos.density_max(xi, T, **kwargs)
@@ -188,20 +243,31 @@ def PvsRho(T, xi, eos, minrhofrac=(1.0 / 500000.0), rhoinc=5.0, vspacemax=1.0E-4
         raise ValueError("Density range, {}, is less than incement, {}. Check parameters used in eos.density_max().".format((maxrho-minrho),rhoinc))
 
     rholist = np.arange(minrho, maxrho, rhoinc)
-    #check rholist to see when the spacing
-    vspace = (1.0 / rholist[:-1]) - (1.0 / rholist[1:])
-    if np.amax(vspace) > vspacemax:
-        vspaceswitch = np.where(vspace > vspacemax)[0][-1]
-        rholist_2 = 1.0 / np.arange(1.0 / rholist[vspaceswitch + 1], 1.0 / minrho, vspacemax)[::-1]
-        rholist = np.append(rholist_2, rholist[vspaceswitch + 2:])
+    #check rholist to see when the spacing, the specific volumes are kept for the output
+    vlist = np.reciprocal(rholist)
+    vspace = vlist[:-1] - vlist[1:]
+    ind_wide = np.flatnonzero(vspace > vspacemax)
+    if ind_wide.size:
+        vspaceswitch = ind_wide[-1]
+        # vlist[0] is 1/minrho
+        vlist_2 = np.arange(vlist[vspaceswitch + 1], vlist[0], vspacemax)[::-1]
+        # Fill preallocated arrays so that no temporary is made for the new densities
+        n2 = len(vlist_2)
+        npoints = n2 + len(rholist) - vspaceswitch - 2
+        rholist_new = np.empty(npoints)
+        np.divide(1.0, vlist_2, out=rholist_new[:n2])
+        rholist_new[n2:] = rholist[vspaceswitch + 2:]
+        vlist_new = np.empty(npoints)
+        vlist_new[:n2] = vlist_2
+        vlist_new[n2:] = vlist[vspaceswitch + 2:]
+        rholist, vlist = rholist_new, vlist_new
 
     #compute Pressures (Plist) for rholist
     Plist = eos.P(rholist, T, xi)
 
-    #Flip Plist and rholist arrays
-    Plist = Plist[:][::-1]
-    rholist = rholist[:][::-1]
-    vlist = 1.0 / rholist
+    #Flip Plist and vlist arrays
+    Plist = np.ascontiguousarray(Plist[::-1])
+    vlist = np.ascontiguousarray(vlist[::-1])
 
     return vlist, Plist
 
@@ -211,9 +277,11 @@ def PvsRho(T, xi, eos, minrhofrac=(1.0 / 500000.0), rhoinc=5.0, vspacemax=1.0E-4
 #                      Pressure-Volume Spline                        #
 #                                                                    #
 ######################################################################
-def PvsV_spline(vlist, Plist):
+def PvsV_spline(vlist, Plist, shift=0.0):
     r"""
     Fit arrays of specific volume and pressure values to a cubic Univariate Spline.
+
+    Shifting the pressure by a constant shifts the coefficients of the spline, so the fit of a read-only pressure array, such as those returned by :func:`PvsRho`, is saved and reused for any value of shift.
     
     Parameters
     ----------
@@ -221,10 +289,12 @@ def PvsV_spline(vlist, Plist):
         Specific volume array. Length depends on values in rhodict [:math:`m^3`/mol]
     Plist : numpy.ndarray
         Pressure associated with specific volume of system with given temperature and composition [Pa]
+    shift : float, Optional, default: 0.0
+        Pressure subtracted from Plist before the fit, e.g. the system pressure [Pa]
     
     Returns
     -------
-    Pvspline : obj
+    Pvspline : scipy.interpolate.BSpline
         Function object of pressure vs. specific volume
     roots : list
         List of specific volume roots. Subtract a system pressure from the output of Pvsrho to find density of vapor and/or liquid densities.
@@ -232,16 +302,20 @@ def PvsV_spline(vlist, Plist):
         List of specific volume values corresponding to local minima and maxima.
     """
 
-    #logger = logging.getLogger(__name__)
-
-    Psmoothed = gaussian_filter1d(Plist, sigma=.5)
+    Plist = np.asarray(Plist)
+    if not Plist.flags.writeable and id(Plist) in _PvsV_spline_fits:
+        _, tck, extrema = _PvsV_spline_fits[id(Plist)]
+    else:
+        tck, extrema = _PvsV_spline_fit(vlist, Plist)
+        if not Plist.flags.writeable:
+            # The array is kept in the entry so that its id can't be reused while saved
+            _PvsV_spline_fits[id(Plist)] = (Plist, tck, extrema)
+            if len(_PvsV_spline_fits) > 32:
+                del _PvsV_spline_fits[next(iter(_PvsV_spline_fits))]
 
-    Pvspline = interpolate.InterpolatedUnivariateSpline(vlist, Psmoothed)
-    roots = Pvspline.roots().tolist()
-    Pvspline = interpolate.InterpolatedUnivariateSpline(vlist, Psmoothed, k=4)
-    extrema = Pvspline.derivative().roots().tolist()
-    if extrema: 
-        if len(extrema) > 2: extrema = extrema[0:2]
+    t, c, k = tck
+    Pvspline = interpolate.BSpline(t, c - shift, k)
+    roots = interpolate.sproot((t, c - shift, k)).tolist()
 
   #  if len(roots) ==2:
   #      slope, yroot = np.polyfit(vlist[-4:], Plist[-4:], 1)
@@ -249,7 +323,71 @@ def PvsV_spline(vlist, Plist):
 
     #PvsV_plot(vlist, Plist, Pvspline, markers=extrema)
 
-    return Pvspline, roots, extrema
+    return Pvspline, roots, list(extrema)
+
+# Spline fits of read-only pressure arrays, see PvsV_spline
+_PvsV_spline_fits = {}
+
+# Normalized weights of a Gaussian kernel with a standard deviation of 0.5 samples, truncated at four standard deviations as in scipy.ndimage.gaussian_filter1d
+_SMOOTH_WEIGHTS = np.exp(-2.0*np.arange(-2, 3)**2)
+_SMOOTH_WEIGHTS /= _SMOOTH_WEIGHTS.sum()
+
+def _smooth_pressure(Plist):
+    r"""
+    Smooth an array with a Gaussian filter, equivalent to scipy.ndimage.gaussian_filter1d(Plist, sigma=.5).
+
+    The kernel is only five points wide and symmetric, so it is applied with a direct convolution using precomputed weights.
+    
+    Parameters
+    ----------
+    Plist : numpy.ndarray
+        Array to be smoothed, such as pressure vs. specific volume
+    
+    Returns
+    -------
+    Psmoothed : numpy.ndarray
+        Smoothed array with the same length as Plist
+    """
+
+    # Boundaries are reflected about the edge of the array, as in the scipy default
+    Ppad = np.pad(np.asarray(Plist, dtype=float), 2, mode="symmetric")
+
+    return np.convolve(Ppad, _SMOOTH_WEIGHTS, mode="valid")
+
+def _PvsV_spline_fit(vlist, Plist):
+    r"""
+    Fit the smoothed pressure vs. specific volume curve for :func:`PvsV_spline`.
+    
+    Parameters
+    ----------
+    vlist : numpy.ndarray
+        Specific volume array. Length depends on values in rhodict [:math:`m^3`/mol]
+    Plist : numpy.ndarray
+        Pressure associated with specific volume of system with given temperature and composition [Pa]
+    
+    Returns
+    -------
+    tck : tuple
+        B-spline representation, (t, c, k), of the cubic spline
+    extrema : tuple
+        Specific volume values corresponding to the first two local minima and maxima.
+    """
+
+    Psmoothed = _smooth_pressure(Plist)
+    tck = interpolate.splrep(vlist, Psmoothed, k=3, s=0)
+
+    # Locate the first two extrema from sign changes in the slope of the smoothed curve, then refine them with Newton's method on the spline
+    dP = np.diff(Psmoothed)
+    ind = np.flatnonzero(dP[:-1]*dP[1:] < 0)[:2] + 1
+    extrema = vlist[ind]
+    if len(ind):
+        Pvspline = interpolate.BSpline(*tck)
+        dPvspline = Pvspline.derivative(1)
+        d2Pvspline = Pvspline.derivative(2)
+        for i in range(3):
+            extrema = np.clip(extrema - dPvspline(extrema)/d2Pvspline(extrema), vlist[ind-1], vlist[ind+1])
+
+    return tck, tuple(extrema.tolist())
 
 ######################################################################
 #                                                                    #
@@ -275,8 +413,6 @@ def interp_vroot(v0, vlist, Plist):
         This is either the same value as given, or a new estimate interpolated from the closest points that change sign.
     """
 
-    logger = logging.getLogger(__name__)
-
     # Find roots through change in sign
     ind_array = np.zeros(4,int)
     for i in range(3):
@@ -296,16 +432,18 @@ def interp_vroot(v0, vlist, Plist):
         ind = ind_array[0]
     else:
          tmp = np.abs(vlist[ind_array]-v0)
-         ind_tmp = np.where(tmp==np.min(tmp))[0][0]
+         ind_tmp = int(np.argmin(tmp))
          ind = ind_array[ind_tmp]
 
     # Assess and possibly reestimate v_root
     if (v0 < vlist[ind-1] or v0 > vlist[ind]):
         m = (Plist[ind]-Plist[ind-1])/(vlist[ind]-vlist[ind-1])
         v0_new = -m/(Plist[ind]-m*vlist[ind]) 
-        logger.debug("Reestimate root: v0={}, v0_new={}".format(v0,v0_new))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Reestimate root: v0={}, v0_new={}".format(v0,v0_new))
     else:
-        logger.debug("v_root is within bounds, ({},{}). Return given v_root, {}.".format(vlist[ind-1],vlist[ind],v0))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("v_root is within bounds, ({},{}). Return given v_root, {}.".format(vlist[ind-1],vlist[ind],v0))
         v0_new = v0
 
     return v0_new
@@ -331,8 +469,6 @@ def PvsV_plot(vlist, Plist, Pvspline, markers=[]):
         List of plot markers used in plot
     """
 
-    #logger = logging.getLogger(__name__)
-
     plt.figure(1)
     plt.plot(vlist,Plist,label="Orig.")
     plt.plot(vlist,Pvspline(vlist),label="Smoothed")
@@ -374,8 +510,6 @@ def calc_Psat(T, xi, eos, rhodict={}):
         Density of liquid at saturation pressure [mol/:math:`m^3`]
     """
 
-    logger = logging.getLogger(__name__)
-
     if np.count_nonzero(xi) != 1:
         if np.count_nonzero(xi>0.1) != 1:
             raise ValueError("Multiple components have compositions greater than 10%, check code for source")
@@ -383,35 +517,76 @@ def calc_Psat(T, xi, eos, rhodict={}):
             ind = np.where((xi>0.1)==True)[0]
             raise ValueError("Multiple components have compositions greater than 0. Do you mean to obtain the saturation pressure of {} with a mole fraction of {}?".format(eos._beads[ind],xi[ind]))
 
+    # Pure component saturation properties are repeated for every point of an isothermal phase diagram, so they're saved for each eos parameter set, see eos._param_version
+    param_version = getattr(eos, "_param_version", None)
+    key = (float(T), tuple(np.asarray(xi, dtype=float)), tuple(sorted(rhodict.items())))
+    try:
+        hash(key)
+    except TypeError:
+        param_version = None
+
+    if param_version is None or np.ndim(T) != 0:
+        return _calc_Psat(T, xi, eos, rhodict)
+
+    return _calc_Psat_cached(eos, param_version, *key)
+
+def clear_Psat_cache():
+    r"""
+    Clear the saturation properties saved by :func:`calc_Psat`. Values are already recomputed when the eos parameters are updated, this is only needed if an eos object is modified in another way.
+    """
+
+    _calc_Psat_cached.cache_clear()
+
+@functools.lru_cache(maxsize=1024)
+def _calc_Psat_cached(eos, param_version, T, xi, rhodict):
+    r"""
+    Cached version of :func:`_calc_Psat`, where param_version is the counter of parameter updates in the eos object. Composition and rhodict are given as tuples.
+    """
+
+    return _calc_Psat(T, np.array(xi), eos, dict(rhodict))
+
+def _calc_Psat(T, xi, eos, rhodict):
+    r"""
+    Compute the saturation pressure and densities for :func:`calc_Psat`.
+    """
+
     vlist, Plist = PvsRho(T, xi, eos, **rhodict)
-    Pvspline, roots, extrema = PvsV_spline(vlist, Plist)
 
-    if (not extrema or len(extrema)<2):
+    # Indices where the pressure increases with specific volume, i.e. the unstable region of the curve. A supercritical curve has none, so no spline is needed.
+    ind_increase = np.flatnonzero(np.diff(Plist) > 0)
+    if ind_increase.size:
+        Pvspline, roots, extrema = PvsV_spline(vlist, Plist)
+        if (not extrema or len(extrema)<2):
+            ind_increase = ind_increase[:0]
+
+    if ind_increase.size == 0:
         logger.warning('Error: One of the components is above its critical point, add an exception to setPsat')
         Psat = np.nan
         roots = [1.0, 1.0, 1.0]
 
     else:
-        ind_Pmin1 = np.argwhere(np.diff(Plist) > 0)[0][0]
-        ind_Pmax1 = np.argmax(Plist[ind_Pmin1:]) + ind_Pmin1
+        ind_Pmin1 = ind_increase[0]
+        ind_Pmax1 = ind_Pmin1 + int(np.argmax(Plist[ind_Pmin1:]))
 
         Pmaxsearch = Plist[ind_Pmax1]
 
         Pconverged = 10 # If the pressure is negative (under tension), we search from a value just above vacuum 
-        Pminsearch = max(Pconverged, np.amin(Plist[ind_Pmin1:ind_Pmax1]))
+        Pminsearch = Plist[ind_Pmin1:ind_Pmax1].min()
+        if Pminsearch < Pconverged:
+            Pminsearch = Pconverged
 
         #print(Pminsearch,Pmaxsearch)
         #PvsV_plot(vlist, Plist, Pvspline, markers=extrema)
 
         #search Pressure that gives equal area in maxwell construction
         Psat = spo.minimize_scalar(eq_area,
-                               args=(Plist, vlist),
+                               args=(Plist, vlist, _eq_area_splines(Plist, vlist)),
                                bounds=(Pminsearch * 1.0001, Pmaxsearch * .9999),
                                method='bounded')
 
         #Using computed Psat find the roots in the maxwell construction to give liquid (first root) and vapor (last root) densities
         Psat = Psat.x
-        Pvspline, roots, extrema = PvsV_spline(vlist, Plist-Psat)
+        Pvspline, roots, extrema = PvsV_spline(vlist, Plist, shift=Psat)
 
         if len(roots) ==2:
             slope, yroot = np.polyfit(vlist[-4:], Plist[-4:]-Psat, 1)
@@ -422,12 +597,88 @@ def calc_Psat(T, xi, eos, rhodict={}):
     #Psat,rholsat,rhogsat
     return Psat, 1.0 / roots[0], 1.0 / roots[2]
 
+@functools.lru_cache(maxsize=8)
+def _pure_compositions(ncomp):
+    r"""
+    Identity matrix, where each row is the composition of a pure component. The array is shared between calls and read-only.
+    """
+
+    xi_pure = np.eye(ncomp)
+    xi_pure.setflags(write=False)
+
+    return xi_pure
+
+def calc_Psat_batch(T, ncomp, eos, rhodict={}):
+    r"""
+    Computes the saturated pressure, gas and liquid densities of each pure component in a mixture.
+    
+    Parameters
+    ----------
+    T : float
+        Temperature of the system [K]
+    ncomp : int
+        Number of components in the system
+    eos : obj
+        An instance of the defined EOS class to be used in thermodynamic computations.
+    rhodict : dict, Optional, default: {}
+        Dictionary of options used in calculating pressure vs. mole 
+
+    Returns
+    -------
+    Psat : numpy.ndarray
+        Saturation pressure of each component, NaN if the component is above its critical point [Pa]
+    rholsat : numpy.ndarray
+        Density of liquid at the saturation pressure of each component [mol/:math:`m^3`]
+    rhogsat : numpy.ndarray
+        Density of vapor at the saturation pressure of each component [mol/:math:`m^3`]
+    """
+
+    Psat, rholsat, rhogsat = np.zeros((3, ncomp))
+    for i, xi in enumerate(_pure_compositions(ncomp)):
+        Psat[i], rholsat[i], rhogsat[i] = calc_Psat(T, xi, eos, rhodict)
+
+    return Psat, rholsat, rhogsat
+
+def calc_Psat_guess(T, ncomp, eos, rhodict={}):
+    r"""
+    Estimate the saturated pressure of each pure component in a mixture, used as the initial guess in the phase calculations.
+
+    If the eos object provides a correlation with the method, saturation_pressure_guess, it's used in place of :func:`calc_Psat`. Components where the correlation isn't valid are computed with :func:`calc_Psat`.
+    
+    Parameters
+    ----------
+    T : float
+        Temperature of the system [K]
+    ncomp : int
+        Number of components in the system
+    eos : obj
+        An instance of the defined EOS class to be used in thermodynamic computations.
+    rhodict : dict, Optional, default: {}
+        Dictionary of options used in calculating pressure vs. mole 
+
+    Returns
+    -------
+    Psat : numpy.ndarray
+        Saturation pressure of each component, NaN if the component is above its critical point [Pa]
+    """
+
+    if not hasattr(eos, "saturation_pressure_guess"):
+        Psat, _, _ = calc_Psat_batch(T, ncomp, eos, rhodict)
+        return Psat
+
+    Psat = np.array(eos.saturation_pressure_guess(T), dtype=float)
+    xi_pure = _pure_compositions(ncomp)
+    for i in np.flatnonzero(np.isnan(Psat)):
+        Psat[i], _, _ = calc_Psat(T, xi_pure[i], eos, rhodict)
+
+    return Psat
+
 ######################################################################
 #                                                                    #
 #                              Eq Area                               #
 #                                                                    #
 ######################################################################
-def eq_area(shift, Pv, vlist):
+def eq_area(shift, Pv, vlist, Pvsplines=None):
     r"""
     Objective function used to calculate the saturation pressure.
 
@@ -441,6 +692,8 @@ def eq_area(shift, Pv, vlist):
         Pressure associated with specific volume of system with given temperature and composition [Pa]
     vlist : numpy.ndarray
         Specific volume array. Length depends on values in rhodict [:math:`m^3`/mol]
+    Pvsplines : tuple, Optional, default: None
+        Output of :func:`_eq_area_splines` for Pv and vlist. Pass this when the function is called repeatedly for the same curve so that the splines are only fit once.
 
     Returns
     -------
@@ -449,24 +702,56 @@ def eq_area(shift, Pv, vlist):
 
     """
 
-    logger = logging.getLogger(__name__)
+    if Pvsplines is None:
+        Pvsplines = _eq_area_splines(Pv, vlist)
+    tck3, tckint, slope, yroot = Pvsplines
 
-    Pvspline, roots, extrema = PvsV_spline(vlist, Pv-shift)
+    # Shifting a B-spline by a constant shifts each of its coefficients
+    t, c, k = tck3
+    roots = interpolate.sproot((t, c - shift, k)).tolist()
 
+    # Areas are differences of the antiderivative, evaluated at all bounds at once
     if len(roots) >=3:
-        a = Pvspline.integral(roots[0], roots[1])
-        b = Pvspline.integral(roots[1], roots[2])
+        bounds = np.array(roots[:3])
     elif len(roots) == 2:
-        a = Pvspline.integral(roots[0], roots[1])
+        bounds = np.array([roots[0], roots[1], vlist[-1]])
+    if len(roots) >= 2:
+        a, b = np.diff(interpolate.splev(bounds, tckint) - shift*bounds)
+    if len(roots) == 2:
         # If the curve hasn't decayed to 0 yet, estimate the remaining area as a triangle. This isn't super accurate but we are just using the saturation pressure to get started.
-        slope, yroot = np.polyfit(vlist[-4:], Pv[-4:]-shift, 1)
-        b = Pvspline.integral(roots[1], vlist[-1]) + (Pv[-1]-shift)*(-yroot/slope-vlist[-1])/2
+        b += (Pv[-1]-shift)*(-(yroot-shift)/slope-vlist[-1])/2
     else:
         logger.warning("Pressure curve without cubic properties has wrongly been accepted. Try decreasing minrhofrac")
         #PvsV_plot(vlist, Pv-shift, Pvspline, markers=extrema)
 
     return (a + b)**2
 
+def _eq_area_splines(Pv, vlist):
+    r"""
+    Fit the parts of :func:`eq_area` that don't depend on the pressure shift.
+
+    The pressure curve is smoothed and fit as in :func:`PvsV_spline`. Both the smoothing and the interpolating splines reproduce a constant, so the curve for any shift is obtained by subtracting it from the spline coefficients, and its integral by subtracting the shift times the width of the interval.
+    
+    Parameters
+    ----------
+    Pv : numpy.ndarray
+        Pressure associated with specific volume of system with given temperature and composition [Pa]
+    vlist : numpy.ndarray
+        Specific volume array. Length depends on values in rhodict [:math:`m^3`/mol]
+
+    Returns
+    -------
+    Pvsplines : tuple
+        B-spline representations, (t, c, k), of the cubic spline used to find roots and the antiderivative of the quartic spline used to compute areas, followed by the slope and intercept of a line through the last four points of the curve
+    """
+
+    Psmoothed = _smooth_pressure(Pv)
+    tck3 = interpolate.splrep(vlist, Psmoothed, k=3, s=0)
+    tckint = interpolate.splantider(interpolate.splrep(vlist, Psmoothed, k=4, s=0))
+    slope, yroot = np.polyfit(vlist[-4:], Pv[-4:], 1)
+
+    return tck3, tckint, slope, yroot
+
 ######################################################################
 #                                                                    #
 #                              Calc Rho V Full                       #
@@ -497,13 +782,12 @@ def calc_rhov(P, T, xi, eos, rhodict={}):
         A value of 0 is vapor, 1 is liquid, 2 mean a critical fluid, 3 means that neither is true, 4 means we should assume ideal gas
     """
 
-    logger = logging.getLogger(__name__)
-
     vlist, Plist = PvsRho(T, xi, eos, **rhodict)
+    Pvspline, roots, extrema = PvsV_spline(vlist, Plist, shift=P)
     Plist = Plist-P
-    Pvspline, roots, extrema = PvsV_spline(vlist, Plist)
 
-    logger.debug("    Find rhov: P {} Pa, roots {} m^3/mol".format(P,roots))
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("    Find rhov: P {} Pa, roots {} m^3/mol".format(P,roots))
 
     flag_NoOpt = False
     l_roots = len(roots)
@@ -511,14 +795,16 @@ def calc_rhov(P, T, xi, eos, rhodict={}):
         if Pvspline(1/vlist[-1]) < 0:
             if not len(extrema):
                 flag = 2
-                logger.debug("    Flag 2: The T and yi, {} {}, combination produces a critical fluid at this pressure".format(T,xi))
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("    Flag 2: The T and yi, {} {}, combination produces a critical fluid at this pressure".format(T,xi))
             else:
                 flag = 1
-                logger.debug("    Flag 1: The T and yi, {} {}, combination produces a liquid at this pressure".format(T,xi))
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("    Flag 1: The T and yi, {} {}, combination produces a liquid at this pressure".format(T,xi))
             try:
                 rho_tmp = spo.minimize(Pdiff, 1/vlist[0], args=(P, T, xi, eos), bounds=[(1e-24, 1/vlist[0]*1.1)])
                 rho_tmp = rho_tmp.x
-            except:
+            except (ValueError, RuntimeError, ArithmeticError, np.linalg.LinAlgError):
                 rho_tmp = 1/vlist[0]
             flag_NoOpt = True
         elif min(Plist)+P > 0:
@@ -527,7 +813,7 @@ def calc_rhov(P, T, xi, eos, rhodict={}):
             try:
                 rho_tmp = spo.minimize(Pdiff, 1.0/vroot, args=(P, T, xi, eos), bounds=[(1.0/(vroot*1e+2), 1.0/(1.1*roots[-1]))])
                 rho_tmp = rho_tmp.x
-            except:
+            except (ValueError, RuntimeError, ArithmeticError, np.linalg.LinAlgError):
                 rho_tmp = np.nan
 
             if np.isnan(rho_tmp):
@@ -536,9 +822,11 @@ def calc_rhov(P, T, xi, eos, rhodict={}):
                 flag = 0
 
             if not len(extrema):
-                logger.debug("    Flag 2: The T and yi, {} {}, combination produces a critical fluid at this pressure".format(T,xi))
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("    Flag 2: The T and yi, {} {}, combination produces a critical fluid at this pressure".format(T,xi))
             else:
-                logger.debug("    Flag 0: This T and xi, {} {}, combination produces a vapor at this pressure. Warning! approaching critical fluid".format(T,xi))
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("    Flag 0: This T and xi, {} {}, combination produces a vapor at this pressure. Warning! approaching critical fluid".format(T,xi))
         else:
             logger.warning("    Flag 3: The T and yi, {} {}, won't produce a fluid (vapor or liquid) at this pressure".format(T,xi))
             flag = 3
@@ -548,37 +836,46 @@ def calc_rhov(P, T, xi, eos, rhodict={}):
         if not len(extrema):
             flag = 2
             rho_tmp = 1.0 / roots[0]
-            logger.debug("    Flag 2: The T and yi, {} {}, combination produces a critical fluid at this pressure".format(T,xi))
-        elif (Pvspline(roots[0])+P) > (Pvspline(max(extrema))+P):
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("    Flag 2: The T and yi, {} {}, combination produces a critical fluid at this pressure".format(T,xi))
+        # Compare the pressure at the root to that at the last extremum, evaluating both in one spline call
+        elif np.subtract(*Pvspline(np.array([roots[0], max(extrema)]))) > 0:
             #logger.debug("Extrema: {}".format(extrema))
             #logger.debug("Roots: {}".format(roots))
             flag = 1
             rho_tmp = 1.0 / roots[0]
-            logger.debug("    Flag 1: The T and yi, {} {}, combination produces a liquid at this pressure".format(T,xi))
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("    Flag 1: The T and yi, {} {}, combination produces a liquid at this pressure".format(T,xi))
         elif len(extrema) > 1:
             flag = 0
             rho_tmp = 1.0 / roots[0]
-            logger.debug("    Flag 0: This T and yi, {} {}, combination produces a vapor at this pressure. Warning! approaching critical fluid".format(T,xi))
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("    Flag 0: This T and yi, {} {}, combination produces a vapor at this pressure. Warning! approaching critical fluid".format(T,xi))
     elif l_roots == 2:
         if (Pvspline(roots[0])+P) < 0.:
             flag = 1
             rho_tmp = 1.0 / roots[0]
-            logger.debug("    Flag 1: This T and xi, {} {}, combination produces a liquid under tension at this pressure".format(T,xi))
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("    Flag 1: This T and xi, {} {}, combination produces a liquid under tension at this pressure".format(T,xi))
         else:
             flag = 0
             slope, yroot = np.polyfit(vlist[-4:], Plist[-4:], 1)
             vroot = -yroot/slope
             rho_tmp = spo.minimize(Pdiff, 1.0/vroot, args=(P, T, xi, eos), bounds=[(1.0/(vroot*1e+2), 1.0/(1.1*roots[-1]))])
             rho_tmp = rho_tmp.x
-            logger.debug("    Flag 0: This T and yi, {} {}, combination produces a vapor at this pressure. Warning! approaching critical fluid".format(T,xi))
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("    Flag 0: This T and yi, {} {}, combination produces a vapor at this pressure. Warning! approaching critical fluid".format(T,xi))
     else: # 3 roots
         rho_tmp = 1.0 / roots[2]
         flag = 0
 
     if flag in [0,2]: # vapor or critical fluid
         tmp = [rho_tmp*.99, rho_tmp*1.01]
-        if (Pdiff(tmp[0],P, T, xi, eos)*Pdiff(tmp[1],P, T, xi, eos))<0:
-            rho_tmp = spo.brentq(Pdiff, tmp[0], tmp[1], args=(P, T, xi, eos), rtol=0.0000001)
+        # Both ends of the bracket are evaluated in one call to the eos
+        Pdiff_tmp = Pdiff(np.array(tmp), P, T, xi, eos)
+        Pdiff_func = _Pdiff_scalar(P, T, xi, eos)
+        if (Pdiff_tmp[0]*Pdiff_tmp[1])<0:
+            rho_tmp = _brent_bracketed(Pdiff_func, tmp, Pdiff_tmp, rtol=0.0000001)
         else:
             if Plist[0] < 0:
                 logger.warning("Density value could not be bounded with (rhomin,rhomax), {}. Using approximate density value".format(tmp))
@@ -622,14 +919,13 @@ def calc_rhol(P, T, xi, eos, rhodict={}):
         A value of 0 is vapor, 1 is liquid, 2 mean a critical fluid, 3 means that neither is true
     """
 
-    logger = logging.getLogger(__name__)
-
     # Get roots and local minima and maxima 
     vlist, Plist = PvsRho(T, xi, eos, **rhodict)
+    Pvspline, roots, extrema = PvsV_spline(vlist, Plist, shift=P)
     Plist = Plist-P
-    Pvspline, roots, extrema = PvsV_spline(vlist, Plist)
 
-    logger.debug("    Find rhol: P {} Pa, roots {} m^3/mol".format(P,str(roots)))
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("    Find rhol: P {} Pa, roots {} m^3/mol".format(P,str(roots)))
     flag_NoOpt = False
 
     if extrema:
@@ -642,15 +938,17 @@ def calc_rhol(P, T, xi, eos, rhodict={}):
         if Pvspline(1/vlist[-1]):
             if not len(extrema):
                 flag = 2
-                logger.debug("    Flag 2: The T and yi, {} {}, combination produces a critical fluid at this pressure".format(T,xi))
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("    Flag 2: The T and yi, {} {}, combination produces a critical fluid at this pressure".format(T,xi))
             else:
                 flag = 1
-                logger.debug("    Flag 1: The T and yi, {} {}, combination produces a liquid at this pressure".format(T,xi))
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("    Flag 1: The T and yi, {} {}, combination produces a liquid at this pressure".format(T,xi))
 
             try:
                 rho_tmp = spo.minimize(Pdiff, 1/vlist[0], args=(P, T, xi, eos), bounds=[(1e-24, 1/vlist[0]*1.1)])
                 rho_tmp = rho_tmp.x
-            except:
+            except (ValueError, RuntimeError, ArithmeticError, np.linalg.LinAlgError):
                 rho_tmp = 1/vlist[0]
             #rho_tmp = 1/vlist[1]
             flag_NoOpt = True
@@ -660,7 +958,7 @@ def calc_rhol(P, T, xi, eos, rhodict={}):
             try:
                 rho_tmp = spo.minimize(Pdiff, 1.0/vroot, args=(P, T, xi, eos), bounds=[(1.0/(vroot*1e+2), 1.0/(1.1*roots[-1]))])
                 rho_tmp = rho_tmp.x
-            except:
+            except (ValueError, RuntimeError, ArithmeticError, np.linalg.LinAlgError):
                 rho_tmp = np.nan
 
             if np.isnan(rho_tmp):
@@ -669,9 +967,11 @@ def calc_rhol(P, T, xi, eos, rhodict={}):
                 flag = 0
 
             if not len(extrema):
-                logger.debug("    Flag 2: The T and yi, {} {}, combination produces a critical fluid at this pressure".format(T,xi))
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("    Flag 2: The T and yi, {} {}, combination produces a critical fluid at this pressure".format(T,xi))
             else:
-                logger.debug("    Flag 0: This T and xi, {} {}, combination produces a vapor at this pressure. Warning! approaching critical fluid".format(T,xi))
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("    Flag 0: This T and xi, {} {}, combination produces a vapor at this pressure. Warning! approaching critical fluid".format(T,xi))
         else:
             flag = 3
             logger.error("    Flag 3: The T and xi, {} {}, won't produce a fluid (vapor or liquid) at this pressure".format(str(T),str(xi)))
@@ -681,7 +981,8 @@ def calc_rhol(P, T, xi, eos, rhodict={}):
         if (Pvspline(roots[0])+P) < 0.:
             flag = 1
             rho_tmp = 1.0 / roots[0]
-            logger.debug("    Flag 1: This T and xi, {} {}, combination produces a liquid under tension at this pressure".format(T,xi))
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("    Flag 1: This T and xi, {} {}, combination produces a liquid under tension at this pressure".format(T,xi))
         else: # There should be three roots, but the values of specific volume don't go far enough to pick up the last one
             flag = 1
             rho_tmp = 1.0 / roots[0]
@@ -689,23 +990,30 @@ def calc_rhol(P, T, xi, eos, rhodict={}):
         if not len(extrema):
             flag = 2
             rho_tmp = 1.0 / interp_vroot(roots[0], vlist, Plist)
-            logger.debug("    Flag 2: The T and xi, {} {}, combination produces a critical fluid at this pressure".format(T,xi))
-        elif (Pvspline(roots[0])+P) > (Pvspline(max(extrema))+P):
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("    Flag 2: The T and xi, {} {}, combination produces a critical fluid at this pressure".format(T,xi))
+        # Compare the pressure at the root to that at the last extremum, evaluating both in one spline call
+        elif np.subtract(*Pvspline(np.array([roots[0], max(extrema)]))) > 0:
             flag = 1
             rho_tmp = 1.0 / roots[0]
-            logger.debug("    Flag 1: The T and xi, {} {}, combination produces a liquid at this pressure".format(T,xi))
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("    Flag 1: The T and xi, {} {}, combination produces a liquid at this pressure".format(T,xi))
         elif len(extrema) > 1:
             flag = 0
             rho_tmp = 1.0 / roots[0]
-            logger.debug("    Flag 0: This T and xi, {} {}, combination produces a vapor at this pressure. Warning! approaching critical fluid".format(T,xi))
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("    Flag 0: This T and xi, {} {}, combination produces a vapor at this pressure. Warning! approaching critical fluid".format(T,xi))
     else: # 3 roots
         rho_tmp = 1.0 / roots[0]
         flag = 1
 
     if flag in [1,2]: # liquid or critical fluid
         tmp = [rho_tmp*.99, rho_tmp*1.01]
-        if (Pdiff(tmp[0],P, T, xi, eos)*Pdiff(tmp[1],P, T, xi, eos))<0:
-            rho_tmp = spo.brentq(Pdiff, tmp[0], tmp[1], args=(P, T, xi, eos), rtol=0.0000001)
+        # Both ends of the bracket are evaluated in one call to the eos
+        Pdiff_tmp = Pdiff(np.array(tmp), P, T, xi, eos)
+        Pdiff_func = _Pdiff_scalar(P, T, xi, eos)
+        if (Pdiff_tmp[0]*Pdiff_tmp[1])<0:
+            rho_tmp = _brent_bracketed(Pdiff_func, tmp, Pdiff_tmp, rtol=0.0000001)
         else:
             if Plist[0] < 0:
                 logger.warning("Density value could not be bounded with (rhomin,rhomax), {}. Using approximate density value".format(tmp))
@@ -745,17 +1053,136 @@ def Pdiff(rho, Pset, T, xi, eos):
         Difference in set pressure and predicted pressure given system conditions.
     """
 
-    #logger = logging.getLogger(__name__)
-
     Pguess = eos.P(rho, T, xi)
 
     return (Pguess - Pset)
 
+def _Pdiff_scalar(Pset, T, xi, eos):
+    r"""
+    Build a scalar version of :func:`Pdiff` for a fixed set point pressure, temperature, and composition, as used in root finding.
+
+    The density is written into a reused array of length one, so the EOS doesn't convert a new float on each call, and the pressure difference is returned as a float.
+    
+    Parameters
+    ----------
+    Pset : float
+        Guess in pressure of the system [Pa]
+    T : float
+        Temperature of the system [K]
+    xi : numpy.ndarray
+        Mole fraction of each component, sum(xi) should equal 1.0
+    eos : obj
+        An instance of the defined EOS class to be used in thermodynamic computations.
+    
+    Returns
+    -------
+    Pdiff_scalar : function
+        Function of density [mol/:math:`m^3`] returning the difference in set pressure and predicted pressure as a float
+    """
+
+    rho_array = np.empty(1)
+    P_func = eos.P
+
+    def Pdiff_scalar(rho):
+        rho_array[0] = rho
+        return P_func(rho_array, T, xi)[0] - Pset
+
+    return Pdiff_scalar
+
+def _brent_bracketed(func, bracket, fbracket, args=(), **kwargs):
+    r"""
+    Find a root with Brent's method when the function has already been evaluated at the ends of the bracket. These values are returned to the solver instead of calling the function again.
+
+    scipy.optimize.brenth is used first, as it needs fewer function evaluations on the shallow pressure curves near saturation. If it fails, scipy.optimize.brentq is used instead.
+    
+    Parameters
+    ----------
+    func : function
+        Function whose root is found, called as func(x, \*args)
+    bracket : list
+        Ends of an interval on which func changes sign
+    fbracket : list
+        Values of func at the ends of the bracket, each a float or an array of length one
+    args : tuple, Optional, default: ()
+        Additional arguments for func
+    kwargs : dict, Optional
+        Options for scipy.optimize.brenth and scipy.optimize.brentq
+    
+    Returns
+    -------
+    root : float
+        Root of func within the bracket
+    """
+
+    a, b = [np.asarray(x, dtype=float).item() for x in bracket]
+    known = {a: fbracket[0], b: fbracket[1]}
+
+    # The solvers require a scalar, while the eos may return an array of length one
+    def func_known(x, *args):
+        if x in known:
+            value = known[x]
+        else:
+            value = func(x, *args)
+        return np.asarray(value, dtype=float).item()
+
+    try:
+        root = spo.brenth(func_known, a, b, args=args, **kwargs)
+    except (ValueError, RuntimeError) as err:
+        logger.debug("brenth failed, trying brentq: %s", err)
+        root = spo.brentq(func_known, a, b, args=args, **kwargs)
+
+    return root
+
 ######################################################################
 #                                                                    #
 #                          Calc phi vapor                            #
 #                                                                    #
 ######################################################################
+def _phi_key(P, T, xi, eos, rhodict):
+    r"""
+    Build the arguments used to cache the results of :func:`calc_phiv` and :func:`calc_phil`.
+
+    Fugacity coefficients are saved for each eos parameter set, see eos._param_version, so that repeated evaluations of the same state in the inner and outer loops of the phase calculations aren't computed again. The composition is rounded to 12 decimal places so that a renormalized composition gives the same key.
+    
+    Parameters
+    ----------
+    P : float
+        Pressure of the system [Pa]
+    T : float
+        Temperature of the system [K]
+    xi : numpy.ndarray
+        Mole fraction of each component, sum(xi) should equal 1.0
+    eos : obj
+        An instance of the defined EOS class to be used in thermodynamic computations.
+    rhodict : dict
+        Dictionary of options used in calculating pressure vs. mole 
+
+    Returns
+    -------
+    key : tuple
+        Eos parameter version, pressure, temperature, composition, and the sorted items of rhodict. None if the inputs can't be cached.
+    """
+
+    param_version = getattr(eos, "_param_version", None)
+    if param_version is None or np.ndim(P) != 0 or np.ndim(T) != 0:
+        return None
+
+    key = (param_version, float(P), float(T), tuple(np.round(np.asarray(xi, dtype=float), 12)), tuple(sorted(rhodict.items())))
+    try:
+        hash(key)
+    except TypeError:
+        return None
+
+    return key
+
+def clear_phi_cache():
+    r"""
+    Clear the fugacity coefficients saved by :func:`calc_phiv` and :func:`calc_phil`. Values are already recomputed when the eos parameters are updated, this is only needed if an eos object is modified in another way.
+    """
+
+    _calc_phiv_cached.cache_clear()
+    _calc_phil_cached.cache_clear()
+
 def calc_phiv(P, T, yi, eos, rhodict={}):
     r"""
     Computes vapor fugacity coefficient under system conditions.
@@ -783,7 +1210,26 @@ def calc_phiv(P, T, yi, eos, rhodict={}):
         Flag identifying the fluid type. A value of 0 is vapor, 1 is liquid, 2 mean a critical fluid, 3 means that neither is true, 4 means ideal gas is assumed
     """
 
-    #logger = logging.getLogger(__name__)
+    key = _phi_key(P, T, yi, eos, rhodict)
+    if key is None:
+        return _calc_phiv(P, T, yi, eos, rhodict)
+
+    phiv, rhov, flagv = _calc_phiv_cached(eos, *key)
+
+    return phiv.copy(), rhov, flagv
+
+@functools.lru_cache(maxsize=256)
+def _calc_phiv_cached(eos, param_version, P, T, yi, rhodict):
+    r"""
+    Cached version of :func:`_calc_phiv`, where param_version is the counter of parameter updates in the eos object. Composition and rhodict are given as tuples.
+    """
+
+    return _calc_phiv(P, T, np.array(yi), eos, dict(rhodict))
+
+def _calc_phiv(P, T, yi, eos, rhodict):
+    r"""
+    Compute the vapor fugacity coefficient for :func:`calc_phiv`.
+    """
 
     rhov, flagv = calc_rhov(P, T, yi, eos, rhodict)
     if flagv == 4:
@@ -834,7 +1280,26 @@ def calc_phil(P, T, xi, eos, rhodict={}):
         Flag identifying the fluid type. A value of 0 is vapor, 1 is liquid, 2 mean a critical fluid, 3 means that neither is true.
     """
 
-    #logger = logging.getLogger(__name__)
+    key = _phi_key(P, T, xi, eos, rhodict)
+    if key is None:
+        return _calc_phil(P, T, xi, eos, rhodict)
+
+    phil, rhol, flagl = _calc_phil_cached(eos, *key)
+
+    return phil.copy(), rhol, flagl
+
+@functools.lru_cache(maxsize=256)
+def _calc_phil_cached(eos, param_version, P, T, xi, rhodict):
+    r"""
+    Cached version of :func:`_calc_phil`, where param_version is the counter of parameter updates in the eos object. Composition and rhodict are given as tuples.
+    """
+
+    return _calc_phil(P, T, np.array(xi), eos, dict(rhodict))
+
+def _calc_phil(P, T, xi, eos, rhodict):
+    r"""
+    Compute the liquid fugacity coefficient for :func:`calc_phil`.
+    """
 
     rhol, flagl = calc_rhol(P, T, xi, eos, rhodict)
     if flagl == 3:
@@ -851,12 +1316,70 @@ def calc_phil(P, T, xi, eos, rhodict={}):
 
 ######################################################################
 #                                                                    #
-#                          Calc xi                                   #
+#                          Calc phi batch                            #
 #                                                                    #
 ######################################################################
-def calc_yi(xi, phil, phiv):
+def calc_phi_batch(P_arr, T_arr, xi_mat, eos, phase="liquid", rhodict={}):
     r"""
-    Computes vapor fugacity coefficient under system conditions.
+    Computes the fugacity coefficients of one phase for a series of system conditions.
+
+    The EOS evaluates a single temperature and composition at a time, and keeps the temperature dependent terms of the last temperature used. States are therefore computed in order of temperature, so that these terms are only updated once for each distinct temperature.
+    
+    Parameters
+    ----------
+    P_arr : numpy.ndarray
+        Pressure of each system [Pa]
+    T_arr : numpy.ndarray
+        Temperature of each system [K]
+    xi_mat : numpy.ndarray
+        Mole fractions of each component (columns) for each system (rows), each row should sum to 1.0
+    eos : obj
+        An instance of the defined EOS class to be used in thermodynamic computations.
+    phase : str, Optional, default: "liquid"
+        Phase of the systems, either "liquid" or "vapor"
+    rhodict : dict, Optional, default: {}
+        Dictionary of options used in calculating pressure vs. mole 
+
+    Returns
+    -------
+    phi_mat : numpy.ndarray
+        Fugacity coefficients of each component (columns) for each system (rows). Rows are NaN where no density was found.
+    rho_arr : numpy.ndarray
+        Density of each system [mol/:math:`m^3`]
+    flag_arr : numpy.ndarray
+        Flag identifying the fluid type of each system, see :func:`calc_phil` and :func:`calc_phiv`
+    """
+
+    if phase == "liquid":
+        calc_phi = calc_phil
+    elif phase == "vapor":
+        calc_phi = calc_phiv
+    else:
+        raise ValueError("Phase, {}, should be either 'liquid' or 'vapor'".format(phase))
+
+    xi_mat = np.atleast_2d(xi_mat)
+    npoints = len(xi_mat)
+    P_arr = np.broadcast_to(np.asarray(P_arr, dtype=float), (npoints,))
+    T_arr = np.broadcast_to(np.asarray(T_arr, dtype=float), (npoints,))
+
+    phi_mat = np.full(xi_mat.shape, np.nan)
+    rho_arr = np.full(npoints, np.nan)
+    flag_arr = np.zeros(npoints, dtype=np.int8)
+    for i in np.argsort(T_arr, kind="stable"):
+        phi, rho_arr[i], flag_arr[i] = calc_phi(P_arr[i], T_arr[i], xi_mat[i], eos, rhodict=rhodict)
+        if flag_arr[i] != 3:
+            phi_mat[i] = phi
+
+    return phi_mat, rho_arr, flag_arr
+
+######################################################################
+#                                                                    #
+#                          Calc xi                                   #
+#                                                                    #
+######################################################################
+def calc_yi(xi, phil, phiv):
+    r"""
+    Computes vapor fugacity coefficient under system conditions.
     
     Parameters
     ----------
@@ -874,9 +1397,8 @@ def calc_yi(xi, phil, phiv):
     """
 
     yi = np.zeros(len(xi))
-    ind = np.where(xi != 0.0)[0]
-    for i in ind:
-        yi[i] = xi[i] * phil[i] / phiv[i]
+    ind = xi != 0.0
+    yi[ind] = xi[ind] * phil[ind] / phiv[ind]
 
     return yi
 
@@ -905,9 +1427,8 @@ def calc_xi(yi, phiv, phil):
     """
 
     xi = np.zeros(len(yi))
-    ind = np.where(yi != 0.0)[0]
-    for i in ind:
-        xi[i] = yi[i] * phiv[i] / phil[i]
+    ind = yi != 0.0
+    xi[ind] = yi[ind] * phiv[ind] / phil[ind]
 
     return xi
 
@@ -935,9 +1456,8 @@ def _clean_plot_data(x_old, y_old):
         New dependent variable
     """
 
-    x_new = list(set(np.sort(x_old)))
-    y_new = [y_old[np.where(x_old==x)[0][0]] for x in x_new]
-    print(len(y_old),len(x_old),len(y_new),len(x_new))
+    x_new, ind = np.unique(np.asarray(x_old), return_index=True)
+    y_new = np.asarray(y_old)[ind]
 
     return x_new, y_new
 
@@ -973,12 +1493,12 @@ def calc_Prange_xi(T, xi, yi, eos, rhodict={}, Pmin=1000, zi_opts={}):
     -------
     Prange : list
         List of min and max pressure range
+    Pguess : float
+        Guess in the system pressure [Pa]
+    yi : numpy.ndarray
+        Vapor mole fraction of each component from the last pressure evaluated, used as a guess in later calculations
     """
 
-    logger = logging.getLogger(__name__)
-
-    global yi_global
-
     # Guess a range from Pmin to the local max of the liquid curve
     vlist, Plist = PvsRho(T, xi, eos, **rhodict)
     Pvspline, roots, extrema = PvsV_spline(vlist, Plist)
@@ -995,7 +1515,7 @@ def calc_Prange_xi(T, xi, yi, eos, rhodict={}, Pmin=1000, zi_opts={}):
 
     # Root of min from liquid curve is absolute minimum
     ObjArray = [0, 0]
-    yi_range = yi
+    yi_range = np.array(yi, dtype=float) # Copied, since the inner loop normalizes its guess in place
 
     maxiter = 200
     for z in range(maxiter):
@@ -1009,7 +1529,8 @@ def calc_Prange_xi(T, xi, yi, eos, rhodict={}, Pmin=1000, zi_opts={}):
         if flagl in [1,2]:
             yi_range, phiv_min, flagv_min = solve_yi_xiT(yi_range, xi, phil, p, T, eos, rhodict=rhodict, **zi_opts)
             ObjArray[0] = (np.nansum(xi * phil / phiv_min) - 1.0)
-            logger.debug("Liquid / Vapor Phi: {} /  {}".format(phil,phiv_min))
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Liquid / Vapor Phi: {} /  {}".format(phil,phiv_min))
             logger.info("Estimated Minimum Pressure: {},  Obj. Func: {}".format(Parray[0],ObjArray[0]))
             if ObjArray[0] > 0:
                 break
@@ -1028,6 +1549,8 @@ def calc_Prange_xi(T, xi, yi, eos, rhodict={}, Pmin=1000, zi_opts={}):
             
     # A flag value of 0 is vapor, 1 is liquid, 2 mean a critical fluid, 3 means that neither is true, 4 means we should assume ideal gas
 
+    # Each new maximum pressure is extrapolated from the objective function, so far fewer steps are needed than in the search for the minimum
+    maxiter = 20
     flag = 0
     for z in range(maxiter):
 
@@ -1075,7 +1598,12 @@ def calc_Prange_xi(T, xi, yi, eos, rhodict={}, Pmin=1000, zi_opts={}):
                     p = 0.9*Parray[-1]
                 elif len(ObjArray) < 3:
                     print("Too low")
-                    p = 2 * Parray[-1]
+                    # Extrapolate to a change in sign with a secant step, kept between 1.5 and 10 times the last pressure so that the range still expands
+                    if ObjArray[-1] != ObjArray[-2]:
+                        p = Parray[-1] - ObjArray[-1] * (Parray[-1] - Parray[-2]) / (ObjArray[-1] - ObjArray[-2])
+                        p = min(max(p, 1.5 * Parray[-1]), 10 * Parray[-1])
+                    else:
+                        p = 2 * Parray[-1]
                 elif any(ObjArray[0] < ObjArray[1:]):
                     print("We have a well!")
                     ObjNew, Pnew = _clean_plot_data(ObjArray, Parray)
@@ -1102,21 +1630,68 @@ def calc_Prange_xi(T, xi, yi, eos, rhodict={}, Pmin=1000, zi_opts={}):
                 logger.info("New Estimate for Maximum Pressure: {},  Obj. Func: {}".format(Parray[-1],ObjArray[-1]))
 
     if z == maxiter-1:
+        logger.error("Pressures searched: {}, Obj. Values: {}".format(Parray, ObjArray))
         raise ValueError('A change in sign for the objective function could not be found, inspect progress')
-       # plt.plot(Parray, ObjArray)
-       # plt.plot([Parray[0], Parray[-1]], [0, 0], 'k')
-       # plt.ylabel("Obj. Function")
-       # plt.xlabel("Pressure / Pa")
-       # plt.savefig("CannotFindMax_{}_{}.png".format(T,xi[0]))
 
     Prange = Parray[-2:]
     ObjRange = ObjArray[-2:]
     logger.info("[Pmin, Pmax]: {}, Obj. Values: {}".format(str(Prange),str(ObjRange)))
     logger.info("Initial guess in pressure: {} Pa".format(Pguess))
 
-    yi_global = yi_range
+    return Prange, Pguess, yi_range
 
-    return Prange, Pguess
+def _reuse_Prange_xi(T, xi, yi, eos, P_last, rhodict={}, zi_opts={}, factor=1.1):
+    r"""
+    Check whether a narrow range around the bubble point pressure of a neighboring composition at this temperature brackets the bubble point of a new liquid composition.
+
+    The bubble point of a neighboring composition is usually close, so only the bounds of the range are evaluated instead of the full search in :func:`calc_Prange_xi`.
+    
+    Parameters
+    ----------
+    T : float
+        Temperature of the system [K]
+    xi : numpy.ndarray
+        Liquid mole fraction of each component, sum(xi) should equal 1.0
+    yi : numpy.ndarray
+        Vapor mole fraction of each component, sum(xi) should equal 1.0
+    eos : obj
+        An instance of the defined EOS class to be used in thermodynamic computations.
+    P_last : float
+        Bubble point pressure of the neighboring composition [Pa]
+    rhodict : dict, Optional, default: {}
+        Dictionary of options used in calculating pressure vs. mole 
+    zi_opts : dict, Optional, default: {}
+        Options used to solve the inner loop in the solving algorithm
+    factor : float, Optional, default: 1.1
+        The range is from P_last divided by this factor to P_last multiplied by it
+
+    Returns
+    -------
+    output : tuple
+        Pressure range, guess in pressure, and vapor mole fraction from the last pressure evaluated, as returned by :func:`calc_Prange_xi`. None if P_last isn't a valid pressure or the range doesn't bracket the solution.
+    """
+
+    if P_last is None or not np.isfinite(P_last) or P_last <= 0:
+        return None
+    Prange = [P_last / factor, P_last * factor]
+
+    # The objective function is positive at the minimum pressure and negative at the maximum, where there must be a vapor
+    yi_range = np.array(yi, dtype=float)
+    ObjRange = []
+    for p in Prange:
+        phil, rhol, flagl = calc_phil(p, T, xi, eos, rhodict=rhodict)
+        if any(np.isnan(phil)) or flagl not in [1,2]:
+            return None
+        yi_range, phiv, flagv = solve_yi_xiT(yi_range, xi, phil, p, T, eos, rhodict=rhodict, **zi_opts)
+        ObjRange.append(np.nansum(xi * phil / phiv) - 1.0)
+    if not (ObjRange[0] > 0 and ObjRange[1] < 0 and flagv in [0,2,4]):
+        logger.info("Previous pressure range, {}, doesn't bracket the solution, Obj. Values: {}".format(Prange, ObjRange))
+        return None
+
+    Pguess = Prange[0] - ObjRange[0] * (Prange[1] - Prange[0]) / (ObjRange[1] - ObjRange[0])
+    logger.info("Reused [Pmin, Pmax]: {}, Obj. Values: {}".format(Prange, ObjRange))
+
+    return list(Prange), Pguess, yi_range
 
 ######################################################################
 #                                                                    #
@@ -1150,12 +1725,12 @@ def calc_Prange_yi(T, xi, yi, eos, rhodict={}, Pmin=1000, zi_opts={}):
     -------
     Prange : list
         List of min and max pressure range
+    Pguess : float
+        Guess in the system pressure [Pa]
+    xi : numpy.ndarray
+        Liquid mole fraction of each component from the last pressure evaluated, used as a guess in later calculations
     """
 
-    logger = logging.getLogger(__name__)
-
-    global xi_global
-
     # Guess a range from Pmin to the local max of the liquid curve
     vlist, Plist = PvsRho(T, yi, eos, **rhodict)
     Pvspline, roots, extrema = PvsV_spline(vlist, Plist)
@@ -1164,25 +1739,13 @@ def calc_Prange_yi(T, xi, yi, eos, rhodict={}, Pmin=1000, zi_opts={}):
     Pmax = max(Pvspline(extrema))
     Parray = [Pmin, Pmax]
 
-    ############################# Test
-    pressures = np.linspace(Pmin,Pmax,30)
-    pressure2 = np.linspace(pressures[-2],Pmax,20)
-    pressures = np.concatenate((pressures,pressure2),axis=0)
-    obj_list = []
-    for p in pressures:
-        phiv, rhov, flagv = calc_phiv(p, T, yi, eos, rhodict=rhodict)
-        xi, phil, flagl = solve_xi_yiT(xi, yi, phiv, p, T, eos, rhodict=rhodict, **zi_opts)
-        obj_list.append(np.nansum(yi * phiv / phil) - 1.0)
-    #plt.plot(pressures,obj_list,".-")
-    #plt.plot([Pmin,Pmax],[0,0],"k")
-    #plt.show()
-
     #################### Find Pressure range and Objective Function values
 
     ObjArray = [0, 0]
-    xi_range = xi
+    xi_range = np.array(xi, dtype=float) # Copied, since the inner loop normalizes its guess in place
 
-    for j,i in enumerate([0,1,0]):
+    def obj_bound(i):
+        nonlocal xi_range
         p = Parray[i]
         phiv, rhov, flagv = calc_phiv(p, T, yi, eos, rhodict=rhodict)
         xi_range, phil, flagl = solve_xi_yiT(xi_range, yi, phiv, p, T, eos, rhodict=rhodict, **zi_opts)
@@ -1193,30 +1756,30 @@ def calc_Prange_yi(T, xi, yi, eos, rhodict={}, Pmin=1000, zi_opts={}):
             if ObjArray[i] < 1e-3:
                 ObjArray[i] = 0.0
             logger.info("Estimate Maximum pressure: {},  Obj. Func: {}".format(p,ObjArray[i]))
-        # Check pressure range
-        if j < 2:
-            tmp_sum = np.abs(ObjArray[0] + ObjArray[1])
-            tmp_dif = np.abs(ObjArray[0] - ObjArray[1])
-            if tmp_dif >= tmp_sum:
-                logger.info("Got the pressure range!")
-                slope, intercept = np.polyfit(ObjArray[-3:], Parray[-3:], 1)
-                Pguess = -intercept / slope
-                break
-            else:
-                newPmin = 10
-                if Parray[0] != newPmin:
-                    Parray[0] = newPmin
-                else:
-                    raise ValueError("No VLE data may be found given this temperature and vapor composition. If there are no errors in parameter definitions, consider updating the thermo function 'solve_xi_yiT'.")
-            
+
+    obj_bound(0)
+    obj_bound(1)
+
+    # Check pressure range, retrying once with a lower minimum pressure if the objective doesn't change sign
+    if np.abs(ObjArray[0] - ObjArray[1]) >= np.abs(ObjArray[0] + ObjArray[1]):
+        logger.info("Got the pressure range!")
+    else:
+        newPmin = 10
+        if Parray[0] != newPmin:
+            Parray[0] = newPmin
+            obj_bound(0)
+        else:
+            raise ValueError("No VLE data may be found given this temperature and vapor composition. If there are no errors in parameter definitions, consider updating the thermo function 'solve_xi_yiT'.")
+
+    slope, intercept = np.polyfit(ObjArray[-3:], Parray[-3:], 1)
+    Pguess = -intercept / slope
+
     Prange = Parray[-2:]
     ObjRange = ObjArray[-2:]
     logger.info("[Pmin, Pmax]: {}, Obj. Values: {}".format(str(Prange),str(ObjRange)))
     logger.info("Initial guess in pressure: {} Pa".format(Pguess))
 
-    xi_global = xi_range
-
-    return Prange, Pguess
+    return Prange, Pguess, xi_range
 
 
 ######################################################################
@@ -1262,12 +1825,10 @@ def solve_yi_xiT(yi, xi, phil, P, T, eos, rhodict={}, maxiter=30, tol=1e-6):
         Flag identifying the fluid type. A value of 0 is vapor, 1 is liquid, 2 mean a critical fluid, 3 means that neither is true, 4 means ideal gas is assumed
     """
 
-    logger = logging.getLogger(__name__)
-
-    global yi_global
-
     yi /= np.sum(yi)
     yi_total = [np.sum(yi)]
+    xi_phil = xi * phil # Numerator of the predicted "mole numbers", the liquid is fixed in this loop
+    yi_old, yinew_old = None, None # Previous iterate, used to accelerate the substitution with the secant method
     flag_check_vapor = True # Make sure we only search for vapor compositions once
     logger.info("    Solve yi: P {}, T {}, xi {}, phil {}".format(P, T, xi, phil))
     for z in range(maxiter):
@@ -1283,16 +1844,18 @@ def solve_yi_xiT(yi, xi, phil, P, T, eos, rhodict={}, maxiter=30, tol=1e-6):
             if all(yi != 0.):
                 yinew = find_new_yi(P, T, phil, xi, eos, rhodict=rhodict)
                 phiv, rhov, flagv = calc_phiv(P, T, yinew, eos, rhodict=rhodict)
-                yinew = xi * phil / phiv
+                yinew = xi_phil / phiv
             else:
                 yinew = yi
+            yi_old = None
 
             if any(np.isnan(phiv)):
                 phiv = np.nan
                 logger.error("Fugacity coefficient of vapor should not be NaN")
         else:
-            yinew = xi * phil / phiv
+            yinew = xi_phil / phiv
         yinew[np.isnan(yinew)] = 0.
+        yinew_total = np.sum(yinew)
 
         ## Check for bouncing between values
         #if len(yi_total) > 3:
@@ -1305,27 +1868,31 @@ def solve_yi_xiT(yi, xi, phil, P, T, eos, rhodict={}, maxiter=30, tol=1e-6):
         #            yinew = yi
         #            phiv, rhov, flagv = calc_phiv(P, T, yi_tmp, eos, rhodict=rhodict)
 
-        logger.info("    yi guess {}, yi calc {}, phiv {}".format(yi_tmp,yinew,phiv))
-        logger.info("    Old yi_total: {}, New yi_total: {}, Change: {}".format(yi_total[-1],np.sum(yinew),np.sum(yinew)-yi_total[-1])) 
+        logger.info("    yi guess %s, yi calc %s, phiv %s", yi_tmp, yinew, phiv)
+        logger.info("    Old yi_total: %s, New yi_total: %s, Change: %s", yi_total[-1], yinew_total, yinew_total-yi_total[-1]) 
 
         # Check convergence
-        if abs(np.sum(yinew)-yi_total[-1]) < tol:
-            ind_tmp = np.where(yi_tmp == min(yi_tmp[yi_tmp>0]))[0] 
-            yi2 = yinew/np.sum(yinew)
+        if abs(yinew_total-yi_total[-1]) < tol:
+            ind_tmp = _argmin_positive(yi_tmp)
+            yi2 = yinew/yinew_total
             if np.abs(yi2[ind_tmp] - yi_tmp[ind_tmp]) / yi_tmp[ind_tmp] < tol:
-                yi_global = yi_tmp
                 logger.info("    Found yi")
                 break
 
         if z < maxiter-1:
-            yi_total.append(np.sum(yinew))
-            yi = yinew
+            yi_total.append(yinew_total)
+            if yi_old is None:
+                yi_next = yinew
+            else:
+                yi_next = _secant_substitution(yi, yinew, yi_old, yinew_old)
+            yi_old, yinew_old = yi, yinew
+            yi = yi_next
 
     ## If yi wasn't found in defined number of iterations
     yi_tmp = yi/np.sum(yi)
     yinew /= np.sum(yinew)
 
-    ind_tmp = np.where(yi_tmp == min(yi_tmp[yi_tmp>0.]))[0]
+    ind_tmp = _argmin_positive(yi_tmp)
     if z == maxiter - 1:
         yi2 = yinew/np.sum(yinew)
         tmp = (np.abs(yi2[ind_tmp] - yi_tmp[ind_tmp]) / yi_tmp[ind_tmp])
@@ -1342,6 +1909,61 @@ def solve_yi_xiT(yi, xi, phil, P, T, eos, rhodict={}, maxiter=30, tol=1e-6):
 
     return yi_tmp, phiv, flagv
 
+def _argmin_positive(x):
+    r"""
+    Find the index of the smallest positive value in an array, used to check the convergence of the smallest mole fraction.
+    
+    Parameters
+    ----------
+    x : numpy.ndarray
+        Array with at least one positive value, e.g. mole fractions
+
+    Returns
+    -------
+    ind : int
+        Index of the smallest positive value in x
+    """
+
+    ind_positive = np.flatnonzero(x > 0.)
+
+    return int(ind_positive[np.argmin(x[ind_positive])])
+
+def _secant_substitution(x, fx, x_old, fx_old, eps=1e-12):
+    r"""
+    Accelerate the successive substitution, x = f(x), used for the mole fractions in :func:`solve_yi_xiT` and :func:`solve_xi_yiT`.
+
+    Each component is updated with a secant step on the residual, f(x) - x, from the last two iterates. Components where the residual doesn't change take the substitution step, f(x), and if the secant step gives a negative or non-finite value, the substitution step is used for all components.
+    
+    Parameters
+    ----------
+    x : numpy.ndarray
+        Current guess in "mole numbers"
+    fx : numpy.ndarray
+        "Mole numbers" predicted from x
+    x_old : numpy.ndarray
+        Previous guess in "mole numbers"
+    fx_old : numpy.ndarray
+        "Mole numbers" predicted from x_old
+    eps : float, Optional, default: 1e-12
+        Smallest change in the residual for which a secant step is taken
+
+    Returns
+    -------
+    x_new : numpy.ndarray
+        Next guess in "mole numbers"
+    """
+
+    res = fx - x
+    dres = res - (fx_old - x_old)
+    secant = np.abs(dres) > eps
+    # Computed for every component in one pass, the substitution step is then selected where the secant step isn't valid
+    x_new = np.where(secant, x - (x - x_old) * res / np.where(secant, dres, 1.0), fx)
+
+    if not np.all(np.isfinite(x_new)) or np.any(x_new < 0.) or not np.any(x_new > 0.):
+        x_new = fx
+
+    return x_new
+
 ######################################################################
 #                                                                    #
 #                       Solve Yi for xi and T                        #
@@ -1385,12 +2007,10 @@ def solve_xi_yiT(xi, yi, phiv, P, T, eos, rhodict={}, maxiter=20, tol=1e-6):
         Flag identifying the fluid type. A value of 0 is vapor, 1 is liquid, 2 mean a critical fluid, 3 means that neither is true
     """
 
-    logger = logging.getLogger(__name__)
-
-    global xi_global
-
     xi /= np.sum(xi)
     xi_total = [np.sum(xi)]
+    yi_phiv = yi * phiv # Numerator of the predicted "mole numbers", the vapor is fixed in this loop
+    xi_old, xinew_old = None, None # Previous iterate, used to accelerate the substitution with the secant method
     logger.info("    Solve xi: P {}, T {}, yi {}, phiv {}".format(P, T, yi, phiv))
     for z in range(maxiter):
 
@@ -1404,37 +2024,43 @@ def solve_xi_yiT(xi, yi, phiv, P, T, eos, rhodict={}, maxiter=20, tol=1e-6):
             if all(xi != 0.):
                 xinew = find_new_xi(P, T, phiv, yi, eos, rhodict=rhodict)
                 phil, rhol, flagl = calc_phil(P, T, xinew, eos, rhodict=rhodict)
-                xinew = yi * phiv / phil
+                xinew = yi_phiv / phil
             else:
                 xinew = xi
+            xi_old = None
             
             if any(np.isnan(phil)):
                 phil = np.nan
                 logger.error("Fugacity coefficient of liquid should not be NaN")
         else:
-            xinew = yi * phiv / phil
+            xinew = yi_phiv / phil
         xinew[np.isnan(xinew)] = 0.
+        xinew_total = np.sum(xinew)
 
-        logger.info("    xi guess {}, xi calc {}, phil {}".format(xi_tmp,xinew,phil))
-        logger.info("    Old xi_total: {}, New xi_total: {}, Change: {}".format(xi_total[-1],np.sum(xinew),np.sum(xinew)-xi_total[-1]))
+        logger.info("    xi guess %s, xi calc %s, phil %s", xi_tmp, xinew, phil)
+        logger.info("    Old xi_total: %s, New xi_total: %s, Change: %s", xi_total[-1], xinew_total, xinew_total-xi_total[-1])
 
         # Check convergence
-        if abs(np.sum(xinew)-xi_total[-1]) < tol:
-            ind_tmp = np.where(xi_tmp == min(xi_tmp[xi_tmp>0]))[0]
-            xi2 = xinew/np.sum(xinew)
+        if abs(xinew_total-xi_total[-1]) < tol:
+            ind_tmp = _argmin_positive(xi_tmp)
+            xi2 = xinew/xinew_total
             if np.abs(xi2[ind_tmp] - xi_tmp[ind_tmp]) / xi_tmp[ind_tmp] < tol:
-                xi_global = xi_tmp
                 logger.info("    Found xi")
                 break
 
         if z < maxiter-1:
-            xi_total.append(np.sum(xinew))
-            xi = xinew
+            xi_total.append(xinew_total)
+            if xi_old is None:
+                xi_next = xinew
+            else:
+                xi_next = _secant_substitution(xi, xinew, xi_old, xinew_old)
+            xi_old, xinew_old = xi, xinew
+            xi = xi_next
 
     ## If xi wasn't found in defined number of iterations
     xinew /= np.sum(xinew)
 
-    ind_tmp = np.where(xi == min(xi[xi>0]))[0]
+    ind_tmp = _argmin_positive(xi)
     if z == maxiter - 1:
         xi2 = xinew/np.sum(xinew)
         tmp = (np.abs(xi2[ind_tmp] - xi_tmp[ind_tmp]) / xi_tmp[ind_tmp])
@@ -1483,34 +2109,31 @@ def find_new_yi(P, T, phil, xi, eos, rhodict={}):
         Vapor mole fraction of each component, sum(yi) should equal 1.0
     """
 
-    logger = logging.getLogger(__name__)
-
     yi_ext = np.linspace(0.01,.99,30) # Guess for yi
-    obj_ext = []
-    flag_ext = [[],[]]
-
-    for yi in yi_ext:
-        yi = np.array([yi, 1-yi])
-        ####
-        phiv, rhov, flagv = calc_phiv(P, T, yi, eos, rhodict=rhodict)
-        yinew = xi * phil / phiv
-        yinew_total_1 = np.sum(yinew)
+    yi_mat = np.column_stack((yi_ext, 1-yi_ext))
 
-        yi2 = yinew/yinew_total_1
-        phiv2, rhov2, flagv2 = calc_phiv(P, T, yi2, eos, rhodict=rhodict)
-        yinew = xi * phil / phiv2
-        yinew_total_2 = np.sum(yinew)
-
-        logger.debug("    yi_totals {} {}".format(yinew_total_1,yinew_total_2))
-
-        obj = yinew_total_1 - yinew_total_2
-
-        flag_ext[0].append(flagv)
-        flag_ext[1].append(flagv2)
-        ######
-    #    obj = obj_yi(yi, P, T, phil, xi, eos, rhodict=rhodict)
-        obj_ext.append(abs(obj))
-        logger.debug("    Obj yi {} total1 - total2 = {}".format(yi,obj))
+    # Rows of each array correspond to the guesses in yi_ext
+    phiv, rhov, flagv = calc_phi_batch(P, T, yi_mat, eos, phase="vapor", rhodict=rhodict)
+    yinew = xi * phil / phiv
+    yinew_total_1 = np.sum(yinew, axis=1)
+
+    # Guesses without a vapor have a NaN objective regardless, so their predicted compositions aren't evaluated
+    valid = ~np.isnan(yinew_total_1)
+    phiv2 = np.full(yi_mat.shape, np.nan)
+    flagv2 = np.full(len(yi_ext), 3)
+    if np.any(valid):
+        yi2 = yinew[valid] / yinew_total_1[valid, np.newaxis]
+        phiv2[valid], _, flagv2[valid] = calc_phi_batch(P, T, yi2, eos, phase="vapor", rhodict=rhodict)
+    yinew_total_2 = np.sum(xi * phil / phiv2, axis=1)
+
+    obj_ext = np.abs(yinew_total_1 - yinew_total_2)
+    flag_ext = np.array([flagv, flagv2])
+
+    if logger.isEnabledFor(logging.DEBUG):
+        for i in range(len(yi_ext)):
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("    yi_totals {} {}".format(yinew_total_1[i],yinew_total_2[i]))
+                logger.debug("    Obj yi {} total1 - total2 = {}".format(yi_mat[i],yinew_total_1[i]-yinew_total_2[i]))
 
     #plt.figure(1)
     #plt.plot(yi_ext,obj_ext,".-b")
@@ -1519,31 +2142,24 @@ def find_new_yi(P, T, phil, xi, eos, rhodict={}):
     #plt.plot(yi_ext,flag_ext[1],".-r")
     #plt.show()
 
-    obj_ext = np.array(obj_ext)
-    flag_ext = np.array(flag_ext)
-
-    tmp = np.count_nonzero(~np.isnan(obj_ext))
-    logger.debug("    Number of valid mole fractions: {}".format(tmp))
+    valid = ~np.isnan(obj_ext)
+    tmp = np.count_nonzero(valid)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("    Number of valid mole fractions: {}".format(tmp))
     if tmp == 0:
         yi_tmp = np.nan
         obj_tmp = np.nan
     else:
-        # Remove any NaN
-        obj_tmp  =  obj_ext[~np.isnan(obj_ext)]
-        yi_tmp   =   yi_ext[~np.isnan(obj_ext)]
-        flag_tmp = flag_ext[1][~np.isnan(obj_ext)]
- 
-        # Assess vapor values
+        # Assess vapor values, only use the other valid values if none are found
         # A value of 0 is vapor, 1 is liquid, 2 mean a critical fluid, 3 means that neither is true, 4 means we should assume ideal gas
-        ind = [i for i in range(len(flag_tmp)) if flag_tmp[i] not in [1,3]]
-        if ind:
-            obj_tmp = [obj_tmp[i] for i in ind]
-            yi_tmp = [yi_tmp[i] for i in ind]
+        vapor = valid & ~np.isin(flag_ext[1], [1,3])
+        if np.any(vapor):
+            valid = vapor
 
         # Choose values with lowest objective function
-        ind = np.where(np.abs(obj_tmp)==min(np.abs(obj_tmp)))[0][0]
-        obj_tmp = obj_tmp[ind]
-        yi_tmp = yi_tmp[ind]
+        ind = int(np.argmin(np.where(valid, obj_ext, np.inf)))
+        obj_tmp = obj_ext[ind]
+        yi_tmp = yi_ext[ind]
 
     logger.info("    Found new guess in yi: {}, Obj: {}".format(yi_tmp,obj_tmp))
     if type(yi_tmp) not in [list,np.ndarray]:
@@ -1585,8 +2201,6 @@ def obj_yi(yi, P, T, phil, xi, eos, rhodict={}):
         Objective function for solving for vapor mole fractions
     """
 
-    logger = logging.getLogger(__name__)
-
     if type(yi) == float or len(yi) == 1:
         if type(yi) in [list, np.ndarray]:
             yi = np.array([yi[0], 1-yi[0]])
@@ -1602,7 +2216,8 @@ def obj_yi(yi, P, T, phil, xi, eos, rhodict={}):
     yinew = xi * phil / phiv2
     yinew_total_2 = np.sum(yinew)
 
-    logger.debug("    yi_totals {} {}".format(yinew_total_1,yinew_total_2))
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("    yi_totals {} {}".format(yinew_total_1,yinew_total_2))
 
     obj = np.abs(yinew_total_1 - yinew_total_2)
     
@@ -1640,8 +2255,6 @@ def find_new_xi(P, T, phiv, yi, eos, rhodict={}):
         Vapor mole fraction of each component, sum(yi) should equal 1.0
     """
     
-    logger = logging.getLogger(__name__)
-    
     xi_ext = np.linspace(0.01,.99,30) # Guess for yi
     obj_ext = []
     flag_ext = [[],[]]
@@ -1658,7 +2271,8 @@ def find_new_xi(P, T, phiv, yi, eos, rhodict={}):
         xinew = yi * phiv / phil2
         xinew_total_2 = np.sum(xinew)
         
-        logger.debug("    xi_totals {} {}".format(xinew_total_1,xinew_total_2))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("    xi_totals {} {}".format(xinew_total_1,xinew_total_2))
         
         obj = xinew_total_1 - xinew_total_2
         
@@ -1667,13 +2281,15 @@ def find_new_xi(P, T, phiv, yi, eos, rhodict={}):
         ######
         #    obj = obj_yi(yi, P, T, phil, xi, eos, rhodict=rhodict)
         obj_ext.append(abs(obj))
-        logger.debug("    Obj xi {} total1 - total2 = {}".format(xi,obj))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("    Obj xi {} total1 - total2 = {}".format(xi,obj))
 
     obj_ext = np.array(obj_ext)
     flag_ext = np.array(flag_ext)
 
     tmp = np.count_nonzero(~np.isnan(obj_ext))
-    logger.debug("    Number of valid mole fractions: {}".format(tmp))
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("    Number of valid mole fractions: {}".format(tmp))
     if tmp == 0:
         xi_tmp = np.nan
         obj_tmp = np.nan
@@ -1691,7 +2307,7 @@ def find_new_xi(P, T, phiv, yi, eos, rhodict={}):
             xi_tmp = [xi_tmp[i] for i in ind]
     
         # Choose values with lowest objective function
-        ind = np.where(np.abs(obj_tmp)==min(np.abs(obj_tmp)))[0][0]
+        ind = int(np.argmin(np.abs(obj_tmp)))
         obj_tmp = obj_tmp[ind]
         xi_tmp = xi_tmp[ind]
     
@@ -1736,8 +2352,6 @@ def obj_xi(xi, P, T, phiv, yi, eos, rhodict={}):
         Objective function for solving for liquid mole fractions
     """
     
-    logger = logging.getLogger(__name__)
-    
     if type(xi) == float or len(xi) == 1:
         if type(xi) in [list, np.ndarray]:
             xi = np.array([xi[0], 1-xi[0]])
@@ -1753,18 +2367,65 @@ def obj_xi(xi, P, T, phiv, yi, eos, rhodict={}):
     xinew = yi * phiv / phil2
     xinew_total_2 = np.sum(xinew)
     
-    logger.debug("    xi_totals {} {}".format(xinew_total_1,xinew_total_2))
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("    xi_totals {} {}".format(xinew_total_1,xinew_total_2))
     
     obj = np.abs(xinew_total_1 - xinew_total_2)
     
     return obj
 
+# Outputs of the last few evaluations of solve_P_xiT and solve_P_yiT, so that the phase calculations don't repeat an evaluation at the converged pressure
+_solve_P_outputs = {}
+
+def _solve_P_key(solve_P, P, zi, T, eos):
+    r"""
+    Build the key used to save the output of :func:`solve_P_xiT` or :func:`solve_P_yiT`.
+    
+    Parameters
+    ----------
+    solve_P : str
+        Name of the objective function
+    P : float
+        Pressure of the system [Pa]
+    zi : numpy.ndarray
+        Mole fraction of each component in the given phase, sum(zi) should equal 1.0
+    T : float
+        Temperature of the system [K]
+    eos : obj
+        An instance of the defined EOS class to be used in thermodynamic computations.
+
+    Returns
+    -------
+    key : tuple
+        Objective function name, eos object and parameter version, pressure, temperature, and composition. None if the eos doesn't track its parameter version.
+    """
+
+    param_version = getattr(eos, "_param_version", None)
+    if param_version is None:
+        return None
+
+    # The eos object itself is kept in the key, as in the lru_cache helpers, so a new eos can't reuse the id of a collected one
+    return (solve_P, eos, param_version, float(np.ravel(P)[0]), float(T), tuple(np.asarray(zi, dtype=float)))
+
+def _save_solve_P_output(key, output, maxsize=4):
+    r"""
+    Save the output of :func:`solve_P_xiT` or :func:`solve_P_yiT`, keeping only the last few evaluations.
+    """
+
+    if key is None:
+        return
+
+    _solve_P_outputs.pop(key, None)
+    if len(_solve_P_outputs) >= maxsize:
+        del _solve_P_outputs[next(iter(_solve_P_outputs))]
+    _solve_P_outputs[key] = output
+
 ######################################################################
 #                                                                    #
 #                              Solve P xT                            #
 #                                                                    #
 ######################################################################
-def solve_P_xiT(P, xi, T, eos, rhodict, zi_opts={}):
+def solve_P_xiT(P, xi, T, eos, rhodict, zi_opts={}, yi_guess=None):
     r"""
     Objective function used to search pressure values and solve outer loop of P bubble point calculations.
     
@@ -1782,7 +2443,8 @@ def solve_P_xiT(P, xi, T, eos, rhodict, zi_opts={}):
         Dictionary of options used in calculating pressure vs. mole 
     zi_opts : dict, Optional, default: {}
         Options used to solve the inner loop in the solving algorithm
-    
+    yi_guess : numpy.ndarray, Optional, default: None
+        Guess in vapor mole fraction of each component, which is updated in place with the solution of the inner loop so that the next evaluation starts from it. If None, xi is used as the guess.
 
     Returns
     -------
@@ -1790,27 +2452,27 @@ def solve_P_xiT(P, xi, T, eos, rhodict, zi_opts={}):
         :math:`\sum\frac{x_{i}\{phi_l}{\phi_v}-1`
     """
 
-    logger = logging.getLogger(__name__)
-
-    global yi_global
-
     if P < 0:
         return 10.0
 
+    if yi_guess is None:
+        yi_guess = np.array(xi, dtype=float)
+
     logger.info("P Guess: {} Pa".format(P))
 
     #find liquid density
     phil, rhol, flagl = calc_phil(P, T, xi, eos, rhodict={})
 
-    yinew, phiv, flagv = solve_yi_xiT(yi_global, xi, phil, P, T, eos, rhodict=rhodict, **zi_opts)
-    yi_global = yi_global / np.sum(yi_global)
-
-    #given final yi recompute
-    phiv, rhov, flagv = calc_phiv(P, T, yi_global, eos, rhodict={})
+    # The returned yi is normalized and phiv was computed for it in the inner loop
+    yi, phiv, flagv = solve_yi_xiT(yi_guess, xi, phil, P, T, eos, rhodict=rhodict, **zi_opts)
+    yi_guess[:] = yi
 
-    Pv_test = eos.P(rhov, T, yi_global)
     obj_value = float((np.nansum(xi * phil / phiv) - 1.0))
-    logger.info('Obj Func: {}, Pset: {}, Pcalc: {}'.format(obj_value, P, Pv_test[0]))
+    _save_solve_P_output(_solve_P_key("solve_P_xiT", P, xi, T, eos), (obj_value, flagl, flagv, yi))
+    if logger.isEnabledFor(logging.INFO):
+        _, rhov, _ = calc_phiv(P, T, yi, eos, rhodict=rhodict)
+        Pv_test = eos.P(rhov, T, yi)
+        logger.info('Obj Func: {}, Pset: {}, Pcalc: {}'.format(obj_value, P, Pv_test[0]))
 
     return obj_value
 
@@ -1819,7 +2481,7 @@ def solve_P_xiT(P, xi, T, eos, rhodict, zi_opts={}):
 #                              Solve P yT                            #
 #                                                                    #
 ######################################################################
-def solve_P_yiT(P, yi, T, eos, rhodict, zi_opts={}):
+def solve_P_yiT(P, yi, T, eos, rhodict, zi_opts={}, xi_guess=None):
     r"""
     Objective function used to search pressure values and solve outer loop of P dew point calculations.
     
@@ -1837,6 +2499,8 @@ def solve_P_yiT(P, yi, T, eos, rhodict, zi_opts={}):
         Dictionary of options used in calculating pressure vs. mole 
     zi_opts : dict, Optional, default: {}
         Options used to solve the inner loop in the solving algorithm
+    xi_guess : numpy.ndarray, Optional, default: None
+        Guess in liquid mole fraction of each component, which is updated in place with the solution of the inner loop so that the next evaluation starts from it. If None, yi is used as the guess.
 
     Returns
     -------
@@ -1844,33 +2508,98 @@ def solve_P_yiT(P, yi, T, eos, rhodict, zi_opts={}):
         :math:`\sum\frac{y_{i}\{phi_v}{\phi_l}-1`
     """
 
-    logger = logging.getLogger(__name__)
-
-    global xi_global
-
     if P < 0:
         return 10.0
 
+    if xi_guess is None:
+        xi_guess = np.array(yi, dtype=float)
+
     #find liquid density
     phiv, rhov, flagv = calc_phiv(P, T, yi, eos, rhodict={})
 
-    xi_global, phil, flagl = solve_xi_yiT(xi_global, yi, phiv, P, T, eos, rhodict=rhodict, **zi_opts)
-    xi_global = xi_global / np.sum(xi_global)
-
-    #given final yi recompute
-    phil, rhol, flagl = calc_phil(P, T, xi_global, eos, rhodict={})
+    # The returned xi is normalized and phil was computed for it in the inner loop
+    xi, phil, flagl = solve_xi_yiT(xi_guess, yi, phiv, P, T, eos, rhodict=rhodict, **zi_opts)
+    xi_guess[:] = xi
 
-    Pv_test = eos.P(rhov, T, xi_global)
-    obj_value = (np.nansum(xi_global * phil / phiv) - 1.0)
-    logger.info('Obj Func: {}, Pset: {}, Pcalc: {}'.format(obj_value, P, Pv_test[0]))
+    obj_value = (np.nansum(xi * phil / phiv) - 1.0)
+    _save_solve_P_output(_solve_P_key("solve_P_yiT", P, yi, T, eos), (obj_value, flagl, flagv, xi))
+    if logger.isEnabledFor(logging.INFO):
+        Pv_test = eos.P(rhov, T, xi)
+        logger.info('Obj Func: {}, Pset: {}, Pcalc: {}'.format(obj_value, P, Pv_test[0]))
 
     return obj_value
 
+def _solve_P_with_jac(P, solve_P, *args):
+    r"""
+    Wrap :func:`solve_P_xiT` or :func:`solve_P_yiT` to also return an estimate of the Jacobian, so that the hybr method of scipy.optimize.root doesn't use finite differences for its initial Jacobian.
+
+    Both objective functions are of the form :math:`\sum\frac{x_{i}\phi_l}{\phi_v}-1`. The liquid fugacity coefficient is close to inversely proportional to pressure, so the derivative with respect to pressure is estimated as :math:`-(obj+1)/P`.
+    
+    Parameters
+    ----------
+    P : numpy.ndarray
+        Guess in pressure of the system [Pa]
+    solve_P : function
+        Objective function, :func:`solve_P_xiT` or :func:`solve_P_yiT`
+    args : tuple
+        Remaining arguments of solve_P
+
+    Returns
+    -------
+    obj_value : float
+        Value of the objective function
+    jac : numpy.ndarray
+        Estimated derivative of the objective function with respect to pressure
+    """
+
+    # scipy.optimize.root passes a length one array, while the eos expects a scalar pressure
+    Pval = float(np.ravel(P)[0])
+    obj_value = solve_P(Pval, *args)
+
+    obj_total = float(obj_value) + 1.0
+    if not np.isfinite(obj_total) or obj_total <= 0.0 or Pval <= 0.0:
+        # Fall back to the ideal slope at the guess
+        obj_total = 1.0
+        Pval = max(Pval, 1.0)
+    jac = np.array([[-obj_total / Pval]])
+
+    return obj_value, jac
+
+def _solve_lnP(lnP, solve_P, *args):
+    r"""
+    Wrap :func:`solve_P_xiT` or :func:`solve_P_yiT` for the secant method in the logarithm of pressure.
+
+    Both objective functions are of the form :math:`\sum\frac{x_{i}\phi_l}{\phi_v}-1`, where the sum is close to inversely proportional to pressure. The logarithm of the sum is then nearly linear in :math:`\ln P`, which the secant method solves in a few iterations, even from a poor initial guess.
+    
+    Parameters
+    ----------
+    lnP : float
+        Natural logarithm of the guess in pressure of the system [Pa]
+    solve_P : function
+        Objective function, :func:`solve_P_xiT` or :func:`solve_P_yiT`
+    args : tuple
+        Remaining arguments of solve_P
+
+    Returns
+    -------
+    obj_value : float
+        Natural logarithm of the objective function plus one
+    """
+
+    obj_total = float(solve_P(np.exp(lnP), *args)) + 1.0
+
+    return np.log(max(obj_total, np.finfo(float).tiny))
+
 ######################################################################
 #                                                                    #
 #                   Set Psat for Critical Components                 #
 #                                                                    #
 ######################################################################
+# Dummy saturation pressures [Pa] used by setPsat, for bead names matching exactly or containing the given group
+_PSAT_DUMMY_EXACT = {"CO2": 10377000.0, "N2": 7377000.0}
+_PSAT_DUMMY_CONTAINS = (("CH4", 6377000.0), ("CH3CH3", 7377000.0))
+_PSAT_DUMMY_DEFAULT = 7377000.0
+
 def setPsat(ind, eos):
     r"""
     Generate dummy value for component saturation pressure if it is above its critical point.
@@ -1890,35 +2619,301 @@ def setPsat(ind, eos):
         Bead name of the component that is above it's critical point
     """
 
-    logger = logging.getLogger(__name__)
+    nui = np.asarray(eos._nui[ind])
+    beads = eos._beads
 
-    for j in range(np.size(eos._nui[ind])):
-        if eos._nui[ind][j] > 0.0 and eos._beads[j] == "CO2":
-            Psat = 10377000.0
-        elif eos._nui[ind][j] > 0.0 and eos._beads[j] == "N2":
-            Psat = 7377000.0
-        elif eos._nui[ind][j] > 0.0 and ("CH4" in eos._beads[j]):
-            Psat = 6377000.0
-        elif eos._nui[ind][j] > 0.0 and ("CH3CH3" in eos._beads[j]):
-            Psat = 7377000.0
-        elif eos._nui[ind][j] > 0.0:
+    Psat = None
+    NaNbead = None
+    for j in np.flatnonzero(nui > 0.0):
+        bead = beads[j]
+        if bead in _PSAT_DUMMY_EXACT:
+            Psat = _PSAT_DUMMY_EXACT[bead]
+            continue
+        for name, value in _PSAT_DUMMY_CONTAINS:
+            if name in bead:
+                Psat = value
+                break
+        else:
             #Psat = np.nan
-            Psat = 7377000.0
-            NaNbead = eos._beads[j]
+            Psat = _PSAT_DUMMY_DEFAULT
+            NaNbead = bead
             logger.warning("Bead, {}, is above its critical point. Psat is assumed to be {}. To add an exception go to thermodynamics.calc.setPsat".format(NaNbead,Psat))
 
-    if "NaNbead" not in list(locals().keys()):
+    if NaNbead is None:
        NaNbead = "No NaNbead"
        logger.info("No beads above their critical point")
 
     return Psat, NaNbead 
 
+def _phase_Psat(T, ncomp, eos, rhodict={}):
+    r"""
+    Estimate the saturation pressure of each component for the phase calculations, see :func:`_init_phase`. Components beyond their critical point are given a dummy value with :func:`setPsat`.
+    
+    Parameters
+    ----------
+    T : float
+        Temperature of the system [K]
+    ncomp : int
+        Number of components in the system
+    eos : obj
+        An instance of the defined EOS class to be used in thermodynamic computations.
+    rhodict : dict, Optional, default: {}
+        Dictionary of options used in calculating pressure vs. mole
+
+    Returns
+    -------
+    Psat : numpy.ndarray
+        Saturation pressure of each component [Pa], NaN if no dummy value is available
+    NaNbeads : list
+        Bead names of the components whose saturation pressure is still NaN
+    """
+
+    Psat = calc_Psat_guess(T, ncomp, eos, rhodict)
+    NaNbeads = []
+    for i in np.flatnonzero(np.isnan(Psat)):
+        Psat[i], NaNbead = setPsat(i, eos)
+        if np.isnan(Psat[i]):
+            NaNbeads.append(NaNbead)
+
+    return Psat, NaNbeads
+
+def _init_phase(T, zi, eos, rhodict={}, Pguess=-1, warm_start=None, dew=False):
+    r"""
+    Initialize :func:`calc_yT_phase`, :func:`calc_xT_phase`, or :func:`calc_PT_phase` from the saturation pressure of each component, see :func:`_phase_Psat`. The guess in pressure and in the mole fraction of the other phase follow from Raoult's law.
+    
+    Parameters
+    ----------
+    T : float
+        Temperature of the system [K]
+    zi : numpy.ndarray
+        Mole fraction of each component in the given phase, sum(zi) should equal 1.0
+    eos : obj
+        An instance of the defined EOS class to be used in thermodynamic computations.
+    rhodict : dict, Optional, default: {}
+        Dictionary of options used in calculating pressure vs. mole
+    Pguess : float, Optional, default: -1
+        Guess the system pressure. A negative value will force an estimation based on the saturation pressure of each component.
+    warm_start : numpy.ndarray, Optional, default: None
+        Guess in mole fraction of each component in the other phase. If None or NaN, the guess is estimated from the saturation pressure of each component.
+    dew : bool, Optional, default: False
+        If True, zi is a vapor and a component beyond its critical point raises an error. Otherwise zi is a liquid and the error is logged.
+
+    Returns
+    -------
+    Psat : numpy.ndarray
+        Saturation pressure of each component [Pa]
+    P : float
+        Guess in pressure of the system [Pa]
+    comp : numpy.ndarray
+        Guess in mole fraction of each component in the other phase
+    """
+
+    Psat, NaNbeads = _phase_Psat(T, np.size(zi), eos, rhodict)
+    if NaNbeads and dew:
+        raise ValueError("Component, {}, is beyond it's critical point at {} K. Add an exception to setPsat".format(", ".join(NaNbeads),T))
+    for NaNbead in NaNbeads:
+        logger.error("Component, {}, is beyond it's critical point. Add an exception to setPsat".format(NaNbead))
+
+    # Estimate initial pressure
+    zi_Psat = zi / Psat
+    if Pguess < 0:
+        P = 1.0 / np.sum(zi_Psat)
+    else:
+        P = Pguess
+
+    # Estimate the other phase, the pressure cancels out when normalized
+    if warm_start is not None and not np.isnan(warm_start).any():
+        comp = np.array(warm_start, dtype=float)
+    elif dew:
+        comp = zi_Psat / np.sum(zi_Psat)
+    else:
+        comp = zi * Psat
+        comp /= np.nansum(comp)
+        logger.info("Guess yi in calc_xT_phase with Psat: {}".format(comp))
+
+    return Psat, P, comp
+
+# Keys of pressure_opts accepted by the scalar solvers in calc_yT_phase and calc_xT_phase
+_BRENT_KEYS = frozenset(["xtol", "rtol", "maxiter", "full_output", "disp"])
+_SECANT_KEYS = frozenset(["xtol", "rtol", "maxiter"])
+
+def _outer_root_result(Pfinal):
+    r"""
+    Log the outcome of a scipy.optimize result for the outer loop of :func:`calc_yT_phase` and :func:`calc_xT_phase` and return the final pressure.
+    
+    Parameters
+    ----------
+    Pfinal : scipy.optimize.OptimizeResult
+        Result of the outer loop solver
+
+    Returns
+    -------
+    P : numpy.ndarray
+        Pressure of the system [Pa]
+    """
+
+    logger.info("Optimization terminated successfully: {} {}".format(Pfinal.success,Pfinal.message))
+
+    return Pfinal.x
+
+def _solve_outer_broyden(func, P, args, Prange, meth, pressure_opts):
+    r"""
+    Solve the outer loop of :func:`calc_yT_phase` or :func:`calc_xT_phase` with the broyden1 or broyden2 methods of scipy.optimize.root.
+
+    All outer loop solvers share this signature, see :data:`_METH_DISPATCH`.
+    
+    Parameters
+    ----------
+    func : function
+        Objective function, :func:`solve_P_xiT` or :func:`solve_P_yiT`
+    P : float
+        Guess in pressure of the system [Pa]
+    args : tuple
+        Remaining arguments of func
+    Prange : list
+        Pressure range of the objective function [Pa], None for methods without boundaries
+    meth : str
+        Method used to solve the outer loop
+    pressure_opts : dict
+        Options used in the given method, "meth"
+
+    Returns
+    -------
+    P : float
+        Pressure of the system [Pa]
+    """
+
+    outer_dict = {'fatol': 1e-5, 'maxiter': 25, 'jac_options': {'reduction_method': 'simple'}, **pressure_opts}
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Using the method, {}, with the following options:\n{}".format(meth,outer_dict))
+    Pfinal = spo.root(func, P, args=args, method=meth, options=outer_dict)
+
+    return _outer_root_result(Pfinal)
+
+def _solve_outer_hybr_broyden(func, P, args, Prange, meth, pressure_opts):
+    r"""
+    Solve the outer loop of :func:`calc_yT_phase` or :func:`calc_xT_phase` with the hybr method of scipy.optimize.root, followed by broyden1 or broyden2 for the methods hybr_broyden1 or hybr_broyden2. See :func:`_solve_outer_broyden` for the parameters.
+    """
+
+    outer_dict = {'fatol': 1e-5, 'maxiter': 25, 'jac_options': {'reduction_method': 'simple'}, **pressure_opts}
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Using the method, {}, with the following options:\n{}".format(meth,outer_dict))
+    Pfinal = spo.root(_solve_P_with_jac, P, args=(func,)+args, method="hybr", jac=True)
+    Pfinal = spo.root(func, Pfinal.x, args=args, method=meth.split("_")[1], options=outer_dict)
+
+    return _outer_root_result(Pfinal)
+
+def _solve_outer_anderson(func, P, args, Prange, meth, pressure_opts):
+    r"""
+    Solve the outer loop of :func:`calc_yT_phase` or :func:`calc_xT_phase` with the anderson method of scipy.optimize.root. See :func:`_solve_outer_broyden` for the parameters.
+    """
+
+    outer_dict = {'fatol': 1e-5, 'maxiter': 25, **pressure_opts}
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Using the method, {}, with the following options:\n{}".format(meth,outer_dict))
+    Pfinal = spo.root(func, P, args=args, method=meth, options=outer_dict)
+
+    return _outer_root_result(Pfinal)
+
+def _solve_outer_root(func, P, args, Prange, meth, pressure_opts):
+    r"""
+    Solve the outer loop of :func:`calc_yT_phase` or :func:`calc_xT_phase` with the remaining methods of scipy.optimize.root. The hybr method is given an estimate of the Jacobian with :func:`_solve_P_with_jac`. See :func:`_solve_outer_broyden` for the parameters.
+    """
+
+    outer_dict = dict(pressure_opts)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Using the method, {}, with the following options:\n{}".format(meth,outer_dict))
+    if meth == "hybr":
+        Pfinal = spo.root(_solve_P_with_jac, P, args=(func,)+args, method=meth, jac=True, options=outer_dict)
+    else:
+        Pfinal = spo.root(func, P, args=args, method=meth, options=outer_dict)
+
+    return _outer_root_result(Pfinal)
+
+def _solve_outer_minimize(func, P, args, Prange, meth, pressure_opts):
+    r"""
+    Minimize the objective function of the outer loop of :func:`calc_yT_phase` or :func:`calc_xT_phase` with scipy.optimize.minimize, bounded by Prange when it has two values. See :func:`_solve_outer_broyden` for the parameters.
+    """
+
+    outer_dict = dict(pressure_opts)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Using the method, {}, with the following options:\n{}".format(meth,outer_dict))
+    if len(Prange) == 2:
+        Pfinal = spo.minimize(func, P, args=args, method=meth, bounds=[tuple(Prange)], options=outer_dict)
+    else:
+        Pfinal = spo.minimize(func, P, args=args, method=meth, options=outer_dict)
+
+    return _outer_root_result(Pfinal)
+
+def _solve_outer_brent(func, P, args, Prange, meth, pressure_opts):
+    r"""
+    Solve the outer loop of :func:`calc_yT_phase` or :func:`calc_xT_phase` with scipy.optimize.brentq within Prange. See :func:`_solve_outer_broyden` for the parameters.
+    """
+
+    outer_dict = {"xtol":1e-5, "rtol":1e-7, "maxiter":50, **{key: value for key, value in pressure_opts.items() if key in _BRENT_KEYS}}
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Using the method, {}, with the following options:\n{}".format(meth,outer_dict))
+
+    return spo.brentq(func, Prange[0], Prange[1], args=args, **outer_dict)
+
+def _solve_outer_secant(func, P, args, Prange, meth, pressure_opts):
+    r"""
+    Solve the outer loop of :func:`calc_yT_phase` or :func:`calc_xT_phase` with the secant method in the logarithm of pressure, see :func:`_solve_lnP`. See :func:`_solve_outer_broyden` for the parameters.
+    """
+
+    # The outer loop is a scalar problem, so the iterations are done without the n-D machinery of scipy.optimize.root
+    outer_dict = {"xtol": 1e-7, "maxiter": 25, **{key: value for key, value in pressure_opts.items() if key in _SECANT_KEYS}}
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Using the method, {}, with the following options:\n{}".format(meth,outer_dict))
+    lnP = np.log(float(np.ravel(P)[0]))
+    Pfinal = spo.root_scalar(_solve_lnP, args=(func,)+args, method="secant", x0=lnP, x1=lnP+0.01, **outer_dict)
+    logger.info("Optimization terminated successfully: {} {}".format(Pfinal.converged,Pfinal.flag))
+
+    return np.exp(Pfinal.root)
+
+def _solve_outer_least_squares(func, P, args, Prange, meth, pressure_opts):
+    r"""
+    Solve the outer loop of :func:`calc_yT_phase` or :func:`calc_xT_phase` with scipy.optimize.least_squares within Prange. See :func:`_solve_outer_broyden` for the parameters.
+    """
+
+    outer_dict = dict(pressure_opts)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Using the method, {}, with the following options:\n{}".format(meth,outer_dict))
+    Pfinal = spo.least_squares(func, P, bounds=(Prange[0],Prange[1]), args=args, **outer_dict)
+
+    return _outer_root_result(Pfinal)
+
+# Outer loop solver of calc_yT_phase and calc_xT_phase for each supported method
+_METH_DISPATCH = MappingProxyType({
+    "broyden1": _solve_outer_broyden,
+    "broyden2": _solve_outer_broyden,
+    "hybr_broyden1": _solve_outer_hybr_broyden,
+    "hybr_broyden2": _solve_outer_hybr_broyden,
+    "anderson": _solve_outer_anderson,
+    "hybr": _solve_outer_root,
+    "lm": _solve_outer_root,
+    "linearmixing": _solve_outer_root,
+    "diagbroyden": _solve_outer_root,
+    "excitingmixing": _solve_outer_root,
+    "krylov": _solve_outer_root,
+    "df-sane": _solve_outer_root,
+    "TNC": _solve_outer_minimize,
+    "L-BFGS-B": _solve_outer_minimize,
+    "SLSQP": _solve_outer_minimize,
+    "brent": _solve_outer_brent,
+    "secant": _solve_outer_secant,
+    "least_squares": _solve_outer_least_squares,
+    })
+
+# Methods of _METH_DISPATCH that need the pressure range from calc_Prange_yi
+_BOUNDED_METHODS = frozenset(["brent", "least_squares", "TNC", "L-BFGS-B", "SLSQP"])
+
 ######################################################################
 #                                                                    #
 #                              Calc yT phase                         #
 #                                                                    #
 ######################################################################
-def calc_yT_phase(yi, T, eos, rhodict={}, zi_opts={}, Pguess=-1, meth="hybr", pressure_opts={}):
+def calc_yT_phase(yi, T, eos, rhodict={}, zi_opts={}, Pguess=-1, meth="hybr", pressure_opts={}, warm_start=None):
     r"""
     Calculate dew point mole fraction and pressure given system vapor mole fraction and temperature.
     
@@ -1936,10 +2931,12 @@ def calc_yT_phase(yi, T, eos, rhodict={}, zi_opts={}, Pguess=-1, meth="hybr", pr
         Options used to solve the inner loop in the solving algorithm
     Pguess : float, Optional, default: -1
         Guess the system pressure at the dew point. A negative value will force an estimation based on the saturation pressure of each component.
-    meth : str, Optional, default: "broyden1"
-        Choose the method used to solve the dew point calculation
+    meth : str, Optional, default: "hybr"
+        Choose the method used to solve the dew point calculation. Methods with boundaries use the pressure range found with :func:`calc_Prange_yi`
     pressure_opts : dict, Optional, default: {}
         Options used in the given method, "meth", to solve the outer loop in the solving algorithm
+    warm_start : numpy.ndarray, Optional, default: None
+        Guess in liquid mole fraction of each component, such as the result of a neighboring point. If None or NaN, the guess is estimated from the saturation pressure of each component.
 
     Returns
     -------
@@ -1953,105 +2950,43 @@ def calc_yT_phase(yi, T, eos, rhodict={}, zi_opts={}, Pguess=-1, meth="hybr", pr
         Flag identifying the fluid type for the vapor mole fractions, expected is vapor or 0. A value of 0 is vapor, 1 is liquid, 2 mean a critical fluid, 3 means that neither is true, 4 means ideal gas is assumed
     """
 
-    logger = logging.getLogger(__name__)
+    if meth not in _METH_DISPATCH:
+        raise ValueError("Optimization method, {}, not supported.".format(meth))
 
-    global xi_global
+    # Estimate initial pressure and xi. The xi array is updated in place by solve_P_yiT.
+    Psat, P, xi = _init_phase(T, yi, eos, rhodict, Pguess=Pguess, warm_start=warm_start, dew=True)
 
-    # Estimate pure component vapor pressures
-    Psat = np.zeros_like(yi)
-    for i in range(np.size(yi)):
-        yi_tmp = np.zeros_like(yi)
-        yi_tmp[i] = 1.0
-        Psat[i], _, _ = calc_Psat(T, yi_tmp, eos, rhodict)
-        if np.isnan(Psat[i]):
-            Psat[i], NaNbead = setPsat(i, eos)
-            if np.isnan(Psat[i]):
-                raise ValueError("Component, {}, is beyond it's critical point at {} K. Add an exception to setPsat".format(NaNbead,T))
-
-    # Estimate initial pressure
-    if Pguess < 0:
-        P=1.0/np.sum(yi/Psat)
-    else:
+    # Methods with boundaries need a pressure range
+    Prange = None
+    if meth in _BOUNDED_METHODS:
+        Prange, Pguess, xi = calc_Prange_yi(T, xi, yi, eos, rhodict, zi_opts=zi_opts)
+        logger.info("Given Pguess: {}, Suggested: {}".format(P, Pguess))
         P = Pguess
 
-    # Estimate initial xi
-    if ("xi_global" not in globals() or any(np.isnan(xi_global))):
-        xi_global = P * (yi / Psat)
-        xi_global /= np.sum(xi_global)
-        xi_global = copy.deepcopy(xi_global)
-    xi = xi_global 
-
-    #Prange, Pguess = calc_Prange_yi(T, xi, yi, eos, rhodict, zi_opts=zi_opts)
-    #logger.info("Given Pguess: {}, Suggested: {}".format(P, Pguess))
-    #P = Pguess
-
-    #################### Root Finding without Boundaries ###################
-    if meth in ['broyden1', 'broyden2']:
-        outer_dict = {'fatol': 1e-5, 'maxiter': 25, 'jac_options': {'reduction_method': 'simple'}}
-        for key, value in pressure_opts.items():
-            outer_dict[key] = value
-        logger.debug("Using the method, {}, with the following options:\n{}".format(meth,outer_dict))
-        Pfinal = spo.root(solve_P_yiT, P, args=(yi, T, eos, rhodict, zi_opts), method=meth, options=outer_dict)
-    elif meth in ['hybr_broyden1', 'hybr_broyden2']:
-        outer_dict = {'fatol': 1e-5, 'maxiter': 25, 'jac_options': {'reduction_method': 'simple'}}
-        for key, value in pressure_opts.items():
-            outer_dict[key] = value
-        Pfinal = spo.root(solve_P_yiT, P, args=(yi, T, eos, rhodict, zi_opts), method="hybr")
-        Pfinal = spo.root(solve_P_yiT, Pfinal.x, args=(yi, T, eos, rhodict, zi_opts), method=meth, options=outer_dict)
-    elif meth == 'anderson':
-        outer_dict = {'fatol': 1e-5, 'maxiter': 25}
-        for key, value in pressure_opts.items():
-            outer_dict[key] = value
-        logger.debug("Using the method, {}, with the following options:\n{}".format(meth,outer_dict))
-        Pfinal = spo.root(solve_P_yiT, P, args=(yi, T, eos, rhodict, zi_opts), method=meth, options=outer_dict)
-    elif meth in ['hybr', 'lm', 'linearmixing', 'diagbroyden', 'excitingmixing', 'krylov', 'df-sane']:
-        outer_dict = {'xtol': 1e-10}
-        for key, value in pressure_opts.items():
-            outer_dict[key] = value
-        logger.debug("Using the method, {}, with the following options:\n{}".format(meth,outer_dict))
-        Pfinal = spo.root(solve_P_yiT, P, args=(yi, T, eos, rhodict, zi_opts), method=meth, options=outer_dict)
+    # The dew point has a tighter default tolerance for the remaining methods of scipy.optimize.root
+    if _METH_DISPATCH[meth] is _solve_outer_root:
+        pressure_opts = {'xtol': 1e-10, **pressure_opts}
 
-#################### Minimization Methods with Boundaries ###################
-    elif meth in ["TNC", "L-BFGS-B", "SLSQP"]:
-        outer_dict = {}
-        for key, value in pressure_opts.items():
-            outer_dict[key] = value
-        logger.debug("Using the method, {}, with the following options:\n{}".format(meth,outer_dict))
-        if len(Prange) == 2:
-            Pfinal = spo.minimize(solve_P_yiT, P, args=(yi, T, eos, rhodict, zi_opts), method=meth, bounds=[tuple(Prange)], options=outer_dict)
-        else:
-            Pfinal = spo.minimize(solve_P_yiT, P, args=(yi, T, eos, rhodict, zi_opts), method=meth, options=outer_dict)
-
-#################### Root Finding with Boundaries ###################
-    elif meth == "brent":
-        outer_dict = {"rtol":1e-7}
-        for key, value in pressure_opts.items():
-            if key in ["xtol","rtol","maxiter","full_output","disp"]:
-                outer_dict[key] = value
-        logger.debug("Using the method, {}, with the following options:\n{}".format(meth,outer_dict))
-        P = spo.brentq(solve_P_yiT, Prange[0], Prange[1], args=(yi, T, eos, rhodict, zi_opts), **outer_dict)
-    elif meth == "least_squares":
-        outer_dict = {}
-        for key, value in pressure_opts.items():
-            outer_dict[key] = value
-        logger.debug("Using the method, {}, with the following options:\n{}".format(meth,outer_dict))
-        Pfinal = spo.least_squares(solve_P_xiT, P, bounds=(Prange[0],Prange[1]), args=(xi, T, eos, rhodict, zi_opts), **outer_dict)
+    P = _METH_DISPATCH[meth](solve_P_yiT, P, (yi, T, eos, rhodict, zi_opts, xi), Prange, meth, pressure_opts)
 
-    #Given final P estimate
-    if meth != "brent":
-        P = Pfinal.x
-        logger.info("Optimization terminated successfully: {} {}".format(Pfinal.success,Pfinal.message))
-
-    #find vapor density and fugacity
-    phiv, rhov, flagv = calc_phiv(P, T, yi, eos, rhodict={})
-    phil, rhol, flagl = calc_phil(P, T, xi, eos, rhodict={})
+    # The objective function was usually already evaluated at the solution, unless the inner loop tolerance is tightened
+    key = _solve_P_key("solve_P_yiT", P, yi, T, eos)
     if "tol" in zi_opts:
-        if zi_opts["tol"] > 1e-10:
-            zi_opts["tol"] = 1e-10
+        zi_opts = {**zi_opts, "tol": min(zi_opts["tol"], 1e-10)}
+        _solve_P_outputs.pop(key, None)
 
-    obj = solve_P_yiT(P, yi, T, eos, rhodict=rhodict, zi_opts=zi_opts)
+    if key not in _solve_P_outputs:
+        obj = solve_P_yiT(P, yi, T, eos, rhodict=rhodict, zi_opts=zi_opts, xi_guess=xi)
 
-    logger.info("Final Output: Obj {}, P {} Pa, flagl {}, xi {}".format(obj,P,flagl,xi_global))
+    if key in _solve_P_outputs:
+        obj, flagl, flagv, xi = _solve_P_outputs[key]
+        xi = xi.copy()
+    else:
+        # Negative pressures return before the phases are evaluated, as does an eos without a parameter version
+        phiv, rhov, flagv = calc_phiv(P, T, yi, eos, rhodict={})
+        phil, rhol, flagl = calc_phil(P, T, xi, eos, rhodict={})
+
+    logger.info("Final Output: Obj {}, P {} Pa, flagl {}, xi {}".format(obj,P,flagl,xi))
 
     return P, xi, flagl, flagv, obj
 
@@ -2060,7 +2995,7 @@ def calc_yT_phase(yi, T, eos, rhodict={}, zi_opts={}, Pguess=-1, meth="hybr", pr
 #                              Calc xT phase                         #
 #                                                                    #
 ######################################################################
-def calc_xT_phase(xi, T, eos, rhodict={}, zi_opts={}, Pguess=-1, meth="hybr", pressure_opts={}):
+def calc_xT_phase(xi, T, eos, rhodict={}, zi_opts={}, Pguess=-1, meth="brent", pressure_opts={}, warm_start=None, P_last=None):
     r"""
     Calculate bubble point mole fraction and pressure given system liquid mole fraction and temperature.
     
@@ -2078,10 +3013,14 @@ def calc_xT_phase(xi, T, eos, rhodict={}, zi_opts={}, Pguess=-1, meth="hybr", pr
         Options used to solve the inner loop in the solving algorithm
     Pguess : float, Optional, default: -1
         Guess the system pressure at the dew point. A negative value will force an estimation based on the saturation pressure of each component.
-    meth : str, Optional, default: "broyden1"
-        Choose the method used to solve the dew point calculation
+    meth : str, Optional, default: "brent"
+        Choose the method used to solve the bubble point calculation. The default, "brent", uses the pressure range found with :func:`calc_Prange_xi`
     pressure_opts : dict, Optional, default: {}
         Options used in the given method, "meth", to solve the outer loop in the solving algorithm
+    warm_start : numpy.ndarray, Optional, default: None
+        Guess in vapor mole fraction of each component, such as the result of a neighboring point. If None or NaN, the guess is estimated from the saturation pressure of each component.
+    P_last : float, Optional, default: None
+        Bubble point pressure of a neighboring liquid composition at the same temperature, such as the result of the previous point of an isothermal sweep. If given, a narrow range around it is checked as the pressure range before searching with :func:`calc_Prange_xi`.
 
     Returns
     -------
@@ -2095,114 +3034,45 @@ def calc_xT_phase(xi, T, eos, rhodict={}, zi_opts={}, Pguess=-1, meth="hybr", pr
         Flag identifying the fluid type for the liquid mole fractions, expected is liquid, 1. A value of 0 is vapor, 1 is liquid, 2 mean a critical fluid, 3 means that neither is true
     """
 
-    logger = logging.getLogger(__name__)
+    if meth not in _METH_DISPATCH:
+        raise ValueError("Optimization method, {}, not supported.".format(meth))
 
-    global yi_global
-
-    Psat = np.zeros_like(xi)
-    for i in range(np.size(xi)):
-        xi_tmp = np.zeros_like(xi)
-        xi_tmp[i] = 1.0
-        Psat[i], _, _ = calc_Psat(T, xi_tmp, eos, rhodict)
-        if np.isnan(Psat[i]):
-            Psat[i], NaNbead = setPsat(i, eos)
-            if np.isnan(Psat[i]):
-                logger.error("Component, {}, is beyond it's critical point. Add an exception to setPsat".format(NaNbead))
-
-    # Estimate initial pressure
-    if Pguess < 0:
-        P=1.0/np.sum(xi/Psat)
-    else:
-        P = Pguess
-
-
-    if ("yi_global" not in globals() or any(np.isnan(yi_global))):
-        yi_global = xi * Psat / P
-        yi_global /= np.nansum(yi_global)
-        yi_global = copy.deepcopy(yi_global)
-        logger.info("Guess yi in calc_xT_phase with Psat: {}".format(yi_global))
-    yi = yi_global
+    # Estimate initial pressure and yi. The yi array is updated in place by solve_P_xiT.
+    Psat, P, yi = _init_phase(T, xi, eos, rhodict, Pguess=Pguess, warm_start=warm_start)
 
 #    logger.info("Initial: P: {}, yi: {}".format(Pguess,str(yi)))
 #    Pguess, yi = bubblepoint_guess(Pguess, yi, xi, T, phil, eos, rhodict)
 #    logger.info("Updated: P: {}, yi: {}".format(Pguess,str(yi)))
 
-    Prange, Pguess = calc_Prange_xi(T, xi, yi, eos, rhodict, zi_opts=zi_opts)
+    output = _reuse_Prange_xi(T, xi, yi, eos, P_last, rhodict, zi_opts=zi_opts)
+    if output is None:
+        output = calc_Prange_xi(T, xi, yi, eos, rhodict, zi_opts=zi_opts)
+    Prange, Pguess, yi = output
     logger.info("Given Pguess: {}, Suggested: {}".format(P, Pguess))
     P = Pguess
 
-    if meth not in ["brent", "least_squares", "TNC", "L-BFGS-B", "SLSQP", 'hybr', 'lm', 'linearmixing', 'diagbroyden', 'excitingmixing', 'krylov', 'df-sane', 'anderson', 'hybr_broyden1', 'hybr_broyden2', 'broyden1', 'broyden2']:
-        logger.error("Optimization method, {}, not supported.".format(meth))
-
-    #################### Root Finding without Boundaries ###################
-    if meth in ['broyden1', 'broyden2']:
-        outer_dict = {'fatol': 1e-5, 'maxiter': 25, 'jac_options': {'reduction_method': 'simple'}}
-        for key, value in pressure_opts.items():
-            outer_dict[key] = value
-        logger.debug("Using the method, {}, with the following options:\n{}".format(meth,outer_dict))
-        Pfinal = spo.root(solve_P_xiT, P, args=(xi, T, eos, rhodict, zi_opts), method=meth, options=outer_dict)
-    elif meth in ['hybr_broyden1', 'hybr_broyden2']:
-        outer_dict = {'fatol': 1e-5, 'maxiter': 25, 'jac_options': {'reduction_method': 'simple'}}
-        for key, value in pressure_opts.items():
-            outer_dict[key] = value
-        Pfinal = spo.root(solve_P_xiT, P, args=(xi, T, eos, rhodict, zi_opts), method="hybr")
-        Pfinal = spo.root(solve_P_xiT, Pfinal.x, args=(xi, T, eos, rhodict, zi_opts), method=meth, options=outer_dict)
-    elif meth == 'anderson':
-        outer_dict = {'fatol': 1e-5, 'maxiter': 25}
-        for key, value in pressure_opts.items():
-            outer_dict[key] = value
-        logger.debug("Using the method, {}, with the following options:\n{}".format(meth,outer_dict))
-        Pfinal = spo.root(solve_P_xiT, P, args=(xi, T, eos, rhodict, zi_opts), method=meth, options=outer_dict)
-    elif meth in ['hybr', 'lm', 'linearmixing', 'diagbroyden', 'excitingmixing', 'krylov', 'df-sane']:
-        outer_dict = {}
-        for key, value in pressure_opts.items():
-            outer_dict[key] = value
-        logger.debug("Using the method, {}, with the following options:\n{}".format(meth,outer_dict))
-        Pfinal = spo.root(solve_P_xiT, P, args=(xi, T, eos, rhodict, zi_opts), method=meth, options=outer_dict)
-
-#################### Minimization Methods with Boundaries ###################
-    elif meth in ["TNC", "L-BFGS-B", "SLSQP"]:
-        outer_dict = {}
-        for key, value in pressure_opts.items():
-            outer_dict[key] = value
-        logger.debug("Using the method, {}, with the following options:\n{}".format(meth,outer_dict))
-        if len(Prange) == 2:
-            Pfinal = spo.minimize(solve_P_xiT, P, args=(xi, T, eos, rhodict, zi_opts), method=meth, bounds=[tuple(Prange)], options=outer_dict)
-        else:
-            Pfinal = spo.minimize(solve_P_xiT, P, args=(xi, T, eos, rhodict, zi_opts), method=meth, options=outer_dict)
-
-#################### Root Finding with Boundaries ###################
-    elif meth == "brent":
-        outer_dict = {"rtol":1e-7}
-        for key, value in pressure_opts.items():
-            if key in ["xtol","rtol","maxiter","full_output","disp"]:
-                outer_dict[key] = value
-        logger.debug("Using the method, {}, with the following options:\n{}".format(meth,outer_dict))
-        P = spo.brentq(solve_P_xiT, Prange[0], Prange[1], args=(xi, T, eos, rhodict, zi_opts), **outer_dict)
-    elif meth == "least_squares":
-        outer_dict = {}
-        for key, value in pressure_opts.items():
-            outer_dict[key] = value
-        logger.debug("Using the method, {}, with the following options:\n{}".format(meth,outer_dict))
-        Pfinal = spo.least_squares(solve_P_xiT, P, bounds=(Prange[0],Prange[1]), args=(xi, T, eos, rhodict, zi_opts), **outer_dict)
-
-    #Given final P estimate
-    if meth != "brent":
-        P = Pfinal.x
-        logger.info("Optimization terminated successfully: {} {}".format(Pfinal.success,Pfinal.message))
+    P = _METH_DISPATCH[meth](solve_P_xiT, P, (xi, T, eos, rhodict, zi_opts, yi), Prange, meth, pressure_opts)
 
-    #find liquid density and fugacity
-    phil, rhol, flagl = calc_phil(P, T, xi, eos, rhodict={})
-    phiv, rhov, flagv = calc_phiv(P, T, yi, eos, rhodict={})
+    # The objective function was usually already evaluated at the solution, unless the inner loop tolerance is tightened
+    key = _solve_P_key("solve_P_xiT", P, xi, T, eos)
     if "tol" in zi_opts:
-        if zi_opts["tol"] > 1e-10:
-            zi_opts["tol"] = 1e-10
+        zi_opts = {**zi_opts, "tol": min(zi_opts["tol"], 1e-10)}
+        _solve_P_outputs.pop(key, None)
+
+    if key not in _solve_P_outputs:
+        obj = solve_P_xiT(P, xi, T, eos, rhodict=rhodict, zi_opts=zi_opts, yi_guess=yi)
 
-    obj = solve_P_xiT(P, xi, T, eos, rhodict=rhodict, zi_opts=zi_opts)
+    if key in _solve_P_outputs:
+        obj, flagl, flagv, yi = _solve_P_outputs[key]
+        yi = yi.copy()
+    else:
+        # Negative pressures return before the phases are evaluated, as does an eos without a parameter version
+        phil, rhol, flagl = calc_phil(P, T, xi, eos, rhodict={})
+        phiv, rhov, flagv = calc_phiv(P, T, yi, eos, rhodict={})
 
-    logger.info("Final Output: Obj {}, P {} Pa, flagv {}, yi {}".format(obj,P,flagv,yi_global))
+    logger.info("Final Output: Obj {}, P {} Pa, flagv {}, yi {}".format(obj,P,flagv,yi))
 
-    return P, yi_global, flagv, flagl, obj
+    return P, yi, flagv, flagl, obj
 
 ######################################################################
 #                                                                    #
@@ -2236,8 +3106,6 @@ def hildebrand_solubility(rhol, xi, T, eos, dT=.1, tol=1e-4, rhodict={}):
         Solubility parameter [Pa^(1/2)], ratio of cohesive energy and molar volume
     """
 
-    logger = logging.getLogger(__name__)
-
     R = constants.Nav * constants.kb
     RT = T * R
 
@@ -2255,7 +3123,7 @@ def hildebrand_solubility(rhol, xi, T, eos, dT=.1, tol=1e-4, rhodict={}):
 #    integrand_list = gaussian_filter1d(T*dZdT/vlist, sigma=.5)
 
     int_tmp = (Plist2-Plist1)/(2*dT)/R - Plist/(RT)
-    integrand_list = gaussian_filter1d(int_tmp, sigma=.5)
+    integrand_list = _smooth_pressure(int_tmp)
 
     # Calculat U_res
     integrand_spline = interpolate.InterpolatedUnivariateSpline(vlist, integrand_list,ext=1)
@@ -2304,27 +3172,17 @@ def calc_PT_phase(xi, T, eos, rhodict={}):
         Mole fraction of each component, sum(yi) should equal 1.0
     """
 
-    logger = logging.getLogger(__name__)
-
     logger.error("The function, calc_PT_phase, is not yet available.")
 
-  #  Psat = np.zeros_like(xi)
-  #  for i in range(np.size(xi)):
-  #      xi_tmp = np.zeros_like(xi)
-  #      xi_tmp[i] = 1.0
-  #      Psat[i], rholsat, rhogsat = calc_Psat(T, xi_tmp, eos, rhodict)
-  #      if np.isnan(Psat[i]):
-  #          Psat[i], NaNbead = setPsat(i, eos)
-  #          if np.isnan(Psat[i]):
-  #              logger.error("Component, {}, is beyond it's critical point. Add an exception to setPsat".format(NaNbead))
-
   #  zi = np.array([0.5, 0.5])
 
-  #  #estimate ki
+  #  #estimate P from the saturation pressures, then ki
+  #  Psat, P, yi = _init_phase(T, zi, eos, rhodict)
   #  ki = Psat / P
 
-  #  #estimate beta (not thermodynamic) vapor frac
-  #  beta = (1.0 - np.sum(ki * zi)) / np.prod(ki - 1.0)
+  #  #estimate beta (not thermodynamic) vapor frac, ki of one is shifted to avoid dividing by zero at an azeotrope
+  #  ki_1 = ki - 1.0
+  #  beta = (1.0 - np.dot(ki, zi)) / np.prod(np.where(ki_1 == 0.0, np.finfo(float).eps, ki_1))
 
 
 ######################################################################
@@ -2335,11 +3193,13 @@ def calc_PT_phase(xi, T, eos, rhodict={}):
 def calc_dadT(rho, T, xi, eos, rhodict={}):
     r"""
     Calculate the derivative of the Helmholtz energy with respect to temperature, :math:`\frac{dA}{dT}`.
+
+    If the eos has the method, calc_A_and_dAdT, its analytical derivative is used. Otherwise, a central difference is taken.
     
     Parameters
     ----------
     rho : numpy.ndarray
-        Density array. Length depends on values in rhodict [mol/:math:`m^3`]
+        Array of molar densities, a float is treated as an array of length one [mol/:math:`m^3`]
     T : float
         Temperature of the system [K]
     xi : numpy.ndarray
@@ -2352,16 +3212,23 @@ def calc_dadT(rho, T, xi, eos, rhodict={}):
     Returns
     -------
     dadT : numpy.ndarray
-        Array of derivative values of Helmholtz energy with respect to temperature
+        Array of derivative values of Helmholtz energy with respect to temperature, one for each density in rho
     """
 
-    #logger = logging.getLogger(__name__)
+    # All densities are evaluated with a single call
+    rho = np.atleast_1d(np.asarray(rho, dtype=float))
+
+    # An analytical derivative from the eos avoids both finite difference evaluations
+    if hasattr(eos, "calc_A_and_dAdT"):
+        A, dadT = eos.calc_A_and_dAdT(rho, xi, T)
+        return dadT
 
-    step = np.sqrt(np.finfo(float).eps) * T * 1000.0
+    # Step size that balances truncation and round off error for a central difference
+    step = T * np.finfo(float).eps**(1.0/3.0)
 
     #computer rho+step and rho-step for better a bit better performance
-    Ap = calchelmholtz.calc_A(np.array([rho]), xi, T + step, eos)
-    Am = calchelmholtz.calc_A(np.array([rho]), xi, T - step, eos)
+    Ap = calchelmholtz.calc_A(rho, xi, T + step, eos)
+    Am = calchelmholtz.calc_A(rho, xi, T - step, eos)
 
     return (Ap - Am) / (2.0 * step)
 
@@ -7,9 +7,172 @@
 
 import numpy as np
 import logging
+import functools
+import multiprocessing
 
 from . import calc
 
+def _broadcast_points(T_list, zi_list):
+    r"""
+    Broadcast the temperatures and mole fractions of a calculation type to the same number of points. A single temperature or set of mole fractions is used for all points without being copied.
+
+    Parameters
+    ----------
+    T_list : numpy.ndarray
+        Temperature of each point [K]
+    zi_list : numpy.ndarray
+        Mole fractions of each point
+
+    Returns
+    -------
+    T_list : numpy.ndarray
+        Temperature of each point [K]
+    zi_list : numpy.ndarray
+        Mole fractions of each point
+    """
+
+    logger = logging.getLogger(__name__)
+
+    T_list = np.atleast_1d(T_list)
+    zi_list = np.atleast_2d(zi_list)
+    if len(T_list) == len(zi_list):
+        return T_list, zi_list
+
+    if len(T_list) == 1:
+        logger.info("The same temperature, {}, was used for all mole fraction values".format(T_list[0]))
+        T_list = np.broadcast_to(T_list, (len(zi_list),))
+    elif len(zi_list) == 1:
+        logger.info("The same mole fraction values, {}, were used for all temperature values".format(zi_list[0]))
+        zi_list = np.broadcast_to(zi_list, (len(T_list), zi_list.shape[1]))
+    else:
+        raise ValueError("The number of provided temperatures and mole fraction sets are different")
+
+    return T_list, zi_list
+
+def _broadcast_TPzi(T_list, P_list, zi_list):
+    r"""
+    Broadcast the temperatures, pressures, and mole fractions of a calculation type to the same number of points, see :func:`_broadcast_points` and :func:`_broadcast_values`.
+
+    Parameters
+    ----------
+    T_list : numpy.ndarray
+        Temperature of each point [K]
+    P_list : numpy.ndarray
+        Pressure of each point [Pa]. If None, atmospheric pressure is assumed.
+    zi_list : numpy.ndarray
+        Mole fractions of each point
+
+    Returns
+    -------
+    T_list : numpy.ndarray
+        Temperature of each point [K]
+    P_list : numpy.ndarray
+        Pressure of each point [Pa]
+    zi_list : numpy.ndarray
+        Mole fractions of each point
+    """
+
+    logger = logging.getLogger(__name__)
+
+    T_list, zi_list = _broadcast_points(T_list, zi_list)
+    if P_list is None:
+        logger.info("Assuming atmospheric pressure.")
+        P_list = np.broadcast_to(101325.0, T_list.shape)
+    else:
+        logger.info("Using Plist")
+        P_list = _broadcast_values(P_list, len(T_list), "pressure")
+
+    return T_list, P_list, zi_list
+
+def _properties_inputs(sys_dict, composition_key):
+    r"""
+    Extract the points and options shared by :func:`liquid_properties` and :func:`vapor_properties`.
+
+    Parameters
+    ----------
+    sys_dict: dict
+        A dictionary of all information given in the input .json file that wasn't used to create the EOS object
+    composition_key : str
+        Key of the mole fractions in sys_dict, either "xilist" or "yilist"
+
+    Returns
+    -------
+    T_list : numpy.ndarray
+        Temperature of each point [K]
+    P_list : numpy.ndarray
+        Pressure of each point [Pa]
+    zi_list : numpy.ndarray
+        Mole fractions of each point
+    opts : dict
+        Options of the density calculation
+    ncores : int
+        Number of processes used to evaluate the points
+    """
+
+    logger = logging.getLogger(__name__)
+
+    ## Extract and check input data
+    if 'Tlist' not in sys_dict or composition_key not in sys_dict:
+        raise ValueError('Tlist or {} are not specified'.format(composition_key))
+
+    T_list = np.asarray(sys_dict['Tlist'], dtype=float)
+    logger.info("Using Tlist")
+    zi_list = np.asarray(sys_dict[composition_key], dtype=float)
+    logger.info("Using {}".format(composition_key))
+
+    T_list, P_list, zi_list = _broadcast_TPzi(T_list, sys_dict.get('Plist'), zi_list)
+
+    ## Optional values
+    opts = {}
+
+    # Process initial guess in pressure
+    if 'Pguess' in sys_dict:
+        logger.info("Guess in pressure has been provided, but is unused for this function")
+
+    if 'CriticalProp' in sys_dict:
+        logger.info("Critical properties have been provided, but are unused for this function")
+
+    # Extract rho dict
+    if "rhodict" in sys_dict:
+        logger.info("Accepted options for P vs. density curve")
+        opts["rhodict"] = sys_dict["rhodict"]
+
+    # Number of processes used to evaluate the points
+    ncores = sys_dict.get("ncores", 1)
+
+    return T_list, P_list, zi_list, opts, ncores
+
+def _broadcast_values(values, npoints, name):
+    r"""
+    Broadcast a scalar or a single value given for a calculation type to all points.
+
+    Parameters
+    ----------
+    values : float or numpy.ndarray
+        Value(s) given for the points
+    npoints : int
+        Number of points
+    name : str
+        Name of the quantity used in messages
+
+    Returns
+    -------
+    values : numpy.ndarray
+        Value of each point
+    """
+
+    logger = logging.getLogger(__name__)
+
+    values = np.atleast_1d(np.asarray(values, dtype=float))
+    if len(values) == npoints:
+        return values
+
+    if len(values) == 1:
+        logger.info("The same {}, {}, was used for all points".format(name,values[0]))
+        return np.broadcast_to(values, (npoints,))
+
+    raise ValueError("The number of provided {} values and mole fraction sets are different".format(name))
+
 ######################################################################
 #                                                                    #
 #                Phase Equilibrium given xi and T                    #
@@ -41,39 +204,25 @@ def phase_xiT(eos, sys_dict):
 
     ## Extract and check input data
     if 'Tlist' in sys_dict:
-        T_list = np.array(sys_dict['Tlist'],float)
+        T_list = np.asarray(sys_dict['Tlist'], dtype=float)
         logger.info("Using Tlist") 
 
     if 'xilist' in sys_dict:
-        xi_list = np.array(sys_dict['xilist'],float)
+        xi_list = np.asarray(sys_dict['xilist'], dtype=float)
         logger.info("Using xilist")
 
     variables = list(locals().keys())
-    if all([key not in variables for key in ["xi_list", "T_list"]]):
+    if all(key not in variables for key in ["xi_list", "T_list"]):
         raise ValueError('Tlist or xilist are not specified')
 
-    if np.size(T_list) != np.size(xi_list, axis=0):
-        if len(T_list) == 1:
-            T_list = np.ones(len(xi_list))*T_list[0]
-            logger.info("The same temperature, {}, was used for all mole fraction values".format(T_list[0]))
-        else:
-            raise ValueError("The number of provided temperatures and mole fraction sets are different")
+    T_list, xi_list = _broadcast_points(T_list, xi_list)
 
     ## Optional values
     opts = {}
 
     # Process initial guess in pressure
     if 'Pguess' in sys_dict:
-        Pguess = np.array(sys_dict['Pguess'],float)
-        if np.size(T_list) != np.size(Pguess):
-            if type(Pguess) not in [list, numpy.ndarray]:
-                opts["Pguess"] = np.ones(len(T_list))*Pguess
-                logger.info("The same pressure, {}, was used for all mole fraction values".format(Pguess))
-            elif len(T_list) == 1:
-                opts["Pguess"] = np.ones(len(T_list))*float(Pguess[0])
-                logger.info("The same pressure, {}, was used for all mole fraction values".format(Pguess))
-            else:
-                raise ValueError("The number of provided pressure and mole fraction sets are different")
+        opts["Pguess"] = _broadcast_values(sys_dict['Pguess'], len(T_list), "pressure guess")
         logger.info("Using user defined initial guess has been provided")
     else:
         if 'CriticalProp' in sys_dict:
@@ -112,33 +261,40 @@ def phase_xiT(eos, sys_dict):
     l_x, l_c = np.array(xi_list).shape
     T_list = np.array(T_list)
     P_list = np.zeros(l_x)
-    flagv_list = np.zeros(l_x)
-    flagl_list = np.zeros(l_x)
+    flagv_list = np.zeros(l_x, dtype=np.int8)
+    flagl_list = np.zeros(l_x, dtype=np.int8)
     yi_list = np.zeros((l_x,l_c))
     obj_list = np.zeros(l_x)
+    warm_start = None # Vapor composition of the last point, used as the initial guess of the next one
+    T_last, P_last = None, None # Temperature and bubble point pressure of the last point, used to bracket the next one at the same temperature
+    # Options shared by all points are passed as they are, only the values of each point are set in the loop
+    Pguess_list = opts.pop("Pguess", None)
+    Psat_opts = {key: opts[key] for key in ["rhodict"] if key in opts}
+    pure_list = np.count_nonzero(xi_list, axis=1) == 1 # Points of a single component only need its saturation pressure
     for i in range(l_x):
-        optsi = opts
-        if "Pguess" in opts:
-            optsi["Pguess"] = optsi["Pguess"][i]
+        optsi = {"warm_start": warm_start}
+        if Pguess_list is not None:
+            optsi["Pguess"] = Pguess_list[i]
+        if T_list[i] == T_last:
+            optsi["P_last"] = P_last
 
-        logger.info("T (K), xi: {} {}, Let's Begin!".format(str(T_list[i]), str(xi_list[i])))
+        logger.info("T (K), xi: %s %s, Let's Begin!", T_list[i], xi_list[i])
         try:
-            if len(xi_list[i][xi_list[i]!=0.])==1:
-                if "rhodict" in optsi:
-                    opt_tmp = {"rhodict": optsi["rhodict"]}
-                else:
-                    opt_tmp = {}
-                P_list[i], _, _ = calc.calc_Psat(T_list[i], xi_list[i], eos, **opt_tmp)
+            if pure_list[i]:
+                P_list[i], _, _ = calc.calc_Psat(T_list[i], xi_list[i], eos, **Psat_opts)
                 yi_list[i], flagv_list[i], flagl_list[i], obj_list[i] = xi_list[i], 0, 1, 0.0 
             else:
-                P_list[i], yi_list[i], flagv_list[i], flagl_list[i], obj_list[i] = calc.calc_xT_phase(xi_list[i], T_list[i], eos, **optsi)
-        except:
-            logger.warning("T (K), xi: {} {}, calculation did not produce a valid result.".format(T_list[i], xi_list[i]))
-            logger.debug("Calculation Failed:", exc_info=True)
-            P_list[i], yi_list[i] = [np.nan, np.nan]
+                P_list[i], yi_list[i], flagv_list[i], flagl_list[i], obj_list[i] = calc.calc_xT_phase(xi_list[i], T_list[i], eos, **opts, **optsi)
+                warm_start = yi_list[i]
+                T_last, P_last = T_list[i], P_list[i]
+        except (ValueError, RuntimeError, ArithmeticError, np.linalg.LinAlgError):
+            logger.warning("T (K), xi: %s %s, calculation did not produce a valid result.", T_list[i], xi_list[i])
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Calculation Failed:", exc_info=True)
+            P_list[i] = yi_list[i] = np.nan
             flagl_list[i], flagv_list[i], obj_list[i] = [3, 3, np.nan]
             continue
-        logger.info("P (Pa), yi: {} {}".format(P_list[i], yi_list[i]))
+        logger.info("P (Pa), yi: %s %s", P_list[i], yi_list[i])
 
     logger.info("--- Calculation phase_xiT Complete ---")
 
@@ -174,39 +330,25 @@ def phase_yiT(eos, sys_dict):
 
     ## Extract and check input data
     if 'Tlist' in sys_dict:
-        T_list = np.array(sys_dict['Tlist'],float)
+        T_list = np.asarray(sys_dict['Tlist'], dtype=float)
         logger.info("Using Tlist")
 
     if 'yilist' in sys_dict:
-        yi_list = np.array(sys_dict['yilist'],float)
+        yi_list = np.asarray(sys_dict['yilist'], dtype=float)
         logger.info("Using yilist")
 
     variables = list(locals().keys())
-    if all([key not in variables for key in ["yi_list", "T_list"]]):
+    if all(key not in variables for key in ["yi_list", "T_list"]):
         raise ValueError('Tlist or yilist are not specified')
 
-    if np.size(T_list) != np.size(yi_list, axis=0):
-        if len(T_list) == 1:
-            T_list = np.ones(len(yi_list))*T_list[0]
-            logger.info("The same temperature, {}, was used for all mole fraction values".format(T_list[0]))
-        else:
-            raise ValueError("The number of provided temperatures and mole fraction sets are different")
+    T_list, yi_list = _broadcast_points(T_list, yi_list)
 
     ## Optional values
     opts = {}
 
     # Process initial guess in pressure
     if 'Pguess' in sys_dict:
-        Pguess = np.array(sys_dict['Pguess'],float)
-        if np.size(T_list) != np.size(Pguess):
-            if type(Pguess) not in [list, numpy.ndarray]:
-                opts["Pguess"] = np.ones(len(T_list))*Pguess
-                logger.info("The same pressure, {}, was used for all mole fraction values".format(Pguess))
-            elif len(T_list) == 1:
-                opts["Pguess"] = np.ones(len(T_list))*float(Pguess[0])
-                logger.info("The same pressure, {}, was used for all mole fraction values".format(Pguess))
-            else:
-                raise ValueError("The number of provided pressure and mole fraction sets are different")
+        opts["Pguess"] = _broadcast_values(sys_dict['Pguess'], len(T_list), "pressure guess")
         logger.info("Using user defined initial guess has been provided")
     else:
         if 'CriticalProp' in sys_dict:
@@ -245,37 +387,106 @@ def phase_yiT(eos, sys_dict):
     l_x, l_c = np.array(yi_list).shape
     T_list = np.array(T_list)
     P_list = np.zeros(l_x)
-    flagv_list = np.zeros(l_x)
-    flagl_list = np.zeros(l_x)
+    flagv_list = np.zeros(l_x, dtype=np.int8)
+    flagl_list = np.zeros(l_x, dtype=np.int8)
     xi_list = np.zeros((l_x,l_c))
     obj_list = np.zeros(l_x)
+    warm_start = None # Liquid composition of the last point, used as the initial guess of the next one
+    P_last = np.nan # Dew point pressure of the last point, used as the initial guess of the next one if none is given
+    # Options shared by all points are passed as they are, only the values of each point are set in the loop
+    Pguess_list = opts.pop("Pguess", None)
+    Psat_opts = {key: opts[key] for key in ["rhodict"] if key in opts}
+    pure_list = np.count_nonzero(yi_list, axis=1) == 1 # Points of a single component only need its saturation pressure
     for i in range(l_x):
-        optsi = opts
-        if "Pguess" in opts:
-            optsi["Pguess"] = optsi["Pguess"][i]
-        logger.info("T (K), yi: {} {}, Let's Begin!".format(str(T_list[i]), str(yi_list[i])))
+        optsi = {"warm_start": warm_start}
+        if Pguess_list is not None:
+            optsi["Pguess"] = Pguess_list[i]
+        elif np.isfinite(P_last):
+            optsi["Pguess"] = P_last
+        logger.info("T (K), yi: %s %s, Let's Begin!", T_list[i], yi_list[i])
         try:
-            if len(yi_list[i][yi_list[i]!=0.])==1:
-                if "rhodict" in optsi:
-                    opt_tmp = {"rhodict": optsi["rhodict"]}
-                else:
-                    opt_tmp = {}
-                P_list[i], _, _ = calc.calc_Psat(T_list[i], yi_list[i], eos, **opt_tmp)
+            if pure_list[i]:
+                P_list[i], _, _ = calc.calc_Psat(T_list[i], yi_list[i], eos, **Psat_opts)
                 xi_list[i], flagv_list[i], flagl_list[i], obj_list[i] = yi_list[i], 0, 1, 0.0
             else:
-                P_list[i], xi_list[i], flagl_list[i], flagv_list[i], obj_list[i]  = calc.calc_yT_phase(yi_list[i], T_list[i], eos, **optsi)
-        except:
-            logger.warning("T (K), yi: {} {}, calculation did not produce a valid result.".format(str(T_list[i]), str(yi_list[i])))
-            logger.debug("Calculation Failed:", exc_info=True)
-            P_list[i], xi_list[i] = [np.nan, np.nan]
+                P_list[i], xi_list[i], flagl_list[i], flagv_list[i], obj_list[i]  = calc.calc_yT_phase(yi_list[i], T_list[i], eos, **opts, **optsi)
+                warm_start = xi_list[i]
+                P_last = P_list[i]
+        except (ValueError, RuntimeError, ArithmeticError, np.linalg.LinAlgError):
+            logger.warning("T (K), yi: %s %s, calculation did not produce a valid result.", T_list[i], yi_list[i])
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Calculation Failed:", exc_info=True)
+            P_list[i] = xi_list[i] = np.nan
             flagl_list[i], flagv_list[i], obj_list[i] = [3, 3, np.nan]
             continue
-        logger.info("P (Pa), xi: {} {}".format(str(P_list[i]), str(xi_list[i])))
+        logger.info("P (Pa), xi: %s %s", P_list[i], xi_list[i])
 
     logger.info("--- Calculation phase_yiT Complete ---")
 
     return {"T":T_list,"yi":yi_list,"P":P_list,"xi":xi_list,"flagl":flagl_list,"flagv":flagv_list, "obj":obj_list}
 
+def _map_points(func, columns, ncores=1, **kwargs):
+    r"""
+    Evaluate each independent point of a calculation type, in parallel if more than one process is requested.
+
+    Keyword arguments shared by all points, such as the eos object, are sent to each process once when the pool is created rather than with every point.
+
+    Parameters
+    ----------
+    func : function
+        Module level function evaluating one point, so that it can be used with a multiprocessing pool
+    columns : tuple
+        Arrays of equal length holding one input of each point, such as temperature and composition. The first argument of func is the tuple of values of a point in each array.
+    ncores : int, Optional, default: 1
+        Number of processes used to evaluate the points. Points are evaluated in serial if this is one or only one point is given.
+    kwargs
+        Keyword arguments of func shared by all points
+
+    Yields
+    ------
+    index : int
+        Index of the point in columns
+    output : tuple
+        Output of func for the point. Points are yielded as soon as they are available, which is not necessarily in order when several processes are used.
+    """
+
+    logger = logging.getLogger(__name__)
+
+    func_point = functools.partial(func, **kwargs)
+    npoints = len(columns[0])
+    inputs = enumerate(zip(*columns))
+    if ncores > 1 and npoints > 1:
+        nprocs = min(ncores, npoints)
+        logger.info("Evaluating {} points with {} processes".format(npoints,nprocs))
+        pool = multiprocessing.Pool(nprocs, initializer=_init_worker, initargs=(func_point,))
+        try:
+            yield from pool.imap_unordered(_call_worker, inputs, chunksize=max(1, npoints//(4*nprocs)))
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        for i, point in inputs:
+            yield i, func_point(point)
+
+# Function evaluating one point in a worker process of _map_points, along with its shared arguments
+_worker_func = None
+
+def _init_worker(func):
+    r"""
+    Save the function used by :func:`_call_worker` when a worker process of :func:`_map_points` starts.
+    """
+
+    global _worker_func
+    _worker_func = func
+
+def _call_worker(indexed_inputs):
+    r"""
+    Evaluate one point in a worker process of :func:`_map_points`, returning its index along with the output.
+    """
+
+    i, inputs = indexed_inputs
+    return i, _worker_func(inputs)
+
 ######################################################################
 #                                                                    #
 #                Saturation calc for 1 Component                     #
@@ -293,7 +504,7 @@ def sat_props(eos, sys_dict):
     eos : obj
         An instance of the defined EOS class to be used in thermodynamic computations.
     sys_dict: dict
-        A dictionary of all information given in the input .json file that wasn't used to create the EOS object (e.g. options for density array :func:`~despasito.thermodynamics.calc.PvsRho`).
+        A dictionary of all information given in the input .json file that wasn't used to create the EOS object (e.g. options for density array :func:`~despasito.thermodynamics.calc.PvsRho`). The optional key, "ncores", sets the number of processes used to evaluate the points in parallel, default: 1.
 
     Returns
     -------
@@ -305,27 +516,22 @@ def sat_props(eos, sys_dict):
 
     ## Extract and check input data
     if 'Tlist' in sys_dict:
-        T_list = np.array(sys_dict['Tlist'],float)
+        T_list = np.asarray(sys_dict['Tlist'], dtype=float)
         logger.info("Using Tlist")
     else:
         raise ValueError('Tlist is not specified')
 
     if 'xilist' in sys_dict:
-        xi_list = np.array(sys_dict['xilist'],float)
+        xi_list = np.asarray(sys_dict['xilist'], dtype=float)
         logger.info("Using xilist")
     else:
-            xi_list = np.array([[1.0] for x in range(len(T_list))])
+            xi_list = np.ones((len(T_list), 1))
 
     variables = list(locals().keys())
-    if all([key not in variables for key in ["xi_list", "T_list"]]):
+    if all(key not in variables for key in ["xi_list", "T_list"]):
         raise ValueError('Tlist or xilist are not specified')
 
-    if np.size(T_list) != np.size(xi_list, axis=0):
-        if len(T_list) == 1:
-            T_list = np.ones(len(xi_list))*T_list[0]
-            logger.info("The same temperature, {}, was used for all mole fraction values".format(T_list[0]))
-        else:
-            raise ValueError("The number of provided temperatures and mole fraction sets are different")
+    T_list, xi_list = _broadcast_points(T_list, xi_list)
 
     ## Optional values
     opts = {}
@@ -342,28 +548,57 @@ def sat_props(eos, sys_dict):
         logger.info("Accepted options for P vs. density curve")
         opts["rhodict"] = sys_dict["rhodict"]
 
+    # Number of processes used to evaluate the points
+    ncores = sys_dict.get("ncores", 1)
+
     ## Calculate saturation properties
-    l_x = len(T_list)
     T_list = np.array(T_list)
-    Psat = np.zeros(l_x)
-    rholsat = np.zeros(l_x)
-    rhovsat = np.zeros(l_x)
-
-    for i in range(l_x):
-
-        logger.info("T (K), xi: {} {}, Let's Begin!".format(str(T_list[i]), str(xi_list[i])))
-        Psat[i], rholsat[i], rhovsat[i] = calc.calc_Psat(T_list[i], xi_list[i], eos, **opts)
-        if np.isnan(Psat[i]):
-            logger.warning("T (K), xi: {} {}, calculation did not produce a valid result.".format(str(T_list[i]), str(xi_list[i])))
-            logger.debug("Calculation Failed:", exc_info=True)
-            Psat[i], rholsat[i], rhovsat[i] = [np.nan, np.nan, np.nan]
-            continue
-        logger.info("Psat {} Pa, rhol {}, rhov {}".format(Psat[i],rholsat[i],rhovsat[i]))
+    Psat = np.empty(len(T_list))
+    rholsat = np.empty(len(T_list))
+    rhovsat = np.empty(len(T_list))
+    for i, output in _map_points(_sat_props_wrapper, (T_list, xi_list), ncores, eos=eos, opts=opts):
+        Psat[i], rholsat[i], rhovsat[i] = output
 
     logger.info("--- Calculation sat_props Complete ---")
 
     return {"T":T_list,"Psat":Psat,"rhol":rholsat,"rhov":rhovsat}
 
+def _sat_props_wrapper(inputs, eos, opts):
+    r"""
+    Compute the saturation properties of a single point of :func:`sat_props`.
+
+    Parameters
+    ----------
+    inputs : tuple
+        Temperature and mole fractions of the point
+    eos : obj
+        An instance of the defined EOS class to be used in thermodynamic computations.
+    opts : dict
+        Options of :func:`~despasito.thermodynamics.calc.calc_Psat`
+
+    Returns
+    -------
+    Psat : float
+        Saturation pressure [Pa], NaN if the calculation failed
+    rholsat : float
+        Saturated liquid density, NaN if the calculation failed
+    rhovsat : float
+        Saturated vapor density, NaN if the calculation failed
+    """
+
+    logger = logging.getLogger(__name__)
+
+    T, xi = inputs
+    logger.info("T (K), xi: %s %s, Let's Begin!", T, xi)
+    Psat, rholsat, rhovsat = calc.calc_Psat(T, xi, eos, **opts)
+    if np.isnan(Psat):
+        logger.warning("T (K), xi: %s %s, calculation did not produce a valid result.", T, xi)
+        logger.debug("Calculation Failed:", exc_info=True)
+        return np.nan, np.nan, np.nan
+    logger.info("Psat %s Pa, rhol %s, rhov %s", Psat,rholsat,rhovsat)
+
+    return Psat, rholsat, rhovsat
+
 
 ######################################################################
 #                                                                    #
@@ -382,7 +617,7 @@ def liquid_properties(eos, sys_dict):
     eos : obj
         An instance of the defined EOS class to be used in thermodynamic computations.
     sys_dict: dict
-        A dictionary of all information given in the input .json file that wasn't used to create the EOS object (e.g. options for density array :func:`~despasito.thermodynamics.calc.PvsRho`).
+        A dictionary of all information given in the input .json file that wasn't used to create the EOS object (e.g. options for density array :func:`~despasito.thermodynamics.calc.PvsRho`). The optional key, "ncores", sets the number of processes used to evaluate the points in parallel, default: 1.
 
     Returns
     -------
@@ -392,67 +627,59 @@ def liquid_properties(eos, sys_dict):
 
     logger = logging.getLogger(__name__)
 
-    ## Extract and check input data
-    if 'Tlist' in sys_dict:
-        T_list = np.array(sys_dict['Tlist'],float)
-        logger.info("Using Tlist")
+    T_list, P_list, xi_list, opts, ncores = _properties_inputs(sys_dict, "xilist")
 
-    if 'xilist' in sys_dict:
-        xi_list = np.array(sys_dict['xilist'],float)
-        logger.info("Using xilist")
-
-    variables = list(locals().keys())
-    if all([key not in variables for key in ["xi_list", "T_list"]]):
-        raise ValueError('Tlist or xilist are not specified')
+    ## Calculate liquid density
+    T_list = np.array(T_list)
+    if ncores == 1:
+        # Evaluate all points in one pass, ordered by temperature
+        phil, rhol, _ = calc.calc_phi_batch(P_list, T_list, xi_list, eos, phase="liquid", **opts)
+        for i in np.flatnonzero(np.isnan(rhol)):
+            logger.warning('Failed to calculate rhol at %s', T_list[i])
+    else:
+        rhol = np.empty(len(T_list))
+        phil = np.empty(np.shape(xi_list))
+        for i, output in _map_points(_liquid_properties_wrapper, (P_list, T_list, xi_list), ncores, eos=eos, opts=opts):
+            rhol[i], phil[i] = output
 
-    if np.size(T_list) != np.size(xi_list, axis=0):
-        if len(T_list) == 1:
-            T_list = np.ones(len(xi_list))*T_list[0]
-            logger.info("The same temperature, {}, was used for all mole fraction values".format(T_list[0]))
-        else:
-            raise ValueError("The number of provided temperatures and mole fraction sets are different")
+    logger.info("--- Calculation liquid_properties Complete ---")
 
-    if "Plist" in sys_dict:
-        P_list = np.array(sys_dict['Plist'])
-        logger.info("Using Plist")
-    else:
-        P_list = 101325.0 * np.ones_like(T_list)
-        logger.info("Assuming atmospheric pressure.")
+    return {"P":P_list,"T":T_list,"xi":xi_list,"rhol":rhol,"phil":phil}
 
-    ## Optional values
-    opts = {}
+def _liquid_properties_wrapper(inputs, eos, opts):
+    r"""
+    Compute the liquid density and fugacity coefficients of a single point of :func:`liquid_properties`.
 
-    # Process initial guess in pressure
-    if 'Pguess' in sys_dict:
-        logger.info("Guess in pressure has been provided, but is unused for this function")
+    Parameters
+    ----------
+    inputs : tuple
+        Pressure, temperature, and mole fractions of the point
+    eos : obj
+        An instance of the defined EOS class to be used in thermodynamic computations.
+    opts : dict
+        Options of :func:`~despasito.thermodynamics.calc.calc_rhol`
 
-    if 'CriticalProp' in sys_dict:
-        logger.info("Critical properties have been provided, but are unused for this function")
+    Returns
+    -------
+    rhol : float
+        Liquid density, NaN if the calculation failed
+    phil : numpy.ndarray
+        Fugacity coefficient of each component, NaN if the calculation failed
+    """
 
-    # Extract rho dict
-    if "rhodict" in sys_dict:
-        logger.info("Accepted options for P vs. density curve")
-        opts["rhodict"] = sys_dict["rhodict"]
+    logger = logging.getLogger(__name__)
 
-    ## Calculate liquid density
-    l_x = len(T_list)
-    T_list = np.array(T_list)
-    rhol = np.zeros(l_x)
-    phil = []
-    for i in range(l_x):
-        rhol[i], flagl = calc.calc_rhol(P_list[i], T_list[i], xi_list[i], eos, **opts)
+    P, T, xi = inputs
+    rhol, flagl = calc.calc_rhol(P, T, xi, eos, **opts)
 
-        if np.isnan(rhol[i]):
-            logger.warning('Failed to calculate rhol at {}'.format(T_list[i]))
-            phil[i] = np.nan
-        else:
-            phil_tmp = eos.fugacity_coefficient(P_list[i], np.array([rhol[i]]), xi_list[i], T_list[i])
-            phil.append(phil_tmp)
-            logger.info("P {} Pa, T {} K, xi {}, rhol {}, phil {}".format(P_list[i],T_list[i],xi_list[i],rhol[i],phil_tmp))
+    if np.isnan(rhol):
+        logger.warning('Failed to calculate rhol at %s', T)
+        return rhol, np.nan
 
-    logger.info("--- Calculation liquid_properties Complete ---")
+    phil = eos.fugacity_coefficient(P, np.array([rhol]), xi, T)
+    logger.info("P %s Pa, T %s K, xi %s, rhol %s, phil %s", P,T,xi,rhol,phil)
 
-    return {"P":P_list,"T":T_list,"xi":xi_list,"rhol":rhol,"phil":phil}
+    return rhol, phil
 
 ######################################################################
 #                                                                    #
@@ -471,7 +698,7 @@ def vapor_properties(eos, sys_dict):
     eos : obj
         An instance of the defined EOS class to be used in thermodynamic computations.
     sys_dict: dict
-        A dictionary of all information given in the input .json file that wasn't used to create the EOS object (e.g. options for density array :func:`~despasito.thermodynamics.calc.PvsRho`).
+        A dictionary of all information given in the input .json file that wasn't used to create the EOS object (e.g. options for density array :func:`~despasito.thermodynamics.calc.PvsRho`). The optional key, "ncores", sets the number of processes used to evaluate the points in parallel, default: 1.
 
     Returns
     -------
@@ -481,66 +708,62 @@ def vapor_properties(eos, sys_dict):
 
     logger = logging.getLogger(__name__)
 
-    ## Extract and check input data
-    if 'Tlist' in sys_dict:
-        T_list = np.array(sys_dict['Tlist'],float)
-        logger.info("Using Tlist")
+    T_list, P_list, yi_list, opts, ncores = _properties_inputs(sys_dict, "yilist")
 
-    if 'yilist' in sys_dict:
-        yi_list = np.array(sys_dict['yilist'],float)
-        logger.info("Using yilist")
+    ## Calculate vapor density
+    T_list = np.array(T_list)
+    if ncores == 1:
+        # Evaluate all points in one pass, ordered by temperature
+        phiv, rhov, flagv = calc.calc_phi_batch(P_list, T_list, yi_list, eos, phase="vapor", **opts)
+        # No density was found where calc_phiv assumes an ideal gas
+        rhov[flagv == 4] = np.nan
+        for i in np.flatnonzero(np.isnan(rhov)):
+            logger.warning('Failed to calculate rhov at %s', T_list[i])
+            phiv[i] = np.nan
+    else:
+        rhov = np.empty(len(T_list))
+        phiv = np.empty(np.shape(yi_list))
+        for i, output in _map_points(_vapor_properties_wrapper, (P_list, T_list, yi_list), ncores, eos=eos, opts=opts):
+            rhov[i], phiv[i] = output
 
-    variables = list(locals().keys())
-    if all([key not in variables for key in ["yi_list", "T_list"]]):
-        raise ValueError('Tlist or yilist are not specified')
+    logger.info("--- Calculation vapor_properties Complete ---")
 
-    if np.size(T_list) != np.size(yi_list, axis=0):
-        if len(T_list) == 1:
-            T_list = np.ones(len(yi_list))*T_list[0]
-            logger.info("The same temperature, {}, was used for all mole fraction values".format(T_list[0]))
-        else:
-            raise ValueError("The number of provided temperatures and mole fraction sets are different")
+    return {"P":P_list,"T":T_list,"yi":yi_list,"rhov":rhov,"phiv":phiv}
 
-    if "Plist" in sys_dict:
-        P_list = np.array(sys_dict['Plist'])
-        logger.info("Using Plist")
-    else:
-        P_list = 101325.0 * np.ones_like(T_list)
-        logger.info("Assuming atmospheric pressure.")
+def _vapor_properties_wrapper(inputs, eos, opts):
+    r"""
+    Compute the vapor density and fugacity coefficients of a single point of :func:`vapor_properties`.
 
-    ## Optional values
-    opts = {}
+    Parameters
+    ----------
+    inputs : tuple
+        Pressure, temperature, and mole fractions of the point
+    eos : obj
+        An instance of the defined EOS class to be used in thermodynamic computations.
+    opts : dict
+        Options of :func:`~despasito.thermodynamics.calc.calc_rhov`
 
-    # Process initial guess in pressure
-    if 'Pguess' in sys_dict:
-        logger.info("Guess in pressure has been provided, but is unused for this function")
+    Returns
+    -------
+    rhov : float
+        Vapor density, NaN if the calculation failed
+    phiv : numpy.ndarray
+        Fugacity coefficient of each component, NaN if the calculation failed
+    """
 
-    if 'CriticalProp' in sys_dict:
-        logger.info("Critical properties have been provided, but are unused for this function")
+    logger = logging.getLogger(__name__)
 
-    # Extract rho dict
-    if "rhodict" in sys_dict:
-        logger.info("Accepted options for P vs. density curve")
-        opts["rhodict"] = sys_dict["rhodict"]
+    P, T, yi = inputs
+    rhov, flagv = calc.calc_rhov(P, T, yi, eos, **opts)
 
-    ## Calculate vapor density
-    l_x = len(T_list)
-    T_list = np.array(T_list)
-    rhov = np.zeros(l_x)
-    phiv = []
-    for i in range(l_x):
-        rhov[i], flagv = calc.calc_rhov(P_list[i], T_list[i], yi_list[i], eos, **opts)
-        if np.isnan(rhov[i]):
-            logger.warning('Failed to calculate rhov at {}'.format(T_list[i]))
-            phiv[i] = np.nan
-        else:
-            phiv_tmp = eos.fugacity_coefficient(P_list[i], np.array([rhov[i]]), yi_list[i], T_list[i])
-            phiv.append(phiv_tmp)
-            logger.info("P {} Pa, T {} K, yi {}, rhov {}, phiv {}".format(P_list[i],T_list[i],yi_list[i],rhov[i],phiv_tmp))
+    if np.isnan(rhov):
+        logger.warning('Failed to calculate rhov at %s', T)
+        return rhov, np.nan
 
-    logger.info("--- Calculation vapor_properties Complete ---")
+    phiv = eos.fugacity_coefficient(P, np.array([rhov]), yi, T)
+    logger.info("P %s Pa, T %s K, yi %s, rhov %s, phiv %s", P,T,yi,rhov,phiv)
 
-    return {"P":P_list,"T":T_list,"yi":yi_list,"rhov":rhov,"phiv":phiv}
+    return rhov, phiv
 
 ######################################################################
 #                                                                    #
@@ -570,63 +793,34 @@ def solubility_parameter(eos, sys_dict):
 
     logger = logging.getLogger(__name__)
 
-    ## Extract and check input data
-    if 'Tlist' in sys_dict:
-        T_list = np.array(sys_dict['Tlist'],float)
-        logger.info("Using Tlist")
-        del sys_dict['Tlist']
-
-    variables = list(locals().keys())
-    if all([key not in variables for key in ["T_list"]]):
+    ## Extract and check input data, used keys are removed so that the rest can be reported
+    T_list = sys_dict.pop('Tlist', None)
+    if T_list is None:
         raise ValueError('Tlist are not specified')
+    T_list = np.asarray(T_list, dtype=float)
+    logger.info("Using Tlist")
 
-    if "Plist" in sys_dict:
-        P_list = np.array(sys_dict['Plist'])
-        logger.info("Using Plist")
-        del sys_dict['Plist']
-    else:
-        P_list = 101325.0 * np.ones_like(T_list)
-        logger.info("Assuming atmospheric pressure.")
+    P_list = sys_dict.pop('Plist', None)
 
-    if "xilist" in sys_dict:
-        xi_list = np.array(sys_dict['xilist'])
+    xi_list = sys_dict.pop('xilist', None)
+    if xi_list is not None:
+        xi_list = np.asarray(xi_list, dtype=float)
         logger.info("Using xilist")
-        del sys_dict['xilist']
     else:
-        xi_list = np.array([[1.0] for x in range(len(T_list))])
+        xi_list = np.ones((len(T_list), 1))
         logger.info("Single mole fraction of one.")
 
-    if np.size(T_list) != np.size(xi_list, axis=0):
-        if len(T_list) == 1:
-            T_list = np.ones(len(xi_list))*T_list[0]
-            logger.info("The same temperature, {}, was used for all mole fraction values".format(T_list[0]))
-        if len(xi_list) == 1:
-            xi_list = np.array([xi_list[0] for x in range(len(T_list))])
-            logger.info("The same mole fraction values, {}, were used for all temperature values".format(xi_list[0]))
-        else:
-            raise ValueError("The number of provided temperatures and mole fraction sets are different")
-
-    if np.size(T_list) != np.size(P_list, axis=0):
-        if len(P_list) == 1:
-            P_list = np.ones(len(T_list))*P_list[0]
-            logger.info("The same pressure, {}, was used for all temperature values".format(P_list[0]))
-        else:
-            raise ValueError("The number of provided temperatures and pressure sets are different")
+    T_list, P_list, xi_list = _broadcast_TPzi(T_list, P_list, xi_list)
 
     # Extract rho dict
-    if "rhodict" in sys_dict:
+    rhodict = sys_dict.pop('rhodict', None)
+    if rhodict is not None:
         logger.info("Accepted options for P vs. density curve")
-        rhodict = sys_dict["rhodict"]
-        del sys_dict['rhodict']
     else:
         rhodict = {}
 
     ## Optional values
-    opts = {}
-    for key, val in sys_dict.items():
-        if key in ['dT', 'tol']:
-            opts[key] = val
-            del sys_dict[key]
+    opts = {key: sys_dict.pop(key) for key in ['dT', 'tol'] if key in sys_dict}
 
     logger.info("The sys_dict keys: {}, were not used.".format(", ".join(list(sys_dict.keys()))))
 
@@ -646,7 +840,7 @@ def solubility_parameter(eos, sys_dict):
             delta[i] = np.nan
         else:
             delta[i] = calc.hildebrand_solubility(rhol[i], xi_list[i], T_list[i], eos, **opts)
-            logger.info("P {} Pa, T {} K, xi {}, rhol {}, delta {}".format(P_list[i],T_list[i],xi_list[i],rhol[i],delta[i]))
+            logger.info("P %s Pa, T %s K, xi %s, rhol %s, delta %s", P_list[i],T_list[i],xi_list[i],rhol[i],delta[i])
 
     logger.info("--- Calculation solubility_parameter Complete ---")
 